@@ -0,0 +1,47 @@
+"""Tests for bitsets."""
+
+from watcher.core.bitsets import Bitset
+
+from tests.common import BaseTestCase
+
+
+class TestBitset(BaseTestCase):
+    """Tests for bitset."""
+
+    def test_add(self):
+        """Test add integers."""
+        bitset = Bitset()
+        for value in (3, 0, 17, 3, 1000):
+            bitset.add(value)
+
+        self.assertEqual(len(bitset), 4)
+        self.assertEqual(list(bitset), [0, 3, 17, 1000])
+        self.assertIn(17, bitset)
+        self.assertNotIn(16, bitset)
+        self.assertNotIn(5000, bitset)
+        self.assertNotIn(-1, bitset)
+
+    def test_discard(self):
+        """Test discard integers."""
+        bitset = Bitset([1, 9])
+        bitset.discard(9)
+        bitset.discard(100)
+
+        self.assertEqual(list(bitset), [1])
+        self.assertTrue(bitset)
+
+        bitset.discard(1)
+        self.assertFalse(bitset)
+        self.assertEqual(len(bitset), 0)
+
+    def test_set_algebra(self):
+        """Test set operations."""
+        bitset1 = Bitset([1, 2, 3, 64])
+        bitset2 = Bitset([2, 3, 4])
+
+        self.assertEqual(list(bitset1 & bitset2), [2, 3])
+        self.assertEqual(list(bitset1 | bitset2), [1, 2, 3, 4, 64])
+        self.assertEqual(list(bitset1 - bitset2), [1, 64])
+        self.assertEqual(list(bitset1 ^ bitset2), [1, 4, 64])
+        self.assertEqual(Bitset([2, 3]), bitset1 & bitset2)
+        self.assertEqual(Bitset.from_int(bitset1.to_int()), bitset1)
@@ -0,0 +1,84 @@
+"""Tests for caches."""
+
+import threading
+import time
+
+from watcher.core.caches import LRUCache, SingleFlight
+from watcher.core.metrics import CACHE_EVICTIONS, COALESCED_CALLS
+
+from tests.common import BaseTestCase
+
+
+class TestLRUCache(BaseTestCase):
+    """Tests for LRU cache."""
+
+    def test_eviction(self):
+        """Test evict the least recently used entry."""
+        cache = LRUCache("test_eviction", max_size=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(CACHE_EVICTIONS.get(cache="test_eviction"), 1)
+
+
+class TestSingleFlight(BaseTestCase):
+    """Tests for single flight."""
+
+    def do_concurrently(self, group, fn, count=8):
+        """Call a function from several threads at once."""
+        results = [None] * count
+
+        def wait_for_callers():
+            # Hold the call until every other caller waits for it.
+            deadline = time.monotonic() + 5
+            while COALESCED_CALLS.get(group=group.name) < count - 1:
+                if time.monotonic() > deadline:
+                    break
+                time.sleep(0.001)
+            return fn()
+
+        def run(index):
+            try:
+                results[index] = group.do("key", wait_for_callers)
+            except ValueError as err:
+                results[index] = err
+
+        threads = [
+            threading.Thread(target=run, args=(index,))
+            for index in range(count)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_do(self):
+        """Test concurrent calls run the function once."""
+        group = SingleFlight("test_do")
+        calls = []
+
+        def load():
+            calls.append(1)
+            return "dataset"
+
+        results = self.do_concurrently(group, load)
+
+        self.assertEqual(results, ["dataset"] * 8)
+        self.assertEqual(len(calls), 1)
+
+    def test_do_failure(self):
+        """Test failures propagate to every caller without being kept."""
+        group = SingleFlight("test_do_failure")
+
+        results = self.do_concurrently(group, lambda: int("not-an-int"))
+
+        self.assertEqual(len(results), 8)
+        for result in results:
+            self.assertIsInstance(result, ValueError)
+        self.assertEqual(group.do("key", lambda: 1), 1)
@@ -0,0 +1,41 @@
+"""Tests for compression."""
+
+import gzip
+import io
+
+from watcher.core.compression import (
+    open_compressed_append,
+    open_decompressed,
+)
+
+from tests.common import BaseTestCase
+
+
+class TestCompression(BaseTestCase):
+    """Tests for compression."""
+
+    def test_open_decompressed(self):
+        """Test closing decompressed files leaves the file open."""
+        for compression, content in (
+            (None, b"id\n1\n"),
+            ("gzip", gzip.compress(b"id\n1\n")),
+        ):
+            with self.subTest(compression=compression):
+                file = io.BytesIO(content)
+                with open_decompressed(file, compression) as stream:
+                    self.assertEqual(stream.read(), b"id\n1\n")
+
+                self.assertFalse(file.closed)
+
+    def test_open_compressed_append(self):
+        """Test closing appended files leaves the file open."""
+        for compression in (None, "gzip"):
+            with self.subTest(compression=compression):
+                file = io.BytesIO()
+                with open_compressed_append(file, compression) as stream:
+                    stream.write(b"id\n1\n")
+
+                self.assertFalse(file.closed)
+                file.seek(0)
+                with open_decompressed(file, compression) as stream:
+                    self.assertEqual(stream.read(), b"id\n1\n")
@@ -0,0 +1,55 @@
+"""Tests for feeds."""
+
+import threading
+
+from watcher.core.feeds import Feed
+
+from tests.common import BaseTestCase
+
+
+class TestFeed(BaseTestCase):
+    """Tests for feed."""
+
+    def setUp(self):
+        """Set up a feed."""
+        self.feed = Feed("test", max_size=2)
+
+    def test_read(self):
+        """Test events after a cursor are read in sequence."""
+        self.assertEqual(self.feed.publish("a"), 1)
+        self.assertEqual(self.feed.publish("b"), 2)
+
+        self.assertEqual(self.feed.read(0), [(1, "a"), (2, "b")])
+        self.assertEqual(self.feed.read(1), [(2, "b")])
+        self.assertEqual(self.feed.read(2, timeout=0), [])
+
+    def test_read_waits(self):
+        """Test readers wait for the next event."""
+        timer = threading.Timer(0.05, self.feed.publish, args=("a",))
+        timer.start()
+        self.addCleanup(timer.cancel)
+
+        self.assertEqual(self.feed.read(0, timeout=5), [(1, "a")])
+
+    def test_read_stale_cursor(self):
+        """Test cursors behind the events kept or ahead of the feed."""
+        for event in "abc":
+            self.feed.publish(event)
+
+        self.assertIsNone(self.feed.read(0))
+        self.assertEqual(self.feed.read(1), [(2, "b"), (3, "c")])
+        self.assertIsNone(self.feed.read(4))
+
+        self.feed.clear()
+        self.assertIsNone(self.feed.read(2))
+        self.assertEqual(self.feed.read(3, timeout=0), [])
+
+    async def test_aread_waits(self):
+        """Test readers in an event loop are woken up by publishers."""
+        timer = threading.Timer(0.05, self.feed.publish, args=("a",))
+        timer.start()
+        self.addCleanup(timer.cancel)
+
+        self.assertEqual(await self.feed.aread(0, timeout=5), [(1, "a")])
+        self.assertEqual(await self.feed.aread(1, timeout=0.01), [])
+        self.assertIsNone(await self.feed.aread(2, timeout=0.01))
@@ -0,0 +1,110 @@
+"""Tests for instrumentation."""
+
+import json
+
+from django.test import override_settings
+from django.urls import reverse
+
+from watcher.core.instrumentation import Timing, get_timing, start_timing
+from watcher.votes.repositories import VoteResultCsvRepository
+
+from tests.common import BaseTestCase
+
+MEDIA_ROOT = "tests/samples/media"
+MEDIA_FILES = {
+    "bills": "csv/bills_md.csv",
+    "legislators": "csv/legislators_md.csv",
+    "votes": "csv/votes_md.csv",
+    "vote_results": "csv/vote_results_md.csv",
+}
+
+
+class TestTiming(BaseTestCase):
+    """Tests for timing."""
+
+    def test_phase_nested(self):
+        """Test nested phases are accounted exclusively."""
+        timing = Timing()
+        with timing.phase("outer"):
+            with timing.phase("inner"):
+                pass
+            timing.add_duration("leaf", 10.0)
+
+        self.assertIn("inner", timing.durations)
+        self.assertAlmostEqual(timing.durations["leaf"], 10.0)
+        self.assertLess(timing.durations["outer"], 1.0)
+
+    def test_as_header(self):
+        """Test Server-Timing header value."""
+        timing = Timing()
+        timing.add_duration("read", 0.0125)
+        timing.increment("rows_read", 3)
+
+        self.assertEqual(
+            timing.as_header(), 'read;dur=12.500, rows_read;desc="3"'
+        )
+
+    @override_settings(MEDIA_ROOT=MEDIA_ROOT)
+    def test_repository_counters(self):
+        """Test repository counters."""
+        repository = VoteResultCsvRepository("csv/vote_results_md.csv")
+
+        self.assertIsNone(get_timing())
+        with start_timing() as timing:
+            repository.get_by_id(92516770)
+
+        self.assertIn("read", timing.durations)
+        self.assertEqual(timing.counters["rows_matched"], 1)
+        self.assertEqual(timing.counters["rows_read"], 2)
+        self.assertIsNone(get_timing())
+
+
+@override_settings(
+    MEDIA_ROOT=MEDIA_ROOT,
+    MEDIA_FILES=MEDIA_FILES,
+    SERVER_TIMING_ENABLED=True,
+)
+class TestServerTimingMiddleware(BaseTestCase):
+    """Tests for server timing middleware."""
+
+    def test_server_timing_header(self):
+        """Test Server-Timing header."""
+        response = self.client.get(
+            reverse("votes:bill-vote-summary-list"), {"bill_id": 2952375}
+        )
+
+        header = response["Server-Timing"]
+        for metric in (
+            "read;dur=",
+            "spec;dur=",
+            "aggregate;dur=",
+            "paginate;dur=",
+            "render;dur=",
+            "total;dur=",
+            "objects_built;desc=",
+        ):
+            self.assertIn(metric, header)
+
+    @override_settings(SERVER_TIMING_LOG=True)
+    def test_server_timing_streaming(self):
+        """Test streamed responses are timed once their content is sent."""
+        with self.assertLogs("watcher.core.middleware", "INFO") as logs:
+            response = self.client.get(
+                reverse("votes:api-vote-result-list"), {"export": "ndjson"}
+            )
+            self.assertNotIn("Server-Timing", response)
+            self.assertEqual(logs.records, [])
+            content = b"".join(response.streaming_content)
+
+        self.assertEqual(len(content.splitlines()), 10)
+        self.assertEqual(len(logs.records), 1)
+        log = json.loads(logs.records[0].getMessage())
+        self.assertEqual(log["status"], 200)
+        self.assertEqual(log["counters"]["rows_read"], 10)
+
+    @override_settings(SERVER_TIMING_ENABLED=False)
+    def test_server_timing_disabled(self):
+        """Test Server-Timing header is not sent when disabled."""
+        response = self.client.get(reverse("votes:bill-list"))
+
+        self.assertNotIn("Server-Timing", response)
@@ -0,0 +1,93 @@
+"""Tests for joins."""
+
+from dataclasses import dataclass
+
+from watcher.core.joins import HashJoin, JoinType
+
+from tests.common import BaseTestCase
+
+
+@dataclass
+class Row:
+    """Row."""
+
+    id: int
+    ref_id: int | None = None
+
+
+class TestHashJoin(BaseTestCase):
+    """Tests for hash join."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.facts = [Row(1, 10), Row(2, 20), Row(3, 10), Row(4, 30)]
+        self.dimensions = [Row(10), Row(20), Row(40)]
+
+    def get_pairs(self, join):
+        """Get the IDs of joined pairs."""
+        return sorted(
+            (left.id, right.id if right else None) for left, right in join
+        )
+
+    def test_inner_join(self):
+        """Test inner join."""
+        join = HashJoin(self.facts, self.dimensions, "ref_id", "id")
+
+        self.assertFalse(join.builds_left())
+        self.assertEqual(self.get_pairs(join), [(1, 10), (2, 20), (3, 10)])
+        self.assertEqual(join.unmatched, 1)
+
+    def test_left_outer_join(self):
+        """Test left outer join with a default."""
+        join = HashJoin(
+            self.facts,
+            self.dimensions,
+            "ref_id",
+            "id",
+            JoinType.LEFT_OUTER,
+            default=lambda key: Row(-key),
+        )
+
+        self.assertEqual(
+            self.get_pairs(join), [(1, 10), (2, 20), (3, 10), (4, -30)]
+        )
+        self.assertEqual(join.unmatched, 1)
+
+    def test_build_smaller_left_input(self):
+        """Test building the table on a smaller left input."""
+        join = HashJoin(
+            self.dimensions,
+            self.facts,
+            "id",
+            "ref_id",
+            JoinType.LEFT_OUTER,
+        )
+
+        self.assertTrue(join.builds_left())
+        self.assertEqual(
+            self.get_pairs(join), [(10, 1), (10, 3), (20, 2), (40, None)]
+        )
+        self.assertEqual(join.unmatched, 1)
+
+    def test_build_left_keeps_left_order(self):
+        """Test pairs are generated in the left input order either way."""
+        dimensions = [Row(40), Row(20), Row(10)]
+        pairs = [
+            (left.id, right.id if right else None)
+            for left, right in HashJoin(
+                dimensions, self.facts, "id", "ref_id", JoinType.LEFT_OUTER
+            )
+        ]
+
+        self.assertEqual(pairs, [(40, None), (20, 2), (10, 1), (10, 3)])
+
+    def test_duplicate_keys(self):
+        """Test joining rows with duplicate keys on both sides."""
+        join = HashJoin(
+            iter(self.facts),
+            self.facts + [Row(5, 10)],
+            "ref_id",
+            "ref_id",
+        )
+
+        self.assertEqual(len(list(join)), 2 * 3 + 1 + 1)
@@ -0,0 +1,128 @@
+"""Tests for metrics."""
+
+import threading
+
+from django.test import override_settings
+from django.urls import reverse
+
+from watcher.core.metrics import (
+    REPOSITORY_BYTES_READ,
+    REPOSITORY_ROWS_PARSED,
+    REPOSITORY_SCANS,
+    VIEW_LATENCY,
+    Counter,
+    Histogram,
+    MetricsRegistry,
+)
+from watcher.votes.repositories import LegislatorCsvRepository
+
+from tests.common import BaseTestCase
+
+MEDIA_ROOT = "tests/samples/media"
+
+
+class TestMetricsRegistry(BaseTestCase):
+    """Tests for metrics registry."""
+
+    def test_render(self):
+        """Test render."""
+        registry = MetricsRegistry()
+        counter = registry.register(
+            Counter("test_total", "Test counter.", ["dataset"])
+        )
+        histogram = registry.register(
+            Histogram("test_seconds", "Test histogram.", buckets=[0.1, 1])
+        )
+        counter.inc(dataset='csv/"a".csv')
+        counter.inc(2, dataset='csv/"a".csv')
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+        histogram.observe(5)
+
+        self.assertEqual(
+            registry.render(),
+            "# HELP test_total Test counter.\n"
+            "# TYPE test_total counter\n"
+            'test_total{dataset="csv/\\"a\\".csv"} 3\n'
+            "# HELP test_seconds Test histogram.\n"
+            "# TYPE test_seconds histogram\n"
+            'test_seconds_bucket{le="0.1"} 1\n'
+            'test_seconds_bucket{le="1"} 2\n'
+            'test_seconds_bucket{le="+Inf"} 3\n'
+            "test_seconds_sum 5.55\n"
+            "test_seconds_count 3\n",
+        )
+
+    def test_register_duplicate(self):
+        """Test registering a metric twice."""
+        registry = MetricsRegistry()
+        registry.register(Counter("test_total", "Test counter."))
+
+        with self.assertRaises(ValueError):
+            registry.register(Counter("test_total", "Test counter."))
+
+    def test_invalid_labels(self):
+        """Test invalid labels."""
+        counter = Counter("test_total", "Test counter.", ["dataset"])
+
+        with self.assertRaises(ValueError):
+            counter.inc(view="home")
+
+    def test_counter_thread_safety(self):
+        """Test counter increments from several threads."""
+        counter = Counter("test_total", "Test counter.")
+
+        def increment():
+            for _ in range(1000):
+                counter.inc()
+
+        threads = [threading.Thread(target=increment) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(counter.get(), 8000)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, METRICS_ENABLED=True)
+class TestMetricsInstrumentation(BaseTestCase):
+    """Tests for metrics instrumentation."""
+
+    def test_repository_metrics(self):
+        """Test repository metrics."""
+        dataset = "csv/legislators_sm.csv"
+        scans = REPOSITORY_SCANS.get(dataset=dataset)
+        rows = REPOSITORY_ROWS_PARSED.get(dataset=dataset)
+        bytes_read = REPOSITORY_BYTES_READ.get(dataset=dataset)
+
+        LegislatorCsvRepository(dataset).get_all()
+
+        self.assertEqual(REPOSITORY_SCANS.get(dataset=dataset), scans + 1)
+        self.assertEqual(REPOSITORY_ROWS_PARSED.get(dataset=dataset), rows + 2)
+        self.assertGreater(
+            REPOSITORY_BYTES_READ.get(dataset=dataset), bytes_read
+        )
+
+    def test_metrics_view(self):
+        """Test metrics view."""
+        view = "core:metrics"
+        count = VIEW_LATENCY.get_count(view=view, method="GET")
+
+        response = self.client.get(reverse(view))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            "# TYPE watcher_view_latency_seconds histogram",
+            response.content.decode(),
+        )
+        self.assertEqual(
+            VIEW_LATENCY.get_count(view=view, method="GET"), count + 1
+        )
+
+    @override_settings(METRICS_ENABLED=False)
+    def test_metrics_view_disabled(self):
+        """Test metrics view when metrics are disabled."""
+        response = self.client.get(reverse("core:metrics"))
+
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,111 @@
+"""Tests for partitions."""
+
+import json
+import os
+import shutil
+import tempfile
+
+from watcher.core.partitions import (
+    PartitionManifest,
+    build_manifest,
+    may_satisfy,
+)
+from watcher.core.specifications import (
+    AndSpecification,
+    ContainsSpecification,
+    EqualsSpecification,
+    InSpecification,
+    OrSpecification,
+)
+
+from tests.common import BaseTestCase
+
+RANGES = {"id": (10, 19), "vote_id": (100, 100)}
+
+
+class TestMaySatisfy(BaseTestCase):
+    """Tests for partition pruning."""
+
+    def test_lookups(self):
+        """Test lookups of partition keys are checked against the ranges."""
+        self.assertTrue(may_satisfy(EqualsSpecification("id", 10), RANGES))
+        self.assertFalse(may_satisfy(EqualsSpecification("id", 20), RANGES))
+        self.assertTrue(may_satisfy(InSpecification("id", [1, 19]), RANGES))
+        self.assertFalse(may_satisfy(InSpecification("id", [1, 20]), RANGES))
+        # Values not comparable with the ranges can't rule rows out.
+        self.assertTrue(may_satisfy(EqualsSpecification("id", "a"), RANGES))
+
+    def test_other_specifications(self):
+        """Test other specifications may be satisfied by any row."""
+        self.assertTrue(may_satisfy(EqualsSpecification("name", 1), RANGES))
+        self.assertTrue(
+            may_satisfy(ContainsSpecification("vote_id", "1"), RANGES)
+        )
+
+    def test_composites(self):
+        """Test conjunctions and disjunctions combine their children."""
+        equals = EqualsSpecification("id", 20)
+        other = EqualsSpecification("name", 1)
+
+        self.assertFalse(may_satisfy(AndSpecification(equals, other), RANGES))
+        self.assertTrue(may_satisfy(OrSpecification(equals, other), RANGES))
+        self.assertFalse(may_satisfy(OrSpecification(), RANGES))
+
+
+class TestPartitionManifest(BaseTestCase):
+    """Tests for partition manifests."""
+
+    def test_parse(self):
+        """Test partition file paths are relative to the manifest."""
+        manifest = PartitionManifest.parse(
+            {
+                "partitions": [
+                    {"file": "a.csv", "rows": 2, "ranges": {"id": [1, 2]}},
+                    {"file": "b.csv.gz", "ranges": {"id": [3, 4]}},
+                ]
+            },
+            "csv/dataset/manifest.json",
+        )
+
+        self.assertEqual(
+            [partition.file_path for partition in manifest.partitions],
+            ["csv/dataset/a.csv", "csv/dataset/b.csv.gz"],
+        )
+        self.assertIsNone(manifest.rows)
+        partitions = manifest.prune(EqualsSpecification("id", 3))
+        self.assertEqual(partitions, [manifest.partitions[1]])
+
+    def test_parse_invalid(self):
+        """Test invalid manifests are rejected."""
+        with self.assertRaises(ValueError):
+            PartitionManifest.parse({"files": []}, "manifest.json")
+        with self.assertRaises(ValueError):
+            PartitionManifest.parse(
+                {"partitions": [{"file": "a.csv", "ranges": {"id": [1]}}]},
+                "manifest.json",
+            )
+
+    def test_build_manifest(self):
+        """Test manifests record the rows and key ranges of partitions."""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        for name, ids in (("b.csv", [5, 3]), ("a.csv", [2, 1, 4])):
+            with open(os.path.join(directory, name), "w") as file:
+                file.write("id,name\n")
+                file.writelines(f"{pk},x\n" for pk in ids)
+        with open(os.path.join(directory, "notes.txt"), "w") as file:
+            file.write("Not a partition.")
+
+        manifest = build_manifest(directory, ["id"])
+
+        self.assertEqual(
+            json.loads(json.dumps(manifest)),
+            {
+                "partitions": [
+                    {"file": "a.csv", "rows": 3, "ranges": {"id": [1, 4]}},
+                    {"file": "b.csv", "rows": 2, "ranges": {"id": [3, 5]}},
+                ]
+            },
+        )
+        with self.assertRaises(ValueError):
+            build_manifest(directory, ["vote_id"])
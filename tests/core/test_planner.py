@@ -0,0 +1,81 @@
+"""Tests for planner."""
+
+from dataclasses import dataclass
+
+from watcher.core.planner import SpecificationPlanner
+from watcher.core.specifications import (
+    AndSpecification,
+    ContainsSpecification,
+    EqualsSpecification,
+    InSpecification,
+    OrSpecification,
+)
+from watcher.core.statistics import collect_statistics
+
+from tests.common import BaseTestCase
+
+
+@dataclass
+class Row:
+    """Row."""
+
+    id: int
+    kind: int
+    title: str
+
+
+class TestSpecificationPlanner(BaseTestCase):
+    """Tests for specification planner."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.items = [
+            Row(id=i, kind=i % 2, title=f"H.R. {i}: A long bill title Act")
+            for i in range(1000)
+        ]
+        self.planner = SpecificationPlanner(collect_statistics(self.items))
+
+    def test_plan_and(self):
+        """Test conjunctions evaluate cheap and selective children first."""
+        contains = ContainsSpecification("title", "Act")
+        kind = EqualsSpecification("kind", 1)
+        id_ = InSpecification("id", frozenset({1, 2, 3}))
+        spec = AndSpecification(contains, kind, id_)
+
+        planned = self.planner.plan(spec)
+
+        self.assertIsInstance(planned, AndSpecification)
+        self.assertEqual(planned.specs, (id_, kind, contains))
+        self.assertEqual(
+            [item for item in self.items if planned.is_satisfied_by(item)],
+            [item for item in self.items if spec.is_satisfied_by(item)],
+        )
+
+    def test_plan_or(self):
+        """Test disjunctions evaluate likely children first."""
+        id_ = EqualsSpecification("id", 7)
+        kind = EqualsSpecification("kind", 0)
+        nested = AndSpecification(kind, id_)
+        spec = OrSpecification(nested, id_, kind)
+
+        planned = self.planner.plan(spec)
+
+        self.assertEqual(planned.specs[0], kind)
+        self.assertEqual(planned.specs[2].specs, (id_, kind))
+        self.assertEqual(
+            [item for item in self.items if planned.is_satisfied_by(item)],
+            [item for item in self.items if spec.is_satisfied_by(item)],
+        )
+
+    def test_explain(self):
+        """Test explain a plan."""
+        spec = AndSpecification(
+            EqualsSpecification("kind", 1), EqualsSpecification("id", 7)
+        )
+
+        self.assertEqual(
+            self.planner.explain(self.planner.plan(spec)),
+            "and(id = 7 [selectivity=0.001, cost=1], "
+            "kind = 1 [selectivity=0.5, cost=1]) "
+            "[selectivity=0.0005, cost=1]",
+        )
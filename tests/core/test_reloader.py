@@ -0,0 +1,134 @@
+"""Tests for reloader."""
+
+import secrets
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.test import override_settings
+
+from watcher.core.reloader import DatasetReloader
+from watcher.core.repositories import CsvReadRepository
+from watcher.core.shared import SharedDatasetStore
+from watcher.votes.models import Person
+from watcher.votes.repositories import LegislatorCsvRepository
+
+from tests.common import BaseTestCase
+
+FILE_PATH = "csv/legislators.csv"
+CSV_HEADER = "id,name\n"
+
+
+class TestDatasetReloader(BaseTestCase):
+    """Tests for dataset reloader."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.media_root = Path(tempfile.mkdtemp())
+        (self.media_root / "csv").mkdir()
+        self.write_csv("904789,Rep. Don Bacon (R-NE-2)\n")
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.repository = LegislatorCsvRepository(FILE_PATH)
+        self.repository.load()
+        self.reloader = DatasetReloader([self.repository])
+
+    def tearDown(self):
+        """Clean up test data."""
+        CsvReadRepository.datasets.clear()
+        shutil.rmtree(self.media_root)
+
+    def write_csv(self, rows):
+        """Write the CSV file."""
+        (self.media_root / FILE_PATH).write_text(CSV_HEADER + rows)
+
+    def test_poll(self):
+        """Test reload a dataset once its file stops changing."""
+        old_dataset = self.repository.get_dataset()
+        self.repository.datasets.watch(FILE_PATH)
+        self.write_csv(
+            "904789,Rep. Don Bacon (R-NE-2)\n"
+            "1603850,Rep. Jamaal Bowman (D-NY-16)\n"
+        )
+
+        self.assertEqual(self.reloader.poll(), [])
+        self.assertIs(self.repository.get_dataset(), old_dataset)
+        self.assertEqual(self.repository.get_version(), old_dataset.version)
+        self.assertEqual(len(self.repository.get_all()), 1)
+
+        self.assertEqual(self.reloader.poll(), [FILE_PATH])
+        dataset = self.repository.get_dataset()
+        self.assertIsNot(dataset, old_dataset)
+        self.assertEqual(
+            self.repository.get_version(), self.repository.get_file_version()
+        )
+        self.assertEqual(
+            self.repository.get_by_id(1603850),
+            Person(id=1603850, name="Rep. Jamaal Bowman (D-NY-16)"),
+        )
+        self.assertEqual(list(old_dataset.items), [dataset.items[0]])
+        self.assertEqual(self.reloader.poll(), [])
+
+    def test_poll_publish(self):
+        """Test reloaded datasets are published in a shared store."""
+        store = SharedDatasetStore(f"watcher-test-{secrets.token_hex(4)}")
+        self.addCleanup(store.unlink)
+        self.reloader.store = store
+        self.write_csv("1603850,Rep. Jamaal Bowman (D-NY-16)\n")
+        version = self.repository.get_file_version()
+
+        self.reloader.poll()
+        self.assertIsNone(store.get(FILE_PATH, version))
+
+        self.assertEqual(self.reloader.poll(), [FILE_PATH])
+        worker = SharedDatasetStore(store.name)
+        dataset = worker.get(FILE_PATH, version)
+        self.assertIsNotNone(dataset)
+        self.assertEqual(
+            list(dataset.items),
+            [Person(id=1603850, name="Rep. Jamaal Bowman (D-NY-16)")],
+        )
+
+    def test_poll_still_changing(self):
+        """Test wait while a file keeps changing."""
+        self.write_csv("904789,Rep. Don Bacon\n")
+        self.assertEqual(self.reloader.poll(), [])
+
+        self.write_csv("904789,Rep. Don Bacon (R\n")
+        self.assertEqual(self.reloader.poll(), [])
+
+        self.assertEqual(self.reloader.poll(), [FILE_PATH])
+        self.assertEqual(
+            self.repository.get_by_id(904789).name, "Rep. Don Bacon (R"
+        )
+
+    def test_poll_failure(self):
+        """Test a failing reload keeps the current generation."""
+        dataset = self.repository.get_dataset()
+        self.write_csv("not-an-id,Rep. Don Bacon (R-NE-2)\n")
+
+        with self.assertLogs("watcher.core.reloader", "ERROR"):
+            self.reloader.poll()
+            self.reloader.poll()
+
+        self.assertIs(CsvReadRepository.datasets.get(FILE_PATH), dataset)
+
+    def test_unwatched(self):
+        """Test an unwatched dataset isn't served once its file changed."""
+        self.write_csv("1603850,Rep. Jamaal Bowman (D-NY-16)\n")
+
+        self.assertIsNone(self.repository.get_dataset())
+        self.assertEqual(
+            self.repository.get_all(),
+            [Person(id=1603850, name="Rep. Jamaal Bowman (D-NY-16)")],
+        )
+
+    def test_start_stop(self):
+        """Test start and stop watching datasets."""
+        self.reloader.start()
+        self.assertTrue(CsvReadRepository.datasets.is_watched(FILE_PATH))
+
+        self.reloader.stop()
+        self.assertFalse(CsvReadRepository.datasets.is_watched(FILE_PATH))
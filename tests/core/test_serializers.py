@@ -0,0 +1,118 @@
+"""Tests for serializers."""
+
+import json
+from dataclasses import asdict, dataclass
+
+from watcher.core.serializers import CsvSerializer, JsonSerializer
+from watcher.votes.enum import VoteType
+from watcher.votes.models import BillVoteSummary, VoteResult
+
+from tests.common import BaseTestCase
+
+
+@dataclass
+class Sample:
+    """Sample."""
+
+    name: str
+    ratio: float
+    active: bool
+    tags: list[str]
+
+
+class TestJsonSerializer(BaseTestCase):
+    """Tests for JSON serializer."""
+
+    def test_serialize(self):
+        """Test serialize."""
+        serializer = JsonSerializer.for_dataclass(BillVoteSummary)
+        obj = BillVoteSummary(
+            bill_id=2900994,
+            bill_title='H.R. 3684: "Infrastructure" Act — 2021',
+            sponsor_id=None,
+            sponsor_name="N/A",
+            supporters=2,
+            opposers=3,
+        )
+
+        self.assertEqual(json.loads(serializer.serialize(obj)), asdict(obj))
+
+    def test_serialize_enum(self):
+        """Test serialize integer enums."""
+        serializer = JsonSerializer.for_dataclass(VoteResult)
+        obj = VoteResult(
+            id=92516553,
+            legislator_id=1269790,
+            vote_id=3321166,
+            vote_type=VoteType.NO,
+        )
+
+        self.assertEqual(
+            serializer.serialize(obj),
+            '{"id":92516553,"legislator_id":1269790,'
+            '"vote_id":3321166,"vote_type":2}',
+        )
+
+    def test_serialize_other_types(self):
+        """Test serialize floats, booleans and other types."""
+        serializer = JsonSerializer.for_dataclass(Sample)
+        obj = Sample(name="a", ratio=0.5, active=True, tags=["x"])
+
+        self.assertEqual(json.loads(serializer.serialize(obj)), asdict(obj))
+
+    def test_iter_chunks(self):
+        """Test iter chunks."""
+        serializer = JsonSerializer({"id": int})
+        objs = [VoteResult(i, 0, 0, VoteType.YES) for i in range(5)]
+
+        chunks = list(serializer.iter_chunks(objs, chunk_size=2))
+
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(
+            json.loads("".join(chunks)), [{"id": i} for i in range(5)]
+        )
+        self.assertEqual("".join(serializer.iter_chunks([])), "[]")
+
+    def test_iter_lines(self):
+        """Test iter lines."""
+        serializer = JsonSerializer({"id": int})
+        objs = [VoteResult(i, 0, 0, VoteType.YES) for i in range(3)]
+
+        chunks = list(serializer.iter_lines(objs, chunk_size=2))
+
+        self.assertEqual(chunks, ['{"id":0}\n{"id":1}\n', '{"id":2}\n'])
+        self.assertEqual(list(serializer.iter_lines([])), [])
+
+
+class TestCsvSerializer(BaseTestCase):
+    """Tests for CSV serializer."""
+
+    def test_iter_chunks(self):
+        """Test iter chunks."""
+        serializer = CsvSerializer.for_dataclass(VoteResult)
+        objs = [
+            VoteResult(92516553, 1269790, 3321166, VoteType.YES),
+            VoteResult(92516784, 400440, 3321166, VoteType.NO),
+        ]
+
+        chunks = list(serializer.iter_chunks(objs, chunk_size=1))
+
+        self.assertEqual(
+            chunks,
+            [
+                "id,legislator_id,vote_id,vote_type\r\n"
+                "92516553,1269790,3321166,1\r\n",
+                "92516784,400440,3321166,2\r\n",
+                "",
+            ],
+        )
+
+    def test_iter_chunks_empty(self):
+        """Test iter chunks without objects."""
+        serializer = CsvSerializer.for_dataclass(BillVoteSummary)
+
+        self.assertEqual(
+            "".join(serializer.iter_chunks([])),
+            "bill_id,bill_title,sponsor_id,sponsor_name,supporters,opposers"
+            "\r\n",
+        )
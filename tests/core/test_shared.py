@@ -0,0 +1,124 @@
+"""Tests for shared datasets."""
+
+import secrets
+
+from django.test import override_settings
+
+from watcher.core.datasets import Dataset
+from watcher.core.metrics import REPOSITORY_SCANS
+from watcher.core.repositories import CsvReadRepository
+from watcher.core.shared import SharedDatasetStore, get_shared_store
+from watcher.votes.models import Person
+from watcher.votes.repositories import VoteResultCsvRepository
+
+from tests.common import BaseTestCase
+
+MEDIA_ROOT = "tests/samples/media"
+STORE_NAME = f"watcher-test-{secrets.token_hex(4)}"
+
+
+def build_dataset(version, items):
+    """Build a dataset of people."""
+    return Dataset(
+        version=version,
+        items=tuple(items),
+        index={item.id: item for item in items},
+    )
+
+
+class TestSharedDatasetStore(BaseTestCase):
+    """Tests for shared dataset store."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.publisher = SharedDatasetStore(STORE_NAME)
+        self.worker = SharedDatasetStore(STORE_NAME)
+
+    def tearDown(self):
+        """Remove published datasets."""
+        self.publisher.unlink()
+
+    def test_publish(self):
+        """Test publish a dataset and get it from another store."""
+        people = [
+            Person(id=1603850, name="Rep. Jamaal Bowman (D-NY-16)"),
+            Person(id=904789, name="Rep. Nydia Velázquez (D-NY-7)"),
+            Person(id=412211, name=""),
+        ]
+
+        published = self.publisher.publish(
+            "people", build_dataset("1", people)
+        )
+        dataset = self.worker.get("people", "1")
+
+        self.assertTrue(published)
+        self.assertIsNotNone(dataset)
+        self.assertEqual(list(dataset.items), people)
+        self.assertEqual(dataset.items[1], people[1])
+        self.assertEqual(dataset.items[1:], people[1:])
+        self.assertEqual(dataset.index[904789], people[1])
+        self.assertIn(412211, dataset.index)
+        self.assertNotIn(1, dataset.index)
+        self.assertEqual(dict(dataset.index), {p.id: p for p in people})
+        self.assertIsNone(self.worker.get("people", "2"))
+        self.assertIsNone(self.worker.get("bills", "1"))
+
+    def test_publish_same_version(self):
+        """Test publish a version already published."""
+        dataset = build_dataset("1", [Person(id=1, name="A")])
+
+        self.assertTrue(self.publisher.publish("people", dataset))
+        self.assertFalse(self.publisher.publish("people", dataset))
+
+    def test_publish_new_version(self):
+        """Test workers switch to a new version once published."""
+        self.publisher.publish(
+            "people", build_dataset("1", [Person(id=1, name="A")])
+        )
+        old_dataset = self.worker.get("people", "1")
+
+        self.publisher.publish(
+            "people", build_dataset("2", [Person(id=2, name="B")])
+        )
+
+        self.assertIsNone(self.worker.get("people", "1"))
+        self.assertEqual(
+            list(self.worker.get("people", "2").items),
+            [Person(id=2, name="B")],
+        )
+        self.assertEqual(list(old_dataset.items), [Person(id=1, name="A")])
+
+
+@override_settings(
+    MEDIA_ROOT=MEDIA_ROOT,
+    SHARED_DATASETS_ENABLED=True,
+    SHARED_DATASETS_NAME=STORE_NAME,
+)
+class TestSharedRepository(BaseTestCase):
+    """Tests for repositories reading shared datasets."""
+
+    def tearDown(self):
+        """Remove published datasets."""
+        CsvReadRepository.datasets.clear()
+        get_shared_store().unlink()
+
+    def test_get_dataset(self):
+        """Test repositories read published datasets."""
+        file_path = "csv/vote_results_md.csv"
+        repository = VoteResultCsvRepository(file_path)
+        items = repository.get_all()
+
+        self.assertIsNone(repository.get_dataset())
+        self.assertTrue(repository.publish(get_shared_store()))
+        self.assertFalse(repository.publish(get_shared_store()))
+
+        scans = REPOSITORY_SCANS.get(dataset=file_path)
+        self.assertIsNotNone(repository.get_dataset())
+        self.assertEqual(repository.get_all(), items)
+        self.assertEqual(repository.get_by_id(items[3].id), items[3])
+        self.assertEqual(REPOSITORY_SCANS.get(dataset=file_path), scans)
+
+    @override_settings(SHARED_DATASETS_ENABLED=False)
+    def test_disabled(self):
+        """Test the shared dataset store when disabled."""
+        self.assertIsNone(get_shared_store())
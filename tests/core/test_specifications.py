@@ -0,0 +1,177 @@
+"""Tests for specifications."""
+
+from types import SimpleNamespace
+
+from django.test import RequestFactory
+
+from watcher.core.specifications import (
+    AndSpecification,
+    ContainsSpecification,
+    EqualsSpecification,
+    InSpecification,
+    OrSpecification,
+    SearchSpecificationBackend,
+    is_unsatisfiable,
+    simplify_specification,
+)
+
+from tests.common import BaseTestCase
+
+
+class TestSpecificationKey(BaseTestCase):
+    """Tests for specification keys."""
+
+    def test_order_and_duplicates(self):
+        """Test keys ignore the order and repetitions of children."""
+        spec1 = AndSpecification(
+            EqualsSpecification("vote_type", 1),
+            EqualsSpecification("vote_id", 3321166),
+        )
+        spec2 = AndSpecification(
+            EqualsSpecification("vote_id", 3321166),
+            EqualsSpecification("vote_type", 1),
+            EqualsSpecification("vote_id", 3321166),
+        )
+
+        self.assertEqual(spec1.get_key(), spec2.get_key())
+        self.assertNotEqual(
+            spec1.get_key(),
+            OrSpecification(*spec1.specs).get_key(),
+        )
+
+    def test_nested(self):
+        """Test keys flatten nested specifications of the same type."""
+        spec1 = OrSpecification(
+            EqualsSpecification("id", 1),
+            OrSpecification(
+                EqualsSpecification("id", 2),
+                ContainsSpecification("name", "Don"),
+            ),
+        )
+        spec2 = OrSpecification(
+            ContainsSpecification("name", "Don"),
+            EqualsSpecification("id", 2),
+            EqualsSpecification("id", 1),
+        )
+
+        self.assertEqual(spec1.get_key(), spec2.get_key())
+        self.assertEqual(
+            AndSpecification(EqualsSpecification("id", 1)).get_key(),
+            EqualsSpecification("id", 1).get_key(),
+        )
+
+    def test_in(self):
+        """Test keys of in specifications ignore the order of values."""
+        self.assertEqual(
+            InSpecification("id", [2, 1, 2]).get_key(),
+            InSpecification("id", (1, 2)).get_key(),
+        )
+
+    def test_unhashable(self):
+        """Test specifications with unhashable values have no key."""
+        spec = AndSpecification(
+            EqualsSpecification("id", 1),
+            EqualsSpecification("tags", ["a"]),
+        )
+
+        self.assertIsNone(spec.get_key())
+
+
+class TestSimplifySpecification(BaseTestCase):
+    """Tests for specification simplification."""
+
+    def test_keep_none_equalities(self):
+        """Test equalities to None are kept, as fields may be None."""
+        bill_summary = SimpleNamespace(sponsor_id=None, sponsor_name="N/A")
+        spec = AndSpecification(
+            EqualsSpecification("sponsor_id", None),
+            ContainsSpecification("sponsor_name", "N/A"),
+        )
+
+        simplified = simplify_specification(spec)
+
+        self.assertFalse(is_unsatisfiable(simplified))
+        self.assertEqual(simplified.get_key(), spec.get_key())
+        self.assertTrue(simplified.is_satisfied_by(bill_summary))
+        self.assertTrue(
+            is_unsatisfiable(
+                simplify_specification(
+                    AndSpecification(
+                        EqualsSpecification("sponsor_id", None),
+                        EqualsSpecification("sponsor_id", 400100),
+                    )
+                )
+            )
+        )
+        self.assertTrue(
+            is_unsatisfiable(simplify_specification(InSpecification("id", [])))
+        )
+
+    def test_merge_equalities(self):
+        """Test equalities on the same field are merged into a set lookup."""
+        spec = AndSpecification(
+            OrSpecification(
+                EqualsSpecification("id", 1),
+                OrSpecification(
+                    EqualsSpecification("id", 2), EqualsSpecification("id", 3)
+                ),
+                InSpecification("id", [3, 4]),
+            ),
+            EqualsSpecification("vote_type", 1),
+        )
+
+        simplified = simplify_specification(spec)
+
+        self.assertIsInstance(simplified, AndSpecification)
+        lookup, vote_type = simplified.specs
+        self.assertIsInstance(lookup, InSpecification)
+        self.assertEqual(lookup.value, frozenset({1, 2, 3, 4}))
+        self.assertIsInstance(vote_type, EqualsSpecification)
+
+    def test_fold_constants(self):
+        """Test settled composites are folded."""
+        contradiction = AndSpecification(
+            EqualsSpecification("id", 1),
+            ContainsSpecification("name", "Bacon"),
+            InSpecification("id", frozenset({2, 3})),
+        )
+        tautology = OrSpecification(
+            ContainsSpecification("name", "Bacon"), AndSpecification()
+        )
+
+        self.assertTrue(
+            is_unsatisfiable(simplify_specification(contradiction))
+        )
+        self.assertEqual(simplify_specification(tautology).specs, ())
+        self.assertTrue(
+            is_unsatisfiable(
+                simplify_specification(
+                    AndSpecification(
+                        EqualsSpecification("id", 1), OrSpecification()
+                    )
+                )
+            )
+        )
+
+
+class TestSearchSpecificationBackend(BaseTestCase):
+    """Tests for the search specification backend."""
+
+    def test_drop_uncast_values(self):
+        """Test search values that can't be cast to a field are dropped."""
+        view = SimpleNamespace(
+            search_fields={"sponsor_id": int, "sponsor_name__contains": str}
+        )
+        request = RequestFactory().get("/", {"search": "N/A"})
+
+        spec = SearchSpecificationBackend().build(request, view)
+
+        self.assertEqual(
+            spec.get_key(),
+            ContainsSpecification("sponsor_name", "N/A").get_key(),
+        )
+        self.assertFalse(
+            spec.is_satisfied_by(
+                SimpleNamespace(sponsor_id=None, sponsor_name="Rep. Bacon")
+            )
+        )
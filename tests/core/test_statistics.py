@@ -0,0 +1,60 @@
+"""Tests for statistics."""
+
+from dataclasses import dataclass
+
+from watcher.core.statistics import collect_statistics
+
+from tests.common import BaseTestCase
+
+
+@dataclass
+class Row:
+    """Row."""
+
+    id: int
+    kind: int
+    title: str
+
+
+class TestCollectStatistics(BaseTestCase):
+    """Tests for collect statistics."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.items = [
+            Row(id=i, kind=i % 4, title=f"Bill {i}") for i in range(1000)
+        ]
+
+    def test_collect_statistics(self):
+        """Test collect exact statistics of a small dataset."""
+        statistics = collect_statistics(self.items)
+
+        self.assertEqual(statistics.rows, 1000)
+        self.assertEqual(statistics.fields["id"].distinct, 1000)
+        self.assertEqual(statistics.fields["kind"].distinct, 4)
+        self.assertEqual(statistics.fields["kind"].get_frequency(1), 0.25)
+        self.assertEqual(statistics.fields["kind"].get_frequency(9), 0)
+        self.assertEqual(statistics.fields["id"].get_frequency(1), 0.001)
+        self.assertEqual(
+            statistics.fields["title"].get_containing_fraction("Bill 99"),
+            0.011,
+        )
+        self.assertIsNone(statistics.fields["id"].get_containing_fraction("1"))
+        self.assertEqual(statistics.fields["title"].average_length, 7.89)
+
+    def test_collect_sampled_statistics(self):
+        """Test estimate statistics from a sample."""
+        statistics = collect_statistics(self.items, sample_size=100)
+
+        self.assertEqual(statistics.fields["id"].distinct, 1000)
+        self.assertEqual(statistics.fields["kind"].distinct, 4)
+        self.assertAlmostEqual(
+            statistics.fields["kind"].get_frequency(0), 0.25, delta=0.1
+        )
+
+    def test_collect_empty_statistics(self):
+        """Test collect statistics of an empty dataset."""
+        statistics = collect_statistics([])
+
+        self.assertEqual(statistics.rows, 0)
+        self.assertEqual(statistics.fields, {})
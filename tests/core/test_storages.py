@@ -0,0 +1,181 @@
+"""Tests for storages."""
+
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.test import override_settings
+
+from watcher.core.storages import (
+    CachedStorage,
+    SlowFileSystemStorage,
+    get_dataset_storage,
+)
+from watcher.votes.repositories import VoteResultCsvRepository
+from watcher.votes.warmup import prefetch_datasets
+
+from tests.common import BaseTestCase
+
+MEDIA_ROOT = "tests/samples/media"
+MEDIA_FILES = {
+    "bills": "csv/bills_md.csv",
+    "legislators": "csv/legislators_md.csv",
+    "votes": "csv/votes_md.csv",
+    "vote_results": "csv/vote_results_md.csv",
+}
+
+
+class TestCachedStorage(BaseTestCase):
+    """Tests for cached storage."""
+
+    def setUp(self):
+        """Set up a slow storage with a local cache."""
+        self.remote_dir = tempfile.mkdtemp()
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.remote_dir)
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+        self.remote = SlowFileSystemStorage(
+            latency=0, location=self.remote_dir
+        )
+        self.storage = CachedStorage(self.remote, self.cache_dir, chunk_size=4)
+        self.write("csv/data.csv", b"id\n1\n2\n")
+
+    def write(self, name, content, modified_time=1_700_000_000):
+        """Write a file to the remote storage."""
+        path = os.path.join(self.remote_dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as file:
+            file.write(content)
+        os.utime(path, (modified_time, modified_time))
+
+    def read(self, name):
+        """Read a file through the cache."""
+        with self.storage.open(name, "rb") as file:
+            return file.read()
+
+    def test_read_through(self):
+        """Test files are copied on their first read only."""
+        self.assertEqual(self.read("csv/data.csv"), b"id\n1\n2\n")
+        self.assertEqual(self.read("csv/data.csv"), b"id\n1\n2\n")
+
+        self.assertEqual(self.remote.bytes_read, 7)
+        cache_path = self.storage.fetch("csv/data.csv")
+        self.assertEqual(
+            os.path.dirname(cache_path), os.path.join(self.cache_dir, "csv")
+        )
+        self.assertRegex(
+            os.path.basename(cache_path), r"^data\.csv\.[0-9a-f]{16}$"
+        )
+
+    def test_invalidate_changed_file(self):
+        """Test files are copied again once they change."""
+        self.read("csv/data.csv")
+        self.write("csv/data.csv", b"id\n1\n2\n3\n")
+
+        self.assertEqual(self.read("csv/data.csv"), b"id\n1\n2\n3\n")
+        self.assertEqual(self.remote.bytes_read, 16)
+
+    def test_replace_stale_copies(self):
+        """Test copies are named after their version, and replaced."""
+        self.write("csv/data.csv.gz", b"gz")
+        self.read("csv/data.csv.gz")
+        stale_path = self.storage.fetch("csv/data.csv")
+        self.write("csv/data.csv", b"id\n1\n2\n3\n")
+
+        path = self.storage.fetch("csv/data.csv")
+
+        self.assertNotEqual(path, stale_path)
+        self.assertEqual(
+            sorted(os.listdir(os.path.join(self.cache_dir, "csv"))),
+            sorted(
+                [
+                    os.path.basename(path),
+                    os.path.basename(self.storage.fetch("csv/data.csv.gz")),
+                ]
+            ),
+        )
+        # Readers retry when the copy they found is removed in between.
+        with mock.patch.object(
+            self.storage, "fetch", side_effect=[stale_path, path]
+        ):
+            self.assertEqual(self.read("csv/data.csv"), b"id\n1\n2\n3\n")
+
+    def test_invalidate_changed_etag(self):
+        """Test etags validate copies when the storage provides them."""
+        with mock.patch.object(
+            self.remote, "get_etag", create=True, return_value="a"
+        ) as get_etag:
+            self.read("csv/data.csv")
+            self.write("csv/data.csv", b"id\n3\n4\n")
+            self.assertEqual(self.read("csv/data.csv"), b"id\n1\n2\n")
+
+            get_etag.return_value = "b"
+            self.assertEqual(self.read("csv/data.csv"), b"id\n3\n4\n")
+
+    def test_prefetch(self):
+        """Test files are prefetched in parallel."""
+        self.write("csv/other.csv", b"id\n3\n")
+
+        paths = self.storage.prefetch(["csv/data.csv", "csv/other.csv"])
+
+        self.assertEqual(len(paths), 2)
+        self.assertEqual(self.read("csv/other.csv"), b"id\n3\n")
+        self.assertEqual(self.remote.bytes_read, 12)
+
+    def test_read_only(self):
+        """Test cached storages can't write files."""
+        with self.assertRaises(ValueError):
+            self.storage.open("csv/data.csv", "wb")
+
+
+@override_settings(
+    MEDIA_ROOT=MEDIA_ROOT,
+    MEDIA_FILES=MEDIA_FILES,
+    STORAGES={
+        "datasets": {
+            "BACKEND": "watcher.core.storages.SlowFileSystemStorage",
+            "OPTIONS": {"latency": 0.001, "location": MEDIA_ROOT},
+        },
+    },
+)
+class TestDatasetStorage(BaseTestCase):
+    """Tests for dataset storage."""
+
+    def setUp(self):
+        """Set up a cache directory."""
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+
+    def test_get_dataset_storage(self):
+        """Test datasets are read from the datasets storage."""
+        storage = get_dataset_storage()
+        bytes_read = storage.bytes_read
+
+        self.assertIsInstance(storage, SlowFileSystemStorage)
+        repository = VoteResultCsvRepository("csv/vote_results_md.csv")
+        self.assertEqual(len(repository.get_all()), 10)
+        self.assertEqual(storage.bytes_read - bytes_read, 294)
+
+    def test_get_dataset_storage_shared(self):
+        """Test the cached storage is shared while settings are unchanged."""
+        with override_settings(DATASET_CACHE_DIR=self.cache_dir):
+            storage = get_dataset_storage()
+            self.assertIs(get_dataset_storage(), storage)
+
+        with override_settings(DATASET_CACHE_DIR=self.cache_dir + "/other"):
+            self.assertIsNot(get_dataset_storage(), storage)
+
+    def test_get_cached_dataset_storage(self):
+        """Test datasets are read through the local cache, if enabled."""
+        with override_settings(DATASET_CACHE_DIR=self.cache_dir):
+            storage = get_dataset_storage()
+            bytes_read = storage.storage.bytes_read
+            self.assertEqual(len(prefetch_datasets()), 4)
+            repository = VoteResultCsvRepository("csv/vote_results_md.csv")
+            items = repository.get_all()
+
+        self.assertIsInstance(storage, CachedStorage)
+        self.assertEqual(len(items), 10)
+        # Every file was read from the storage once, by the prefetch.
+        self.assertEqual(storage.storage.bytes_read - bytes_read, 1443)
@@ -0,0 +1,43 @@
+"""Tests for views."""
+
+from dataclasses import dataclass
+
+from django.test import RequestFactory
+from django.views.generic import ListView
+
+from watcher.core.views import ExportMixin
+
+from tests.common import BaseTestCase
+
+
+@dataclass
+class Sample:
+    """Sample object."""
+
+    id: int
+    name: str
+
+
+class SampleListView(ExportMixin, ListView):
+    """Sample list view exporting its queryset."""
+
+    model = Sample
+
+    def get_queryset(self):
+        """Get queryset."""
+        return [Sample(id=1, name="a"), Sample(id=2, name="b")]
+
+
+class TestExportMixin(BaseTestCase):
+    """Tests for export mixin."""
+
+    def test_export_queryset(self):
+        """Test views export their queryset unless they stream items."""
+        request = RequestFactory().get("/samples/", {"export": "csv"})
+        response = SampleListView.as_view()(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            b"".join(response.streaming_content).decode().splitlines(),
+            ["id,name", "1,a", "2,b"],
+        )
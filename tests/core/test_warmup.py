@@ -0,0 +1,145 @@
+"""Tests for warm-up."""
+
+import importlib
+import threading
+from unittest import mock
+
+from django.apps import apps
+from django.test import override_settings
+from django.urls import reverse
+
+import watcher.asgi
+import watcher.wsgi
+from watcher.core import warmup
+from watcher.core.metrics import REPOSITORY_SCANS
+from watcher.core.repositories import CsvReadRepository
+from watcher.core.views import QueryCacheMixin
+from watcher.votes.repositories import VoteResultCsvRepository
+from watcher.votes.warmup import warm_up
+
+from tests.common import BaseTestCase
+
+MEDIA_ROOT = "tests/samples/media"
+MEDIA_FILES = {
+    "bills": "csv/bills_md.csv",
+    "legislators": "csv/legislators_md.csv",
+    "votes": "csv/votes_md.csv",
+    "vote_results": "csv/vote_results_md.csv",
+}
+
+TASK_STARTED = threading.Event()
+TASK_RELEASED = threading.Event()
+
+
+def blocking_task():
+    """Block until released."""
+    TASK_STARTED.set()
+    TASK_RELEASED.wait(timeout=5)
+
+
+def failing_task():
+    """Fail."""
+    raise RuntimeError("Warm-up failed.")
+
+
+class TestWarmUp(BaseTestCase):
+    """Tests for warm-up."""
+
+    def tearDown(self):
+        """Mark the app as ready again."""
+        warmup.start_warm_up()
+
+    @override_settings(
+        WARM_UP_ENABLED=True,
+        WARM_UP_TASKS=["tests.core.test_warmup.blocking_task"],
+    )
+    def test_readiness(self):
+        """Test readiness until the warm-up is done."""
+        TASK_STARTED.clear()
+        TASK_RELEASED.clear()
+
+        thread = warmup.start_warm_up()
+        TASK_STARTED.wait(timeout=5)
+        response = self.client.get(reverse("core:readiness"))
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json(), {"ready": False})
+
+        TASK_RELEASED.set()
+        thread.join(timeout=5)
+        response = self.client.get(reverse("core:readiness"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"ready": True})
+
+    @override_settings(
+        WARM_UP_ENABLED=True,
+        WARM_UP_TASKS=["tests.core.test_warmup.failing_task"],
+    )
+    def test_failing_task(self):
+        """Test a failing task still marks the app as ready."""
+        with self.assertLogs("watcher.core.warmup", "ERROR"):
+            thread = warmup.start_warm_up()
+            thread.join(timeout=5)
+
+        self.assertTrue(warmup.is_ready())
+
+    @override_settings(WARM_UP_ENABLED=False)
+    def test_disabled(self):
+        """Test the app is ready right away when disabled."""
+        self.assertIsNone(warmup.start_warm_up())
+        self.assertTrue(warmup.is_ready())
+
+    def test_started_by_applications(self):
+        """Test only the applications serving requests warm up."""
+        with mock.patch.object(warmup, "start_warm_up") as start_warm_up:
+            apps.get_app_config("core").ready()
+            start_warm_up.assert_not_called()
+
+            for module in (watcher.wsgi, watcher.asgi):
+                importlib.reload(module)
+
+        self.assertEqual(start_warm_up.call_count, 2)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, MEDIA_FILES=MEDIA_FILES)
+class TestVotesWarmUp(BaseTestCase):
+    """Tests for votes warm-up."""
+
+    def setUp(self):
+        """Set up test data."""
+        QueryCacheMixin.query_cache.clear()
+
+    def tearDown(self):
+        """Unload datasets."""
+        CsvReadRepository.datasets.clear()
+        QueryCacheMixin.query_cache.clear()
+
+    def test_warm_up(self):
+        """Test warm-up loads datasets and precomputes summaries."""
+        warm_up()
+        scans = [
+            REPOSITORY_SCANS.get(dataset=file_path)
+            for file_path in MEDIA_FILES.values()
+        ]
+
+        for view_name in (
+            "votes:legislator-vote-summary-list",
+            "votes:bill-vote-summary-list",
+            "votes:vote-result-list",
+        ):
+            response = self.client.get(reverse(view_name))
+            self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(
+            [
+                REPOSITORY_SCANS.get(dataset=file_path)
+                for file_path in MEDIA_FILES.values()
+            ],
+            scans,
+        )
+        repository = VoteResultCsvRepository(MEDIA_FILES["vote_results"])
+        dataset = repository.get_dataset()
+        self.assertIsNotNone(dataset)
+        self.assertEqual(len(dataset.items), 10)
+        self.assertIs(dataset.index[92516711], repository.get_by_id(92516711))
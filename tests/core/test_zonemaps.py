@@ -0,0 +1,89 @@
+"""Tests for zone maps."""
+
+import io
+import json
+import os
+import shutil
+import tempfile
+
+from watcher.core.specifications import EqualsSpecification, InSpecification
+from watcher.core.zonemaps import (
+    ZoneMap,
+    build_zone_map,
+    get_zone_map_path,
+    write_zone_map,
+)
+
+from tests.common import BaseTestCase
+
+FILE_PATH = "tests/samples/media/csv/vote_results_md.csv"
+
+
+class TestZoneMap(BaseTestCase):
+    """Tests for zone maps."""
+
+    def setUp(self):
+        """Set up a zone map of two rows per block."""
+        with open(FILE_PATH, "rb") as file:
+            self.zone_map = build_zone_map(file, "1", block_size=52)
+
+    def test_build_zone_map(self):
+        """Test blocks of whole rows are built with their statistics."""
+        blocks = self.zone_map.blocks
+
+        self.assertEqual(
+            self.zone_map.fields,
+            ("id", "legislator_id", "vote_id", "vote_type"),
+        )
+        self.assertEqual([block.rows for block in blocks], [2, 2, 2, 2, 2])
+        self.assertEqual(self.zone_map.rows, 10)
+        self.assertEqual(blocks[0].offset, 35)
+        self.assertEqual(blocks[-1].offset + blocks[-1].length, 294)
+        for block, next_block in zip(blocks, blocks[1:]):
+            self.assertEqual(block.offset + block.length, next_block.offset)
+        self.assertEqual(blocks[0].ranges["vote_id"], (3321166, 3322842))
+        self.assertEqual(blocks[0].distinct["legislator_id"], 1)
+
+    def test_build_zone_map_mixed_values(self):
+        """Test fields with values that can't be compared get no range."""
+        file = io.BytesIO(b"id,code\n1,a\n2,3\n\n")
+        zone_map = build_zone_map(file, "1")
+
+        self.assertEqual(len(zone_map.blocks), 1)
+        self.assertEqual(zone_map.blocks[0].ranges, {"id": (1, 2)})
+        self.assertEqual(zone_map.blocks[0].distinct, {"id": 2, "code": 2})
+        self.assertEqual(zone_map.blocks[0].length, 9)
+
+    def test_prune(self):
+        """Test blocks whose ranges rule out a specification are pruned."""
+        blocks = self.zone_map.prune(
+            EqualsSpecification("legislator_id", 412421)
+        )
+        self.assertEqual(blocks, list(self.zone_map.blocks[3:]))
+
+        blocks = self.zone_map.prune(InSpecification("id", [92279979, 1]))
+        self.assertEqual(blocks, [self.zone_map.blocks[4]])
+
+    def test_parse(self):
+        """Test zone maps are parsed back from their data."""
+        data = json.loads(json.dumps(self.zone_map.to_dict()))
+        self.assertEqual(ZoneMap.parse(data, "zonemap.json"), self.zone_map)
+
+        with self.assertRaises(ValueError):
+            ZoneMap.parse({"version": "1"}, "zonemap.json")
+
+    def test_write_zone_map(self):
+        """Test zone maps are written next to their files."""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = shutil.copy(FILE_PATH, directory)
+
+        zone_map_path = write_zone_map(path, block_size=52)
+
+        self.assertEqual(zone_map_path, get_zone_map_path(path))
+        with open(zone_map_path, "rb") as file:
+            zone_map = ZoneMap.read(file, zone_map_path)
+        self.assertEqual(zone_map.blocks, self.zone_map.blocks)
+        self.assertTrue(
+            zone_map.version.startswith(f"{os.path.getsize(path)}-")
+        )
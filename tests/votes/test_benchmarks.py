@@ -0,0 +1,67 @@
+"""Tests for benchmarks."""
+
+from watcher.votes.benchmarks import (
+    BenchmarkResult,
+    BenchmarkSuite,
+    compare_results,
+    dump_results,
+    load_results,
+)
+
+from tests.common import BaseTestCase
+
+
+class TestBenchmarkSuite(BaseTestCase):
+    """Tests for benchmark suite."""
+
+    def test_run(self):
+        """Test run."""
+        results = BenchmarkSuite(repeat=1).run([200])
+
+        names = {result.name for result in results}
+        self.assertIn("repositories.iter_items.vote_results", names)
+        self.assertIn("repositories.get_by_id.bills", names)
+        self.assertIn("storages.read.cached", names)
+        self.assertIn("specifications.nested", names)
+        self.assertIn("services.bill_vote_summary.summarize_votes", names)
+        self.assertIn("views.votes:legislator-vote-summary-list", names)
+        self.assertIn("views.votes:download-all", names)
+        self.assertNotIn("views.votes:api-vote-result-ingest", names)
+        self.assertNotIn("views.votes:api-vote-summary-stream", names)
+
+        for result in results:
+            self.assertEqual(result.size, 200)
+            self.assertGreaterEqual(result.value, 0)
+
+    def test_dump_load_results(self):
+        """Test dump and load results."""
+        results = [BenchmarkResult("a", 10, "seconds", 1.5)]
+        self.assertEqual(load_results(dump_results(results)), results)
+
+
+class TestCompareResults(BaseTestCase):
+    """Tests for compare results."""
+
+    def test_compare_results(self):
+        """Test compare results."""
+        baseline = [
+            BenchmarkResult("slower", 10, "seconds", 1.0),
+            BenchmarkResult("faster", 10, "seconds", 1.0),
+            BenchmarkResult("fewer", 10, "rows_per_sec", 100.0, True),
+            BenchmarkResult("more", 10, "rows_per_sec", 100.0, True),
+        ]
+        current = [
+            BenchmarkResult("slower", 10, "seconds", 1.5),
+            BenchmarkResult("faster", 10, "seconds", 0.5),
+            BenchmarkResult("fewer", 10, "rows_per_sec", 50.0, True),
+            BenchmarkResult("more", 10, "rows_per_sec", 150.0, True),
+            BenchmarkResult("new", 10, "seconds", 1.0),
+        ]
+
+        regressions = compare_results(baseline, current, threshold=0.1)
+
+        self.assertEqual(
+            [regression.name for regression in regressions],
+            ["slower", "fewer"],
+        )
+        self.assertAlmostEqual(regressions[0].change, 0.5)
@@ -0,0 +1,91 @@
+"""Tests for generators."""
+
+import csv
+import tempfile
+from pathlib import Path
+
+from watcher.votes.generators import DatasetGenerator
+
+from tests.common import BaseTestCase
+
+
+class TestDatasetGenerator(BaseTestCase):
+    """Tests for dataset generator."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def read_rows(self, path):
+        """Read CSV rows from a file."""
+        with open(path, newline="") as file:
+            return list(csv.DictReader(file))
+
+    def test_write(self):
+        """Test write."""
+        generator = DatasetGenerator(vote_results=1000, legislators=50)
+        paths = generator.write(self.tmp_dir.name)
+
+        legislators = self.read_rows(paths["legislators"])
+        bills = self.read_rows(paths["bills"])
+        votes = self.read_rows(paths["votes"])
+        vote_results = self.read_rows(paths["vote_results"])
+
+        self.assertEqual(len(legislators), 50)
+        self.assertEqual(len(bills), generator.bills)
+        self.assertEqual(len(vote_results), 1000)
+
+        legislator_ids = {row["id"] for row in legislators}
+        bill_ids = {row["id"] for row in bills}
+        vote_ids = {row["id"] for row in votes}
+        for row in bills:
+            self.assertIn(row["sponsor_id"], legislator_ids)
+        for row in votes:
+            self.assertIn(row["bill_id"], bill_ids)
+        for row in vote_results:
+            self.assertIn(row["legislator_id"], legislator_ids)
+            self.assertIn(row["vote_id"], vote_ids)
+            self.assertIn(row["vote_type"], {"1", "2"})
+
+    def test_write_deterministic(self):
+        """Test write is deterministic for a given seed."""
+        dir1 = Path(self.tmp_dir.name) / "1"
+        dir2 = Path(self.tmp_dir.name) / "2"
+        DatasetGenerator(vote_results=500, seed=42).write(dir1)
+        DatasetGenerator(vote_results=500, seed=42).write(dir2)
+
+        for path in dir1.iterdir():
+            self.assertEqual(
+                path.read_bytes(), (dir2 / path.name).read_bytes()
+            )
+
+    def test_write_missing_foreign_keys(self):
+        """Test write with missing foreign keys."""
+        generator = DatasetGenerator(
+            vote_results=2000, legislators=20, missing_rate=0.2
+        )
+        paths = generator.write(self.tmp_dir.name)
+
+        legislator_ids = {
+            row["id"] for row in self.read_rows(paths["legislators"])
+        }
+        vote_ids = {row["id"] for row in self.read_rows(paths["votes"])}
+        vote_results = self.read_rows(paths["vote_results"])
+
+        self.assertTrue(
+            any(
+                row["legislator_id"] not in legislator_ids
+                for row in vote_results
+            )
+        )
+        self.assertTrue(
+            any(row["vote_id"] not in vote_ids for row in vote_results)
+        )
+
+    def test_invalid_params(self):
+        """Test invalid params."""
+        with self.assertRaises(ValueError):
+            DatasetGenerator(vote_results=0)
+        with self.assertRaises(ValueError):
+            DatasetGenerator(vote_results=10, missing_rate=2)
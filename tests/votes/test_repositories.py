@@ -1,7 +1,24 @@
 """Tests for repositories."""
 
+import os
+import shutil
+import tempfile
+import threading
+import time
+from unittest import mock
+
 from django.test import override_settings
 
+from watcher.core.instrumentation import start_timing
+from watcher.core.metrics import REPOSITORY_ROWS_PARSED
+from watcher.core.repositories import CsvReadRepository
+from watcher.core.specifications import (
+    AndSpecification,
+    EqualsSpecification,
+)
+from watcher.core.zonemaps import write_zone_map
+from watcher.votes.enum import VoteType
+from watcher.votes.models import VoteResult
 from watcher.votes.repositories import (
     BillCsvRepository,
     LegislatorCsvRepository,
@@ -287,3 +304,388 @@ class TestVoteResultCsvRepository(BaseTestCase):
         self.assertAttrEqual(item2, "legislator_id", 400440)
         self.assertAttrEqual(item2, "vote_id", 3321166)
         self.assertAttrEqual(item2, "vote_type", 2)
+
+    def test_get_many(self):
+        """Test get items by primary keys."""
+        items = self.repository.get_many([92516784, 1, 92516553])
+
+        self.assertEqual([item.id for item in items], [92516784, 92516553])
+        self.assertEqual(self.repository.get_many([]), [])
+
+    def test_get_count_estimate(self):
+        """Test get an estimate of the number of items."""
+        self.assertEqual(self.repository.get_count_estimate(), 2)
+
+    def test_get_index(self):
+        """Test get inverted index, built once per dataset version."""
+        index = self.repository.get_index("legislator_id")
+
+        self.assertEqual(list(index[1269790]), [92516553])
+        self.assertIs(self.repository.get_index("legislator_id"), index)
+        items = self.repository.get_by_index("vote_id", 3321166)
+        self.assertEqual([item.id for item in items], [92516553, 92516784])
+        self.assertEqual(self.repository.get_by_index("vote_id", 1), [])
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, DATASET_LOAD_ON_DEMAND=True)
+class TestCsvRepositoryLoadOnDemand(BaseTestCase):
+    """Tests for CSV repositories loading datasets on demand."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.repository = VoteResultCsvRepository("csv/vote_results_md.csv")
+
+    def tearDown(self):
+        """Unload datasets."""
+        CsvReadRepository.datasets.clear()
+
+    def get_all_concurrently(self, build_dataset, count=8):
+        """Get all items from several threads at once."""
+        barrier = threading.Barrier(count)
+        results = [None] * count
+
+        def run(index):
+            barrier.wait()
+            try:
+                results[index] = self.repository.get_all()
+            except ValueError as err:
+                results[index] = err
+
+        threads = [
+            threading.Thread(target=run, args=(index,))
+            for index in range(count)
+        ]
+        with mock.patch.object(
+            VoteResultCsvRepository,
+            "_build_dataset",
+            autospec=True,
+            side_effect=build_dataset,
+        ) as mock_build_dataset:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        return results, mock_build_dataset.call_count
+
+    def test_load_once(self):
+        """Test concurrent callers parse the file once."""
+        build_dataset = VoteResultCsvRepository._build_dataset
+
+        def slow_build_dataset(repository, version):
+            time.sleep(0.1)
+            return build_dataset(repository, version)
+
+        results, parses = self.get_all_concurrently(slow_build_dataset)
+
+        self.assertEqual(parses, 1)
+        self.assertEqual(len(results[0]), 10)
+        for result in results:
+            self.assertEqual(result, results[0])
+
+    def test_load_failure(self):
+        """Test a failed load reaches every caller without being kept."""
+
+        def failing_build_dataset(repository, version):
+            time.sleep(0.1)
+            raise ValueError("Invalid row.")
+
+        results, parses = self.get_all_concurrently(failing_build_dataset)
+
+        self.assertEqual(parses, 1)
+        for result in results:
+            self.assertIsInstance(result, ValueError)
+        self.assertEqual(len(self.repository.get_all()), 10)
+
+    def test_get_many_by_values(self):
+        """Test get items by field values from the dataset in memory."""
+        with override_settings(DATASET_LOAD_ON_DEMAND=False):
+            self.assertIsNone(
+                self.repository.get_many_by_values("vote_id", [3321166])
+            )
+
+        items = self.repository.get_many_by_values("vote_id", [3322842, 3321166])
+
+        self.assertEqual(
+            [(item.id, item.vote_id) for item in items],
+            [
+                (92516711, 3321166),
+                (92516770, 3322842),
+                (92516688, 3321166),
+                (92516734, 3322842),
+                (92279979, 3321166),
+                (92279979, 3322842),
+            ],
+        )
+        self.assertEqual(self.repository.get_many_by_values("vote_id", [1]), [])
+
+    def test_plan_specification(self):
+        """Test loaded datasets plan specifications from statistics."""
+        spec = AndSpecification(
+            EqualsSpecification("vote_type", 2),
+            EqualsSpecification("legislator_id", 412393),
+        )
+        expected = VoteResultCsvRepository(self.repository.file_path)
+        with override_settings(DATASET_LOAD_ON_DEMAND=False):
+            expected_items = expected.get_all(spec)
+
+        with self.assertLogs("watcher.core.repositories", "DEBUG") as logs:
+            items = self.repository.get_all(spec)
+
+        self.assertEqual(items, expected_items)
+        self.assertEqual(len(items), 4)
+        self.assertIn(
+            "and(legislator_id = 412393 [selectivity=0.4, cost=1], "
+            "vote_type = 2 [selectivity=0.6, cost=1])",
+            logs.output[-1],
+        )
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class TestCompressedCsvRepository(BaseTestCase):
+    """Tests for CSV repositories of compressed files."""
+
+    file_path = "csv/vote_results_md.csv"
+    extensions = [".gz", ".bz2", ".xz"]
+
+    def test_get_all(self):
+        """Test compressed files are read like the plain ones."""
+        expected_items = VoteResultCsvRepository(self.file_path).get_all()
+
+        for extension in self.extensions:
+            with self.subTest(extension=extension):
+                repository = VoteResultCsvRepository(self.file_path + extension)
+                self.assertEqual(repository.get_all(), expected_items)
+
+    def test_get_count_estimate(self):
+        """Test the rows of compressed files are counted decompressed."""
+        for extension in self.extensions:
+            with self.subTest(extension=extension):
+                repository = VoteResultCsvRepository(self.file_path + extension)
+                self.assertEqual(repository.get_count_estimate(), 10)
+
+    def test_get_count_estimate_sampled(self):
+        """Test the rows of large compressed files are estimated."""
+        repository = VoteResultCsvRepository(self.file_path + ".gz")
+        repository.count_estimate_sample_size = 128
+        self.assertEqual(repository.get_count_estimate(), 6)
+
+        # Heads too short to hold a decompressed row can't be sampled.
+        repository.count_estimate_sample_size = 64
+        self.assertIsNone(repository.get_count_estimate())
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class TestPartitionedCsvRepository(BaseTestCase):
+    """Tests for CSV repositories of partitioned datasets."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.repository = VoteResultCsvRepository(
+            "csv/vote_results_pt/manifest.json"
+        )
+
+    def test_get_all(self):
+        """Test partitions are read like a single file."""
+        expected_items = VoteResultCsvRepository(
+            "csv/vote_results_md.csv"
+        ).get_all()
+        items = self.repository.get_all()
+
+        self.assertEqual(sorted(items, key=repr), sorted(expected_items, key=repr))
+        self.repository.partition_scan_workers = 1
+        self.assertEqual(self.repository.get_all(), items)
+
+    def test_prune_partitions(self):
+        """Test partitions ruled out by a specification aren't read."""
+        spec = EqualsSpecification("vote_id", 3354186)
+        partitions = self.repository.get_partitions(spec)
+
+        self.assertEqual(
+            [partition.file_path for partition in partitions],
+            ["csv/vote_results_pt/session_118.csv.gz"],
+        )
+        with mock.patch.object(
+            self.repository,
+            "_iter_file_items",
+            wraps=self.repository._iter_file_items,
+        ) as iter_file_items:
+            items = self.repository.get_all(spec)
+
+        self.assertEqual([item.id for item in items], [92516784, 92516753])
+        iter_file_items.assert_called_once()
+
+    def test_get_count_estimate(self):
+        """Test the rows of partitioned datasets come from the manifest."""
+        self.assertEqual(self.repository.get_count_estimate(), 10)
+
+    def test_get_all_in_chunks(self):
+        """Test partitions scanned in chunks keep their order and counters."""
+        self.repository.partition_scan_workers = 1
+        expected_items = self.repository.get_all()
+
+        self.repository.partition_scan_workers = 2
+        self.repository.partition_scan_chunk_size = 1
+        self.repository.partition_scan_queue_size = 1
+        with start_timing() as timing:
+            items = self.repository.get_all()
+
+        self.assertEqual(items, expected_items)
+        self.assertEqual(timing.counters["rows_read"], 10)
+
+    def test_stop_partition_scan(self):
+        """Test scans blocked on full queues stop with the generation."""
+        self.repository.partition_scan_chunk_size = 1
+        self.repository.partition_scan_queue_size = 1
+        items = self.repository.iter_items()
+
+        next(items)
+        items.close()
+
+        self.assertFalse(
+            [
+                thread
+                for thread in threading.enumerate()
+                if thread.name.startswith("partition-scan")
+            ]
+        )
+
+
+class TestCsvRepositoryAppend(BaseTestCase):
+    """Tests for appending to CSV repositories."""
+
+    def setUp(self):
+        """Set up a copy of the test data."""
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        os.makedirs(os.path.join(media_root, "csv"))
+        for extension in ("", ".gz"):
+            shutil.copy(
+                os.path.join(MEDIA_ROOT, "csv/vote_results_md.csv" + extension),
+                os.path.join(media_root, "csv"),
+            )
+        settings = override_settings(MEDIA_ROOT=media_root)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.addCleanup(CsvReadRepository.datasets.clear)
+        self.items = [
+            VoteResult(id=1, legislator_id=412393, vote_id=3314452, vote_type=VoteType.YES),
+            VoteResult(id=2, legislator_id=400440, vote_id=3314452, vote_type=VoteType.NO),
+        ]
+
+    def test_append_many(self):
+        """Test appended items are read back after the existing ones."""
+        repository = VoteResultCsvRepository("csv/vote_results_md.csv")
+        version = repository.get_version()
+
+        self.assertEqual(repository.append_many(self.items), 2)
+
+        items = repository.get_all()
+        self.assertEqual(len(items), 12)
+        self.assertEqual(items[-2:], self.items)
+        self.assertNotEqual(repository.get_version(), version)
+
+    def test_append_compressed(self):
+        """Test items are appended to compressed files as a new stream."""
+        repository = VoteResultCsvRepository("csv/vote_results_md.csv.gz")
+        repository.append(self.items[0])
+
+        items = repository.get_all()
+        self.assertEqual(len(items), 11)
+        self.assertEqual(items[-1], self.items[0])
+
+    def test_carry_over(self):
+        """Test loaded datasets and indexes are carried over, not reloaded."""
+        repository = VoteResultCsvRepository("csv/vote_results_md.csv")
+        with override_settings(DATASET_LOAD_ON_DEMAND=True):
+            repository.get_all()
+            old_dataset = repository.get_dataset()
+            old_index = repository.get_index("vote_id")
+            old_bucket = list(old_index[3314452])
+
+            with mock.patch.object(
+                VoteResultCsvRepository, "_build_dataset"
+            ) as build_dataset:
+                repository.append_many(self.items)
+                dataset = repository.get_dataset()
+                index = repository.get_index("vote_id")
+
+        build_dataset.assert_not_called()
+        self.assertEqual(dataset.version, repository.get_version())
+        self.assertEqual(len(dataset.items), 12)
+        self.assertEqual(dataset.index[2], self.items[1])
+        self.assertIn(1, index[3314452])
+        self.assertIn(2, index[3314452])
+        self.assertEqual(len(old_dataset.items), 10)
+        self.assertNotIn(1, old_dataset.index)
+        self.assertEqual(old_index[3314452], old_bucket)
+
+    def test_append_partitioned(self):
+        """Test partitioned datasets can't be appended to."""
+        repository = VoteResultCsvRepository("csv/vote_results_pt/manifest.json")
+        with override_settings(MEDIA_ROOT=MEDIA_ROOT):
+            with self.assertRaises(ValueError):
+                repository.append_many(self.items)
+
+
+class TestZoneMapCsvRepository(BaseTestCase):
+    """Tests for CSV repositories of files with zone maps."""
+
+    def setUp(self):
+        """Set up a copy of the test data with a zone map."""
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        os.makedirs(os.path.join(media_root, "csv"))
+        for extension in ("", ".gz"):
+            shutil.copy(
+                os.path.join(MEDIA_ROOT, "csv/vote_results_md.csv" + extension),
+                os.path.join(media_root, "csv"),
+            )
+        self.path = os.path.join(media_root, "csv/vote_results_md.csv")
+        write_zone_map(self.path, block_size=52)
+        settings = override_settings(MEDIA_ROOT=media_root)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.addCleanup(CsvReadRepository.zone_maps.clear)
+        self.repository = VoteResultCsvRepository("csv/vote_results_md.csv")
+        # Compressed files are scanned whole.
+        self.expected = VoteResultCsvRepository("csv/vote_results_md.csv.gz")
+
+    def get_rows_parsed(self):
+        """Get the number of rows parsed from the file."""
+        return REPOSITORY_ROWS_PARSED.get(dataset=self.repository.file_path)
+
+    def test_skip_blocks(self):
+        """Test blocks ruled out by a specification aren't parsed."""
+        spec = EqualsSpecification("legislator_id", 412421)
+        rows_parsed = self.get_rows_parsed()
+
+        items = self.repository.get_all(spec)
+
+        self.assertEqual(items, self.expected.get_all(spec))
+        self.assertEqual(len(items), 3)
+        self.assertEqual(self.get_rows_parsed() - rows_parsed, 4)
+
+    def test_get_many(self):
+        """Test primary key lookups skip blocks too."""
+        rows_parsed = self.get_rows_parsed()
+
+        items = self.repository.get_many([92279981, 92516711])
+
+        self.assertEqual([item.id for item in items], [92279981, 92516711])
+        # The ranges of ids of two blocks include the second one.
+        self.assertEqual(self.get_rows_parsed() - rows_parsed, 6)
+
+    def test_get_count_estimate(self):
+        """Test the rows of files with zone maps are counted exactly."""
+        self.assertEqual(self.repository.get_count_estimate(), 10)
+
+    def test_invalidate(self):
+        """Test zone maps are ignored once their file changes."""
+        self.assertIsNotNone(self.repository.get_zone_map())
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write("\n1,412421,1,1\n")
+
+        self.assertIsNone(self.repository.get_zone_map())
+        items = self.repository.get_all(EqualsSpecification("legislator_id", 412421))
+        self.assertEqual(len(items), 4)
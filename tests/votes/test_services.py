@@ -1,7 +1,21 @@
 """Tests for services."""
 
+import os
+import shutil
+import tempfile
+from unittest import mock
+
 from django.test import override_settings
 
+from watcher.core.metrics import REPOSITORY_ROWS_PARSED
+from watcher.core.specifications import (
+    AndSpecification,
+    EqualsSpecification,
+    InSpecification,
+)
+from watcher.core.repositories import CsvReadRepository
+from watcher.votes.enum import VoteType
+from watcher.votes.models import VoteResult
 from watcher.votes.repositories import (
     BillCsvRepository,
     LegislatorCsvRepository,
@@ -10,7 +24,11 @@ from watcher.votes.repositories import (
 )
 from watcher.votes.services import (
     BillVoteSummaryService,
+    DataQualityService,
+    LegislatorAgreementService,
     LegislatorVoteSummaryService,
+    VoteDetailService,
+    VoteResultIngestService,
 )
 
 from tests.common import BaseTestCase
@@ -60,6 +78,90 @@ class TestLegislatorVoteSummaryService(BaseTestCase):
         self.assertAttrEqual(item3, "supported_bills", 2)
         self.assertAttrEqual(item3, "opposed_bills", 0)
 
+    def test_iter_vote_summaries_counts_dangling_legislators(self):
+        """Test dangling legislators are counted once per vote result."""
+        service = LegislatorVoteSummaryService(
+            vote_repository=self.vote_summary_service.vote_repository,
+            vote_result_repository=self.vote_summary_service.vote_result_repository,
+            legislator_repository=LegislatorCsvRepository("csv/legislators_sm.csv"),
+        )
+        with self.assertLogs("watcher.votes.services", "DEBUG") as logs:
+            service.summarize_votes()
+
+        self.assertIn("legislator=10", logs.output[0])
+
+        # Summaries generated before generation stops are still counted.
+        with self.assertLogs("watcher.votes.services", "DEBUG") as logs:
+            vote_summaries = service.iter_vote_summaries()
+            next(vote_summaries)
+            vote_summaries.close()
+
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn("legislator=3", logs.output[0])
+
+    @override_settings(DATASET_LOAD_ON_DEMAND=True)
+    def test_summarize_votes_pushes_down_legislator_filters(self):
+        """Test legislator filters only read the legislator vote results."""
+        self.addCleanup(CsvReadRepository.datasets.clear)
+        vote_result_repository = self.vote_summary_service.vote_result_repository
+        spec = AndSpecification(
+            EqualsSpecification("legislator_id", 400440),
+            InSpecification("opposed_bills", [1, 2]),
+        )
+        with mock.patch.object(
+            vote_result_repository,
+            "get_many_by_values",
+            wraps=vote_result_repository.get_many_by_values,
+        ) as get_many_by_values:
+            object_list = self.vote_summary_service.summarize_votes(spec)
+
+        get_many_by_values.assert_called_once_with("legislator_id", frozenset([400440]))
+        vote_results = vote_result_repository.get_many_by_values(*get_many_by_values.call_args.args)
+        self.assertEqual(
+            [vote_result.id for vote_result in vote_results],
+            [92516711, 92516770, 92516784],
+        )
+        self.assertEqual(len(object_list), 1)
+        self.assertAttrEqual(object_list[0], "supported_bills", 1)
+        self.assertAttrEqual(object_list[0], "opposed_bills", 2)
+
+    def test_summarize_votes_pushes_down_name_filters(self):
+        """Test legislator name filters are resolved through legislators."""
+        spec = EqualsSpecification("legislator_name", "Rep. Tom Reed (R-NY-23)")
+        object_list = self.vote_summary_service.summarize_votes(spec)
+
+        self.assertEqual(len(object_list), 1)
+        self.assertAttrEqual(object_list[0], "legislator_id", 412393)
+        self.assertAttrEqual(object_list[0], "opposed_bills", 3)
+
+    def test_summarize_votes_without_dataset(self):
+        """Test filters aren't pushed down to vote results not in memory."""
+        LegislatorVoteSummaryService.aggregate_cache.clear()
+        self.addCleanup(LegislatorVoteSummaryService.aggregate_cache.clear)
+        file_path = "csv/vote_results_md.csv"
+        spec = EqualsSpecification("legislator_id", 412421)
+
+        for rows_parsed in (10, 0):
+            rows = REPOSITORY_ROWS_PARSED.get(dataset=file_path)
+            object_list = self.vote_summary_service.summarize_votes(spec)
+
+            self.assertEqual(REPOSITORY_ROWS_PARSED.get(dataset=file_path) - rows, rows_parsed)
+            self.assertEqual(len(object_list), 1)
+            self.assertAttrEqual(object_list[0], "supported_bills", 2)
+
+    def test_summarize_votes_aggregate_filters(self):
+        """Test filters on aggregates are applied to the summaries."""
+        vote_result_repository = self.vote_summary_service.vote_result_repository
+        spec = EqualsSpecification("supported_bills", 0)
+        with mock.patch.object(
+            vote_result_repository, "get_many_by_values"
+        ) as get_many_by_values:
+            object_list = self.vote_summary_service.summarize_votes(spec)
+
+        get_many_by_values.assert_not_called()
+        self.assertEqual(len(object_list), 1)
+        self.assertAttrEqual(object_list[0], "legislator_id", 412393)
+
 
 @override_settings(MEDIA_ROOT=MEDIA_ROOT)
 class TestBillVoteSummaryService(BaseTestCase):
@@ -114,3 +216,357 @@ class TestBillVoteSummaryService(BaseTestCase):
         self.assertAttrEqual(item3, "sponsor_name", "Rep. Jeff Van Drew (R-NJ-2)")
         self.assertAttrEqual(item3, "supporters", 0)
         self.assertAttrEqual(item3, "opposers", 2)
+
+    @override_settings(DATASET_LOAD_ON_DEMAND=True)
+    def test_summarize_votes_pushes_down_bill_filters(self):
+        """Test bill filters only read the bill vote results."""
+        self.addCleanup(CsvReadRepository.datasets.clear)
+        vote_result_repository = self.vote_summary_service.vote_result_repository
+        spec = EqualsSpecification("bill_id", 3568720)
+        with mock.patch.object(
+            vote_result_repository,
+            "get_many_by_values",
+            wraps=vote_result_repository.get_many_by_values,
+        ) as get_many_by_values:
+            object_list = self.vote_summary_service.summarize_votes(spec)
+
+        get_many_by_values.assert_called_once()
+        vote_results = vote_result_repository.get_many_by_values(*get_many_by_values.call_args.args)
+        self.assertEqual(
+            [vote_result.id for vote_result in vote_results],
+            [92516784, 92516753],
+        )
+        self.assertEqual(len(object_list), 1)
+        self.assertAttrEqual(object_list[0], "sponsor_name", "Rep. Jeff Van Drew (R-NJ-2)")
+        self.assertAttrEqual(object_list[0], "supporters", 0)
+        self.assertAttrEqual(object_list[0], "opposers", 2)
+
+    @override_settings(DATASET_LOAD_ON_DEMAND=True)
+    def test_summarize_votes_pushes_down_duplicate_keys(self):
+        """Test vote results sharing a primary key are all selected."""
+        self.addCleanup(CsvReadRepository.datasets.clear)
+        spec = EqualsSpecification("bill_id", 2952375)
+        object_list = self.vote_summary_service.summarize_votes(spec)
+
+        self.assertEqual(len(object_list), 1)
+        self.assertAttrEqual(object_list[0], "supporters", 2)
+        self.assertAttrEqual(object_list[0], "opposers", 1)
+
+    def test_summarize_votes_pushes_down_sponsor_filters(self):
+        """Test sponsor filters are resolved through bills and legislators."""
+        spec = EqualsSpecification("sponsor_name", "Rep. Jeff Van Drew (R-NJ-2)")
+        object_list = self.vote_summary_service.summarize_votes(spec)
+
+        self.assertEqual(len(object_list), 1)
+        self.assertAttrEqual(object_list[0], "bill_id", 3568720)
+
+    def test_summarize_votes_keeps_dangling_sponsors(self):
+        """Test filters matching dangling sponsors aren't pushed down."""
+        spec = EqualsSpecification("sponsor_name", "N/A")
+        object_list = self.vote_summary_service.summarize_votes(spec)
+
+        self.assertEqual(len(object_list), 1)
+        self.assertAttrEqual(object_list[0], "bill_id", 2900994)
+
+    def test_summarize_votes_logs_dangling_references_once(self):
+        """Test dangling references are logged once per run."""
+        with self.assertLogs("watcher.votes.services", "DEBUG") as logs:
+            self.vote_summary_service.summarize_votes()
+
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn("sponsor=5", logs.output[0])
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class TestDataQualityService(BaseTestCase):
+    """Tests for data quality service."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.service = DataQualityService(
+            vote_result_repository=VoteResultCsvRepository(
+                "csv/vote_results_md.csv"
+            ),
+            vote_repository=VoteCsvRepository("csv/votes_md.csv"),
+            bill_repository=BillCsvRepository("csv/bills_md.csv"),
+            legislator_repository=LegislatorCsvRepository(
+                "csv/legislators_md.csv"
+            ),
+        )
+        DataQualityService.report_cache.clear()
+
+    def test_get_report(self):
+        """Test get report."""
+        report = self.service.get_report()
+
+        self.assertIsNotNone(report.version)
+        dangling_references = {
+            item.kind: item for item in report.dangling_references
+        }
+        self.assertAttrEqual(dangling_references["vote"], "rows", 0)
+        self.assertAttrEqual(dangling_references["legislator"], "rows", 0)
+        self.assertAttrEqual(dangling_references["bill"], "rows", 0)
+        self.assertAttrEqual(dangling_references["sponsor"], "rows", 1)
+        self.assertAttrEqual(
+            dangling_references["sponsor"], "missing_ids", {400100: 1}
+        )
+
+    def test_get_report_cached(self):
+        """Test report is cached per dataset version."""
+        report = self.service.get_report()
+
+        self.assertIs(self.service.get_report(), report)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class TestLegislatorAgreementService(BaseTestCase):
+    """Tests for legislator agreement service."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.service = LegislatorAgreementService(
+            vote_result_repository=VoteResultCsvRepository(
+                "csv/vote_results_md.csv"
+            ),
+            legislator_repository=LegislatorCsvRepository(
+                "csv/legislators_md.csv"
+            ),
+        )
+        LegislatorAgreementService.matrix_cache.clear()
+
+    def test_get_agreements(self):
+        """Test get agreements."""
+        object_list = self.service.get_agreements(k=1)
+
+        self.assertEqual(len(object_list), 6)
+        pairs = {
+            (item.legislator_id, item.alignment): item for item in object_list
+        }
+        most_aligned = pairs[(400440, "most")]
+        self.assertAttrEqual(most_aligned, "other_legislator_id", 412393)
+        self.assertAttrEqual(
+            most_aligned, "other_legislator_name", "Rep. Tom Reed (R-NY-23)"
+        )
+        self.assertAttrEqual(most_aligned, "shared_votes", 3)
+        self.assertAttrEqual(most_aligned, "agreements", 2)
+        self.assertAlmostEqual(most_aligned.agreement_rate, 2 / 3)
+
+        least_aligned = pairs[(412393, "least")]
+        self.assertAttrEqual(least_aligned, "other_legislator_id", 412421)
+        self.assertAttrEqual(least_aligned, "shared_votes", 3)
+        self.assertAttrEqual(least_aligned, "agreements", 0)
+
+        self.assertAttrEqual(
+            pairs[(412421, "most")], "other_legislator_id", 400440
+        )
+
+    def test_get_agreements_min_votes(self):
+        """Test pairs sharing too few votes aren't ranked."""
+        object_list = self.service.get_agreements(k=5, min_votes=3)
+
+        self.assertEqual(
+            {
+                (item.legislator_id, item.other_legislator_id)
+                for item in object_list
+            },
+            {
+                (400440, 412393),
+                (412393, 400440),
+                (412393, 412421),
+                (412421, 412393),
+            },
+        )
+
+    def test_get_agreements_filtered(self):
+        """Test pairs filtered out don't take up the top k."""
+        spec = EqualsSpecification("other_legislator_id", 412421)
+        object_list = self.service.get_agreements(k=1, spec=spec)
+
+        self.assertEqual(
+            {
+                (item.legislator_id, item.other_legislator_id, item.alignment)
+                for item in object_list
+            },
+            {
+                (400440, 412421, "most"),
+                (400440, 412421, "least"),
+                (412393, 412421, "most"),
+                (412393, 412421, "least"),
+            },
+        )
+
+    def test_get_matrix_cached(self):
+        """Test matrix is cached per dataset version."""
+        matrix = self.service.get_matrix()
+
+        self.assertIs(self.service.get_matrix(), matrix)
+        self.assertEqual(matrix.legislator_ids, [400440, 412393, 412421])
+        self.assertEqual(list(matrix.shared_votes[:3]), [3, 3, 2])
+        self.assertEqual(list(matrix.agreements[:3]), [3, 2, 1])
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class TestVoteDetailService(BaseTestCase):
+    """Tests for vote detail service."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.service = VoteDetailService(
+            vote_repository=VoteCsvRepository("csv/votes_md.csv"),
+            vote_result_repository=VoteResultCsvRepository(
+                "csv/vote_results_md.csv"
+            ),
+            bill_repository=BillCsvRepository("csv/bills_md.csv"),
+            legislator_repository=LegislatorCsvRepository(
+                "csv/legislators_md.csv"
+            ),
+        )
+
+    def test_get_bill_votes(self):
+        """Test get the vote results of a bill."""
+        object_list = self.service.get_bill_votes(3568720)
+
+        self.assertEqual(len(object_list), 2)
+        item = self.getItemFromList(object_list, "vote_result_id", 92516784)
+        self.assertAttrEqual(item, "vote_id", 3354186)
+        self.assertAttrEqual(item, "legislator_id", 400440)
+        self.assertAttrEqual(item, "legislator_name", "Rep. Don Young (R-AK-1)")
+        self.assertAttrEqual(item, "vote_type", 2)
+        self.assertEqual(self.service.get_bill_votes(3022924), [])
+
+    def test_get_legislator_votes(self):
+        """Test get the vote results of a legislator."""
+        object_list = self.service.get_legislator_votes(400440)
+
+        self.assertEqual(
+            [(item.vote_result_id, item.bill_id) for item in object_list],
+            [
+                (92516711, 2952375),
+                (92516770, 2900994),
+                (92516784, 3568720),
+            ],
+        )
+        self.assertAttrEqual(
+            object_list[0], "bill_title", "H.R. 5376: Build Back Better Act"
+        )
+        self.assertAttrEqual(object_list[0], "vote_type", 1)
+
+
+class TestVoteResultIngestService(BaseTestCase):
+    """Tests for vote result ingest service."""
+
+    def setUp(self):
+        """Set up a copy of the test data."""
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        shutil.copytree(
+            os.path.join(MEDIA_ROOT, "csv"),
+            os.path.join(media_root, "csv"),
+            ignore=shutil.ignore_patterns("*_pt", "*.gz", "*.bz2", "*.xz"),
+        )
+        settings = override_settings(MEDIA_ROOT=media_root)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.addCleanup(CsvReadRepository.datasets.clear)
+        self.addCleanup(LegislatorVoteSummaryService.aggregate_cache.clear)
+        self.addCleanup(BillVoteSummaryService.aggregate_cache.clear)
+        self.addCleanup(VoteResultIngestService.feed.clear)
+
+        self.vote_result_repository = VoteResultCsvRepository(
+            "csv/vote_results_md.csv"
+        )
+        self.legislator_service, self.bill_service = self.get_services()
+        self.service = VoteResultIngestService(
+            vote_result_repository=self.vote_result_repository,
+            summary_services=[self.legislator_service, self.bill_service],
+            batch_size=2,
+        )
+        self.items = [
+            VoteResult(id=1, legislator_id=412393, vote_id=3314452, vote_type=VoteType.YES),
+            VoteResult(id=2, legislator_id=400440, vote_id=3314452, vote_type=VoteType.NO),
+            VoteResult(id=3, legislator_id=412393, vote_id=3321166, vote_type=VoteType.NO),
+            VoteResult(id=4, legislator_id=412393, vote_id=1, vote_type=VoteType.NO),
+        ]
+
+    def get_services(self):
+        """Get vote summary services of the test data."""
+        vote_repository = VoteCsvRepository("csv/votes_md.csv")
+        legislator_repository = LegislatorCsvRepository("csv/legislators_md.csv")
+        return (
+            LegislatorVoteSummaryService(
+                vote_repository=vote_repository,
+                vote_result_repository=self.vote_result_repository,
+                legislator_repository=legislator_repository,
+            ),
+            BillVoteSummaryService(
+                vote_repository=vote_repository,
+                vote_result_repository=self.vote_result_repository,
+                bill_repository=BillCsvRepository("csv/bills_md.csv"),
+                legislator_repository=legislator_repository,
+            ),
+        )
+
+    def test_ingest(self):
+        """Test vote results are appended in batches."""
+        self.assertEqual(self.service.ingest(iter(self.items)), 4)
+        self.assertEqual(len(self.vote_result_repository.get_all()), 14)
+
+    def test_ingest_carries_over_aggregates(self):
+        """Test summaries of ingested vote results match a full rebuild."""
+        self.legislator_service.summarize_votes()
+        self.bill_service.summarize_votes()
+
+        with mock.patch.object(
+            VoteResultCsvRepository, "_iter_items"
+        ) as iter_items:
+            self.service.ingest(self.items)
+        iter_items.assert_not_called()
+
+        for service in (self.legislator_service, self.bill_service):
+            version = (service.get_version(),)
+            self.assertIsNotNone(service.aggregate_cache.get(version))
+        self.assertEqual(self.bill_service.get_aggregate().dangling_votes, 1)
+        legislator_summaries = self.legislator_service.summarize_votes()
+        bill_summaries = self.bill_service.summarize_votes()
+
+        LegislatorVoteSummaryService.aggregate_cache.clear()
+        BillVoteSummaryService.aggregate_cache.clear()
+        self.assertEqual(
+            legislator_summaries, self.legislator_service.summarize_votes()
+        )
+        self.assertEqual(bill_summaries, self.bill_service.summarize_votes())
+
+    def test_ingest_builds_aggregates(self):
+        """Test aggregates not cached are built before ingesting."""
+        cursor = VoteResultIngestService.feed.sequence
+
+        self.service.ingest(self.items[:2])
+
+        self.assertEqual(
+            len(self.service.feed.read(cursor, timeout=0)), 2
+        )
+        for service in (self.legislator_service, self.bill_service):
+            version = (service.get_version(),)
+            self.assertIsNotNone(service.aggregate_cache.get(version))
+
+    def test_ingest_publishes_changes(self):
+        """Test only the summaries changed by each batch are published."""
+        self.legislator_service.summarize_votes()
+        self.bill_service.summarize_votes()
+        cursor = VoteResultIngestService.feed.sequence
+
+        self.service.ingest(self.items[:2])
+        deltas = [delta for _, delta in self.service.feed.read(cursor)]
+
+        self.assertEqual(
+            [delta.event for delta in deltas],
+            ["legislators_votes", "bills_votes"],
+        )
+        self.assertCountEqual(
+            deltas[0].summaries,
+            self.legislator_service.summarize_votes(
+                InSpecification("legislator_id", [400440, 412393])
+            ),
+        )
+        self.assertEqual(len(deltas[1].summaries), 1)
+        self.assertEqual(deltas[1].version, self.bill_service.get_version())
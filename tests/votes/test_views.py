@@ -1,10 +1,25 @@
 """Tests for views."""
 
+import io
+import json
+import os
+import shutil
+import tempfile
+import zipfile
 from unittest import mock
 
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.test import override_settings
 from django.urls import reverse
 from django.template.response import TemplateResponse
-from watcher.core.repositories import ReadRepository
+from watcher.core.repositories import (
+    CsvReadRepository,
+    IterableReadRepository,
+    ReadRepository,
+)
+from watcher.core.specifications import EqualsSpecification
+from watcher.core.views import QueryCacheMixin
 from watcher.votes.enum import VoteType
 
 from watcher.votes.models import (
@@ -18,18 +33,24 @@ from watcher.votes.models import (
 from watcher.votes.services import (
     BillVoteSummaryService,
     LegislatorVoteSummaryService,
+    VoteResultIngestService,
 )
+from watcher.votes.repositories import VoteResultCsvRepository
 from watcher.votes.views import (
     BillListView,
+    BillVoteSummaryListApiView,
     BillVoteSummaryListView,
     LegislatorListView,
     LegislatorVoteSummaryListView,
+    VoteResultListApiView,
     VoteListView,
     VoteResultListView,
 )
 
 from tests.common import BaseTestCase
 
+INGEST_TOKEN = "test-token"
+
 
 class TestLegislatorListView(BaseTestCase):
     """Tests for legislator list view."""
@@ -335,3 +356,745 @@ class TestBillVoteSummaryListView(BaseTestCase):
         self.assertAttrEqual(item2, "sponsor_name", "N/A")
         self.assertAttrEqual(item2, "supporters", 2)
         self.assertAttrEqual(item2, "opposers", 3)
+
+
+@override_settings(
+    MEDIA_ROOT="tests/samples/media",
+    MEDIA_FILES={
+        "bills": "csv/bills_md.csv",
+        "legislators": "csv/legislators_md.csv",
+        "votes": "csv/votes_md.csv",
+        "vote_results": "csv/vote_results_md.csv",
+    },
+)
+class TestDataQualityReportView(BaseTestCase):
+    """Tests for data quality report view."""
+
+    view_name = "votes:data-quality-report"
+
+    def test_get_report(self):
+        """Test get report."""
+        response = self.client.get(reverse(self.view_name))
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertIn("version", data)
+        dangling_references = {
+            item["kind"]: item for item in data["dangling_references"]
+        }
+        self.assertEqual(dangling_references["sponsor"]["rows"], 1)
+        self.assertEqual(
+            dangling_references["sponsor"]["missing_ids"], {"400100": 1}
+        )
+
+
+class TestVoteResultListApiView(BaseTestCase):
+    """Tests for vote result list API view."""
+
+    view_name = "votes:api-vote-result-list"
+
+    def repository(self, mock_repository: mock.MagicMock):
+        """Patch repository object."""
+        return mock.patch.object(
+            VoteResultListApiView,
+            "get_repository",
+            return_value=mock_repository,
+        )
+
+    def test_list_vote_results(self):
+        """Test list vote results."""
+        mock_repository_class = mock.MagicMock(spec=ReadRepository[VoteResult])
+        mock_repository = mock_repository_class.return_value
+        mock_repository.get_all.return_value = [
+            VoteResult(
+                id=92516553 + i,
+                legislator_id=1269790,
+                vote_id=3321166,
+                vote_type=VoteType(1),
+            )
+            for i in range(5)
+        ]
+
+        with self.repository(mock_repository):
+            response = self.client.get(
+                reverse(self.view_name), {"page": 2, "page_size": 2}
+            )
+
+        self.assertEqual(response["Content-Type"], "application/json")
+        data = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(data["count"], 5)
+        self.assertEqual(data["num_pages"], 3)
+        self.assertEqual(data["page"], 2)
+        self.assertEqual(
+            data["results"],
+            [
+                {
+                    "id": 92516555,
+                    "legislator_id": 1269790,
+                    "vote_id": 3321166,
+                    "vote_type": 1,
+                },
+                {
+                    "id": 92516556,
+                    "legislator_id": 1269790,
+                    "vote_id": 3321166,
+                    "vote_type": 1,
+                },
+            ],
+        )
+
+
+class TestBillVoteSummaryListApiView(BaseTestCase):
+    """Tests for bill vote summary list API view."""
+
+    view_name = "votes:api-bill-vote-summary-list"
+
+    def service(self, mock_service: mock.MagicMock):
+        """Patch service object."""
+        return mock.patch.object(
+            BillVoteSummaryListApiView,
+            "get_service",
+            return_value=mock_service,
+        )
+
+    def test_list_vote_summaries(self):
+        """Test list vote summaries."""
+        mock_service_class = mock.MagicMock(spec=BillVoteSummaryService)
+        mock_service = mock_service_class.return_value
+        mock_service.summarize_votes.return_value = [
+            BillVoteSummary(
+                bill_id=2900994,
+                bill_title="H.R. 3684: Infrastructure Investment and Jobs Act",
+                sponsor_id=None,
+                sponsor_name="N/A",
+                supporters=2,
+                opposers=3,
+            ),
+        ]
+
+        with self.service(mock_service):
+            response = self.client.get(
+                reverse(self.view_name), {"sponsor_name__contains": "N/A"}
+            )
+
+        mock_service.summarize_votes.assert_called_once()
+        data = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(data["count"], 1)
+        self.assertEqual(
+            data["results"],
+            [
+                {
+                    "bill_id": 2900994,
+                    "bill_title": "H.R. 3684: Infrastructure Investment and Jobs Act",
+                    "sponsor_id": None,
+                    "sponsor_name": "N/A",
+                    "supporters": 2,
+                    "opposers": 3,
+                }
+            ],
+        )
+
+
+class TestVoteResultListExport(BaseTestCase):
+    """Tests for vote result list export."""
+
+    view_name = "votes:vote-result-list"
+
+    def repository(self, mock_repository: mock.MagicMock):
+        """Patch repository object."""
+        return mock.patch.object(
+            VoteResultListView, "get_repository", return_value=mock_repository
+        )
+
+    def mock_repository(self):
+        """Mock iterable repository."""
+        mock_repository_class = mock.MagicMock(
+            spec=IterableReadRepository[VoteResult]
+        )
+        mock_repository = mock_repository_class.return_value
+        mock_repository.iter_items.return_value = iter(
+            [
+                VoteResult(
+                    id=92516553,
+                    legislator_id=1269790,
+                    vote_id=3321166,
+                    vote_type=VoteType(1),
+                ),
+                VoteResult(
+                    id=92516784,
+                    legislator_id=400440,
+                    vote_id=3321166,
+                    vote_type=VoteType(2),
+                ),
+            ]
+        )
+        return mock_repository
+
+    def test_export_csv(self):
+        """Test export CSV."""
+        mock_repository = self.mock_repository()
+
+        with self.repository(mock_repository):
+            response = self.client.get(
+                reverse(self.view_name), {"export": "csv", "vote_type": 1}
+            )
+            content = b"".join(response.streaming_content).decode()
+
+        mock_repository.iter_items.assert_called_once()
+        mock_repository.get_all.assert_not_called()
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertEqual(
+            response["Content-Disposition"],
+            'attachment; filename="vote-result-list.csv"',
+        )
+        self.assertEqual(
+            content,
+            "id,legislator_id,vote_id,vote_type\r\n"
+            "92516553,1269790,3321166,1\r\n"
+            "92516784,400440,3321166,2\r\n",
+        )
+
+    def test_export_ndjson(self):
+        """Test export NDJSON."""
+        mock_repository = self.mock_repository()
+
+        with self.repository(mock_repository):
+            response = self.client.get(
+                reverse(self.view_name), {"export": "ndjson"}
+            )
+            lines = b"".join(response.streaming_content).splitlines()
+
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertEqual(
+            [json.loads(line)["id"] for line in lines], [92516553, 92516784]
+        )
+
+    def test_export_unsupported_format(self):
+        """Test export with an unsupported format."""
+        response = self.client.get(reverse(self.view_name), {"export": "xml"})
+
+        self.assertEqual(response.status_code, 400)
+
+
+class TestLegislatorVoteSummaryListExport(BaseTestCase):
+    """Tests for legislator vote summary list export."""
+
+    view_name = "votes:legislator-vote-summary-list"
+
+    def test_export_csv(self):
+        """Test export CSV."""
+        mock_service_class = mock.MagicMock(spec=LegislatorVoteSummaryService)
+        mock_service = mock_service_class.return_value
+        mock_service.iter_vote_summaries.return_value = iter(
+            [
+                LegislatorVoteSummary(
+                    legislator_id=400440,
+                    legislator_name="Rep. Don Young (R-AK-1)",
+                    supported_bills=1,
+                    opposed_bills=2,
+                ),
+            ]
+        )
+
+        with mock.patch.object(
+            LegislatorVoteSummaryListView,
+            "get_service",
+            return_value=mock_service,
+        ):
+            response = self.client.get(
+                reverse(self.view_name), {"export": "csv"}
+            )
+            content = b"".join(response.streaming_content).decode()
+
+        mock_service.iter_vote_summaries.assert_called_once()
+        mock_service.summarize_votes.assert_not_called()
+        self.assertEqual(
+            content,
+            "legislator_id,legislator_name,supported_bills,opposed_bills\r\n"
+            "400440,Rep. Don Young (R-AK-1),1,2\r\n",
+        )
+
+
+@override_settings(MEDIA_ROOT="tests/samples/media")
+class TestLegislatorAgreementListApiView(BaseTestCase):
+    """Tests for legislator agreement list API view."""
+
+    view_name = "votes:api-legislator-agreement-list"
+
+    def setUp(self):
+        """Set up test data."""
+        QueryCacheMixin.query_cache.clear()
+
+    def test_list_agreements(self):
+        """Test list agreements of a legislator."""
+        media_files = {
+            "vote_results": "csv/vote_results_md.csv",
+            "legislators": "csv/legislators_md.csv",
+        }
+        with override_settings(MEDIA_FILES=media_files):
+            response = self.client.get(
+                reverse(self.view_name),
+                {"legislator_id": 412421, "alignment": "most", "k": 2},
+            )
+
+        self.assertEqual(response.status_code, 200)
+        content = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(content["count"], 2)
+        self.assertEqual(
+            [
+                (item["other_legislator_id"], item["agreements"])
+                for item in content["results"]
+            ],
+            [(400440, 1), (412393, 0)],
+        )
+
+
+@override_settings(
+    MEDIA_ROOT="tests/samples/media",
+    MEDIA_FILES={
+        "bills": "csv/bills_md.csv",
+        "votes": "csv/votes_md.csv",
+        "vote_results": "csv/vote_results_md.csv",
+        "legislators": "csv/legislators_md.csv",
+    },
+)
+class TestVoteDetailListView(BaseTestCase):
+    """Tests for vote detail list views."""
+
+    def test_list_bill_votes(self):
+        """Test list the vote results of a bill."""
+        response = self.client.get(
+            reverse("votes:bill-vote-detail-list", args=[3568720])
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.context["bill"].title,
+            "H.R. 7623: Telehealth Modernization Act of 2024",
+        )
+        self.assertEqual(
+            [item.legislator_id for item in response.context["object_list"]],
+            [400440, 412393],
+        )
+
+    def test_list_legislator_votes_api(self):
+        """Test list the vote results of a legislator as JSON."""
+        response = self.client.get(
+            reverse("votes:api-legislator-vote-detail-list", args=[412421])
+        )
+
+        self.assertEqual(response.status_code, 200)
+        content = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(content["count"], 3)
+        self.assertEqual(
+            content["results"][0],
+            {
+                "vote_result_id": 92279981,
+                "vote_id": 3314452,
+                "bill_id": 2900994,
+                "bill_title": "H.R. 3684: Infrastructure Investment and Jobs Act",
+                "vote_type": 1,
+            },
+        )
+
+
+class TestQueryCache(BaseTestCase):
+    """Tests for query cache."""
+
+    def setUp(self):
+        """Set up test data."""
+        QueryCacheMixin.query_cache.clear()
+
+    def test_paginate_repository_list(self):
+        """Test paging through a filtered list evaluates it once."""
+        items = [
+            VoteResult(
+                id=92516553 + i,
+                legislator_id=1269790,
+                vote_id=3321166,
+                vote_type=VoteType(1),
+            )
+            for i in range(5)
+        ]
+        item_dict = {item.id: item for item in items}
+        mock_repository_class = mock.MagicMock(spec=ReadRepository[VoteResult])
+        mock_repository = mock_repository_class.return_value
+        mock_repository.get_version.return_value = "1"
+        mock_repository.get_pk.side_effect = lambda item: item.id
+        mock_repository.get_all.return_value = items
+        mock_repository.get_many.side_effect = lambda pks: [
+            item_dict[pk] for pk in pks
+        ]
+
+        with mock.patch.object(
+            VoteResultListApiView,
+            "get_repository",
+            return_value=mock_repository,
+        ):
+            pages = [
+                json.loads(
+                    b"".join(
+                        self.client.get(
+                            reverse("votes:api-vote-result-list"),
+                            {"vote_type": 1, "page": page, "page_size": 2},
+                        ).streaming_content
+                    )
+                )
+                for page in (1, 2, 3)
+            ]
+
+        mock_repository.get_all.assert_called_once()
+        self.assertEqual(
+            [[item["id"] for item in page["results"]] for page in pages],
+            [[92516553, 92516554], [92516555, 92516556], [92516557]],
+        )
+        self.assertEqual(pages[2]["count"], 5)
+        self.assertEqual(
+            list(mock_repository.get_many.call_args.args[0]), [92516557]
+        )
+
+    def test_repeat_summary_search(self):
+        """Test repeating a summary search summarizes votes once."""
+        mock_service_class = mock.MagicMock(spec=BillVoteSummaryService)
+        mock_service = mock_service_class.return_value
+        mock_service.get_version.return_value = "1:1:1:1"
+        mock_service.summarize_votes.return_value = [
+            BillVoteSummary(
+                bill_id=2952375,
+                bill_title="H.R. 5376: Build Back Better Act",
+                sponsor_id=412211,
+                sponsor_name="Rep. John Yarmuth (D-KY-3)",
+                supporters=2,
+                opposers=1,
+            ),
+        ]
+
+        with mock.patch.object(
+            BillVoteSummaryListView, "get_service", return_value=mock_service
+        ):
+            for _ in range(2):
+                response = self.client.get(
+                    reverse("votes:bill-vote-summary-list"),
+                    {"search": "Act"},
+                )
+
+            mock_service.get_version.return_value = "2:1:1:1"
+            self.client.get(
+                reverse("votes:bill-vote-summary-list"), {"search": "Act"}
+            )
+
+        self.assertEqual(mock_service.summarize_votes.call_count, 2)
+        self.assertEqual(len(response.context["object_list"]), 1)
+
+    def get_mock_repository(self):
+        """Get a mock vote result repository."""
+        items = [
+            VoteResult(
+                id=92516553 + i,
+                legislator_id=1269790,
+                vote_id=3321166,
+                vote_type=VoteType(1),
+            )
+            for i in range(5)
+        ]
+        mock_repository_class = mock.MagicMock(spec=ReadRepository[VoteResult])
+        mock_repository = mock_repository_class.return_value
+        mock_repository.get_version.return_value = "1"
+        mock_repository.get_pk.side_effect = lambda item: item.id
+        mock_repository.get_all.return_value = items
+        return mock_repository
+
+    def get_pages(self, params, pages=(1, 2)):
+        """Get pages of the vote result list."""
+        return [
+            json.loads(
+                b"".join(
+                    self.client.get(
+                        reverse("votes:api-vote-result-list"),
+                        {**params, "page": page, "page_size": 2},
+                    ).streaming_content
+                )
+            )
+            for page in pages
+        ]
+
+    def test_unfiltered_list_not_cached(self):
+        """Test unfiltered lists are read again rather than cached."""
+        mock_repository = self.get_mock_repository()
+
+        with mock.patch.object(
+            VoteResultListApiView,
+            "get_repository",
+            return_value=mock_repository,
+        ):
+            pages = self.get_pages({})
+
+        self.assertEqual(mock_repository.get_all.call_count, 2)
+        mock_repository.get_all.assert_called_with(None)
+        mock_repository.get_many.assert_not_called()
+        self.assertEqual(pages[1]["count"], 5)
+        self.assertEqual(len(QueryCacheMixin.query_cache), 0)
+
+    def test_oversized_list_not_cached(self):
+        """Test lists taking more bytes than the cache keeps aren't cached."""
+        mock_repository = self.get_mock_repository()
+
+        with mock.patch.object(
+            VoteResultListApiView,
+            "get_repository",
+            return_value=mock_repository,
+        ), mock.patch.object(
+            VoteResultListApiView, "query_cache_max_bytes", 4 * 8
+        ):
+            pages = self.get_pages({"vote_type": 1})
+
+        self.assertEqual(mock_repository.get_all.call_count, 2)
+        mock_repository.get_many.assert_not_called()
+        self.assertEqual(pages[1]["count"], 5)
+        self.assertEqual(len(QueryCacheMixin.query_cache), 0)
+
+    def test_paginate_large_file_list(self):
+        """Test later pages of a large list read from a file are cached."""
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        os.makedirs(os.path.join(media_root, "csv"))
+        with open(
+            os.path.join(media_root, "csv/vote_results.csv"), "w"
+        ) as file:
+            file.write("id,legislator_id,vote_id,vote_type\n")
+            for i in range(1, 30_001):
+                file.write(f"{i},412393,3314452,{i % 2 + 1}\n")
+
+        with override_settings(
+            MEDIA_ROOT=media_root,
+            MEDIA_FILES={"vote_results": "csv/vote_results.csv"},
+        ), mock.patch.object(
+            EqualsSpecification,
+            "is_satisfied_by",
+            autospec=True,
+            side_effect=EqualsSpecification.is_satisfied_by,
+        ) as is_satisfied_by:
+            first_page, = self.get_pages({"vote_type": 1}, pages=(1,))
+            evaluations = is_satisfied_by.call_count
+            last_page, = self.get_pages({"vote_type": 1}, pages=(7500,))
+
+        self.assertEqual(evaluations, 30_000)
+        self.assertEqual(is_satisfied_by.call_count, evaluations)
+        self.assertEqual(first_page["count"], 15_000)
+        self.assertEqual(
+            [item["id"] for item in last_page["results"]], [29998, 30000]
+        )
+
+
+@override_settings(
+    MEDIA_ROOT="tests/samples/media",
+    MEDIA_FILES={
+        "bills": "csv/bills_md.csv",
+        "legislators": "csv/legislators_md.csv",
+        "votes": "csv/votes_md.csv",
+        "vote_results": "csv/vote_results_md.csv.gz",
+    },
+)
+class TestDownloadAllView(BaseTestCase):
+    """Tests for download all view."""
+
+    view_name = "votes:download-all"
+
+    def test_download_all(self):
+        """Test compressed files are stored without recompressing them."""
+        response = self.client.get(reverse(self.view_name))
+
+        self.assertEqual(response.status_code, 200)
+        content = b"".join(response.streaming_content)
+        with zipfile.ZipFile(io.BytesIO(content)) as zf:
+            compressed = zf.getinfo("vote_results_md.csv.gz")
+            plain = zf.getinfo("votes_md.csv")
+            data = zf.read("vote_results_md.csv.gz")
+
+        self.assertEqual(compressed.compress_type, zipfile.ZIP_STORED)
+        self.assertEqual(plain.compress_type, zipfile.ZIP_DEFLATED)
+        with open("tests/samples/media/csv/vote_results_md.csv.gz", "rb") as file:
+            self.assertEqual(data, file.read())
+
+    def test_download_all_partitions(self):
+        """Test partitioned datasets are downloaded with their partitions."""
+        media_files = {
+            **settings.MEDIA_FILES,
+            "vote_results": "csv/vote_results_pt/manifest.json",
+        }
+        with override_settings(MEDIA_FILES=media_files):
+            response = self.client.get(reverse(self.view_name))
+
+        content = b"".join(response.streaming_content)
+        with zipfile.ZipFile(io.BytesIO(content)) as zf:
+            names = zf.namelist()
+
+        self.assertIn("vote_results_pt/manifest.json", names)
+        self.assertIn("vote_results_pt/session_117.csv", names)
+        self.assertIn("vote_results_pt/session_118.csv.gz", names)
+
+
+class IngestTestCase(BaseTestCase):
+    """Base test case for ingesting vote results to a copy of test data."""
+
+    def setUp(self):
+        """Set up a copy of the test data."""
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        shutil.copytree(
+            "tests/samples/media/csv",
+            os.path.join(media_root, "csv"),
+            ignore=shutil.ignore_patterns("*_pt", "*.gz", "*.bz2", "*.xz"),
+        )
+        media_files = {
+            "bills": "csv/bills_md.csv",
+            "legislators": "csv/legislators_md.csv",
+            "votes": "csv/votes_md.csv",
+            "vote_results": "csv/vote_results_md.csv",
+        }
+        test_settings = override_settings(
+            MEDIA_ROOT=media_root,
+            MEDIA_FILES=media_files,
+            INGEST_ENABLED=True,
+            INGEST_TOKEN=INGEST_TOKEN,
+        )
+        test_settings.enable()
+        self.addCleanup(test_settings.disable)
+        self.addCleanup(CsvReadRepository.datasets.clear)
+        self.addCleanup(LegislatorVoteSummaryService.aggregate_cache.clear)
+        self.addCleanup(BillVoteSummaryService.aggregate_cache.clear)
+        self.addCleanup(VoteResultIngestService.feed.clear)
+        self.repository = VoteResultCsvRepository("csv/vote_results_md.csv")
+
+    def post(self, data, content_type, token=INGEST_TOKEN):
+        """Post vote results to ingest."""
+        return self.client.post(
+            reverse("votes:api-vote-result-ingest"),
+            data=data,
+            content_type=content_type,
+            headers={"authorization": f"Bearer {token}"},
+        )
+
+
+class TestVoteResultIngestApiView(IngestTestCase):
+    """Tests for vote result ingest API view."""
+
+    def test_ingest_csv(self):
+        """Test vote results are ingested from CSV."""
+        data = "id,legislator_id,vote_id,vote_type\n1,412393,3314452,1\n2,400440,3314452,2\n"
+        response = self.post(data, "text/csv")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["ingested"], 2)
+        self.assertEqual(response.json()["version"], self.repository.get_version())
+        self.assertEqual(len(self.repository.get_all()), 12)
+
+    def test_ingest_ndjson(self):
+        """Test vote results are ingested from newline-delimited JSON."""
+        data = '{"id": 1, "legislator_id": 412393, "vote_id": 3314452, "vote_type": 1}\n\n'
+        response = self.post(data, "application/x-ndjson")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["ingested"], 1)
+        self.assertEqual(self.repository.get_all()[-1].id, 1)
+
+    def test_ingest_invalid(self):
+        """Test invalid vote results are rejected."""
+        data = '{"id": 1, "legislator_id": 412393, "vote_id": 3314452}\n'
+        response = self.post(data, "application/x-ndjson")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["ingested"], 0)
+        self.assertEqual(len(self.repository.get_all()), 10)
+
+    def test_ingest_unsupported(self):
+        """Test unsupported content types and disabled ingest."""
+        self.assertEqual(self.post("{}", "application/json").status_code, 415)
+        with override_settings(INGEST_ENABLED=False):
+            self.assertEqual(self.post("", "text/csv").status_code, 403)
+
+    def test_ingest_unauthorized(self):
+        """Test requests without the ingest token are rejected."""
+        data = "id,legislator_id,vote_id,vote_type\n1,412393,3314452,1\n"
+        response = self.post(data, "text/csv", token="wrong-token")
+
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response["WWW-Authenticate"], "Bearer")
+        self.assertEqual(len(self.repository.get_all()), 10)
+        with override_settings(INGEST_TOKEN=None):
+            self.assertEqual(self.post(data, "text/csv").status_code, 403)
+
+
+@override_settings(LIVE_TALLY_KEEPALIVE=0.01)
+class TestVoteSummaryStreamView(IngestTestCase):
+    """Tests for vote summary stream view."""
+
+    view_name = "votes:api-vote-summary-stream"
+
+    async def stream(self, **kwargs):
+        """Open the stream, returning an iterator of its events."""
+        response = await self.async_client.get(reverse(self.view_name), **kwargs)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        events = aiter(response.streaming_content)
+        self.assertEqual(await anext(events), b"retry: 3000\n\n")
+        return events
+
+    async def next_event(self, events):
+        """Get the next event of a stream."""
+        return (await anext(events)).decode()
+
+    async def test_stream_changes(self):
+        """Test summaries changed by ingested vote results are streamed."""
+        events = await self.stream()
+        self.assertEqual(await self.next_event(events), ": keep-alive\n\n")
+
+        await sync_to_async(self.post)("id,legislator_id,vote_id,vote_type\n1,412393,3314452,1\n", "text/csv")
+
+        legislator_event = (await self.next_event(events)).splitlines()
+        bill_event = (await self.next_event(events)).splitlines()
+        self.assertEqual(legislator_event[1], "event: legislators_votes")
+        self.assertEqual(bill_event[1], "event: bills_votes")
+        data = json.loads(legislator_event[2].removeprefix("data: "))
+        self.assertEqual(len(data["results"]), 1)
+        self.assertEqual(data["results"][0]["legislator_id"], 412393)
+
+        # Clients resume after the last event they received.
+        cursor = bill_event[0].removeprefix("id: ")
+        events = await self.stream(headers={"last-event-id": cursor})
+        self.assertEqual(await self.next_event(events), ": keep-alive\n\n")
+
+    async def test_stream_without_aggregating(self):
+        """Test connections don't aggregate the vote results."""
+        with mock.patch.object(
+            LegislatorVoteSummaryService, "build_aggregate"
+        ) as build_legislator_aggregate, mock.patch.object(
+            BillVoteSummaryService, "build_aggregate"
+        ) as build_bill_aggregate:
+            events = await self.stream()
+            self.assertEqual(await self.next_event(events), ": keep-alive\n\n")
+
+        build_legislator_aggregate.assert_not_called()
+        build_bill_aggregate.assert_not_called()
+
+    async def test_stream_stale_cursor(self):
+        """Test clients with stale cursors are told to reset."""
+        events = await self.stream(data={"cursor": 10**9})
+        self.assertEqual(
+            (await self.next_event(events)).splitlines()[1:3],
+            ["event: reset", "data: {}"],
+        )
+
+    @override_settings(LIVE_TALLY_MAX_LIFETIME=0.05)
+    async def test_stream_lifetime(self):
+        """Test connections are closed after their lifetime."""
+        events = await self.stream()
+        chunks = [chunk async for chunk in events]
+
+        self.assertTrue(chunks)
+        self.assertEqual(set(chunks), {b": keep-alive\n\n"})
+
+    def test_stream_wsgi(self):
+        """Test streams aren't served under WSGI."""
+        response = self.client.get(reverse(self.view_name))
+
+        self.assertEqual(response.status_code, 501)
@@ -0,0 +1,12 @@
+"""ASGI config."""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+from watcher.core.warmup import start_warm_up
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "watcher.settings")
+
+application = get_asgi_application()
+start_warm_up()
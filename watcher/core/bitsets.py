@@ -0,0 +1,108 @@
+"""Bitsets."""
+
+from __future__ import annotations
+
+from typing import Iterable, Iterator
+
+
+class Bitset:
+    """Bitset.
+
+    Set of non-negative integers stored as a dense bitmap, one bit per
+    integer. Meant for IDs mapped to dense indexes, where it takes a small
+    fraction of the memory of a set and counts its members with a single
+    popcount.
+    """
+
+    __slots__ = ["_bytes"]
+
+    def __init__(self, values: Iterable[int] = ()) -> None:
+        """Initialize bitset."""
+        self._bytes = bytearray()
+        for value in values:
+            self.add(value)
+
+    @classmethod
+    def from_int(cls, bits: int) -> Bitset:
+        """Build bitset from the bits of an integer."""
+        bitset = cls()
+        bitset._bytes = bytearray(
+            bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+        )
+        return bitset
+
+    def to_int(self) -> int:
+        """Return the bits of the bitset as an integer."""
+        return int.from_bytes(self._bytes, "little")
+
+    def copy(self) -> Bitset:
+        """Return a copy of the bitset."""
+        bitset = Bitset()
+        bitset._bytes = bytearray(self._bytes)
+        return bitset
+
+    def add(self, value: int) -> None:
+        """Add an integer."""
+        index = value >> 3
+        data = self._bytes
+        if index >= len(data):
+            data.extend(bytes(index - len(data) + 1))
+        data[index] |= 1 << (value & 7)
+
+    def discard(self, value: int) -> None:
+        """Remove an integer, if present."""
+        index = value >> 3
+        if index < len(self._bytes):
+            self._bytes[index] &= ~(1 << (value & 7)) & 0xFF
+
+    def __contains__(self, value: object) -> bool:
+        """Check if an integer is present."""
+        if not isinstance(value, int) or value < 0:
+            return False
+        index = value >> 3
+        return (
+            index < len(self._bytes)
+            and self._bytes[index] >> (value & 7) & 1 == 1
+        )
+
+    def __len__(self) -> int:
+        """Return the number of integers."""
+        return self.to_int().bit_count()
+
+    def __bool__(self) -> bool:
+        """Check if there's any integer."""
+        return any(self._bytes)
+
+    def __iter__(self) -> Iterator[int]:
+        """Iterate integers in ascending order."""
+        for index, byte in enumerate(self._bytes):
+            while byte:
+                low_bit = byte & -byte
+                yield index * 8 + low_bit.bit_length() - 1
+                byte ^= low_bit
+
+    def __eq__(self, other: object) -> bool:
+        """Check if two bitsets have the same integers."""
+        if not isinstance(other, Bitset):
+            return NotImplemented
+        return self.to_int() == other.to_int()
+
+    def __and__(self, other: Bitset) -> Bitset:
+        """Return the intersection of two bitsets."""
+        return Bitset.from_int(self.to_int() & other.to_int())
+
+    def __or__(self, other: Bitset) -> Bitset:
+        """Return the union of two bitsets."""
+        return Bitset.from_int(self.to_int() | other.to_int())
+
+    def __sub__(self, other: Bitset) -> Bitset:
+        """Return the difference of two bitsets."""
+        return Bitset.from_int(self.to_int() & ~other.to_int())
+
+    def __xor__(self, other: Bitset) -> Bitset:
+        """Return the symmetric difference of two bitsets."""
+        return Bitset.from_int(self.to_int() ^ other.to_int())
+
+    def __repr__(self) -> str:
+        """Return the representation of the bitset."""
+        return f"Bitset({list(self)!r})"
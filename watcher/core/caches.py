@@ -0,0 +1,122 @@
+"""Caches."""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Generic, Hashable, TypeVar
+
+from .metrics import CACHE_EVICTIONS, CACHE_REQUESTS, COALESCED_CALLS
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+class LRUCache(Generic[K, V]):
+    """LRU cache.
+
+    Thread-safe, bounded mapping that evicts the least recently used entry
+    when full. Lookups are recorded in the cache requests metric under the
+    cache name, and evictions in the cache evictions metric.
+    """
+
+    def __init__(self, name: str, max_size: int = 128) -> None:
+        """Initialize cache."""
+        if max_size < 1:
+            raise ValueError("The cache size must be positive.")
+        self.name = name
+        self.max_size = max_size
+        self._data: OrderedDict[K, V] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Return the number of entries."""
+        return len(self._data)
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        """Get a value, marking it as recently used."""
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is not _MISSING:
+                self._data.move_to_end(key)
+
+        if value is _MISSING:
+            CACHE_REQUESTS.inc(cache=self.name, result="miss")
+            return default
+
+        CACHE_REQUESTS.inc(cache=self.name, result="hit")
+        return value  # type: ignore
+
+    def set(self, key: K, value: V) -> None:
+        """Set a value, evicting the least recently used entry if full."""
+        evicted = 0
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                evicted += 1
+
+        if evicted:
+            CACHE_EVICTIONS.inc(evicted, cache=self.name)
+
+    def get_or_set(self, key: K, default: Callable[[], V]) -> V:
+        """Get a value, computing and setting it when missing."""
+        value = self.get(key, _MISSING)  # type: ignore
+        if value is _MISSING:
+            value = default()
+            self.set(key, value)
+        return value  # type: ignore
+
+    def pop(self, key: K, default: V | None = None) -> V | None:
+        """Remove a value and return it, without recording a lookup."""
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
+
+
+class SingleFlight(Generic[K, V]):
+    """Single flight.
+
+    Coalesces concurrent calls for the same key: the first caller runs the
+    function, and the others wait for its result or exception. Nothing is
+    kept once the call is done, so failures aren't cached. Coalesced calls
+    are recorded in the coalesced calls metric under the group name.
+    """
+
+    def __init__(self, name: str) -> None:
+        """Initialize single flight group."""
+        self.name = name
+        self._calls: dict[K, Future[V]] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: K, fn: Callable[[], V]) -> V:
+        """Call a function, unless a call for the same key is in flight."""
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if future is None:
+                future = self._calls[key] = Future()
+
+        if not leader:
+            COALESCED_CALLS.inc(group=self.name)
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as err:
+            future.set_exception(err)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
@@ -0,0 +1,125 @@
+"""Compression."""
+
+from __future__ import annotations
+
+import bz2
+import gzip
+import io
+import lzma
+import zlib
+from typing import IO, Any, Callable
+
+READ_BUFFER_SIZE = 1024 * 1024
+
+_OPENERS: dict[str, Callable[[IO[bytes]], IO[bytes]]] = {
+    "gzip": lambda file: gzip.GzipFile(fileobj=file, mode="rb"),
+    "bz2": lambda file: bz2.BZ2File(file, mode="rb"),
+    "xz": lambda file: lzma.LZMAFile(file, mode="rb"),
+}
+_APPENDERS: dict[str, Callable[[IO[bytes]], IO[bytes]]] = {
+    "gzip": lambda file: gzip.GzipFile(fileobj=file, mode="ab"),
+    "bz2": lambda file: bz2.BZ2File(file, mode="ab"),
+    "xz": lambda file: lzma.LZMAFile(file, mode="ab"),
+}
+_DECOMPRESSORS: dict[str, Callable[[], Any]] = {
+    "gzip": lambda: zlib.decompressobj(wbits=16 + zlib.MAX_WBITS),
+    "bz2": bz2.BZ2Decompressor,
+    "xz": lzma.LZMADecompressor,
+}
+_EXTENSIONS = {
+    ".gz": "gzip",
+    ".bz2": "bz2",
+    ".xz": "xz",
+}
+
+
+def get_compression(file_path: str) -> str | None:
+    """Get the compression of a file from its extension, if compressed."""
+    for extension, compression in _EXTENSIONS.items():
+        if file_path.endswith(extension):
+            return compression
+    return None
+
+
+def open_decompressed(
+    file: IO[bytes],
+    compression: str | None,
+    buffer_size: int = READ_BUFFER_SIZE,
+) -> IO[bytes]:
+    """Open a binary file for buffered reads of its decompressed content.
+
+    Content is decompressed as it's read, so files are never decompressed
+    whole, neither in memory nor on disk. Closing the returned file doesn't
+    close the underlying one.
+    """
+    if compression is None:
+        stream: IO[bytes] = _UnclosedFile(file)  # type: ignore
+    else:
+        stream = _OPENERS[compression](file)
+    return io.BufferedReader(stream, buffer_size)  # type: ignore
+
+
+def open_compressed_append(
+    file: IO[bytes], compression: str | None
+) -> IO[bytes]:
+    """Open a binary file to append content, compressed as it's written.
+
+    Compressed content is appended as a new stream, which readers
+    decompress as if it were part of the previous ones. Closing the
+    returned file doesn't close the underlying one.
+    """
+    if compression is None:
+        return _UnclosedFile(file)  # type: ignore
+    return _APPENDERS[compression](file)
+
+
+def decompress_head(head: bytes, compression: str | None) -> bytes:
+    """Decompress as much of the content as the head of a file holds."""
+    if compression is None:
+        return head
+
+    try:
+        return _DECOMPRESSORS[compression]().decompress(head)
+    except (EOFError, OSError, ValueError, zlib.error, lzma.LZMAError):
+        return b""
+
+
+class _UnclosedFile(io.RawIOBase):
+    """Binary file whose closing leaves the underlying file open."""
+
+    def __init__(self, file: IO[bytes]) -> None:
+        """Initialize file."""
+        self.file = file
+
+    def readable(self) -> bool:
+        """Return whether the file is readable."""
+        return self.file.readable()
+
+    def writable(self) -> bool:
+        """Return whether the file is writable."""
+        return self.file.writable()
+
+    def seekable(self) -> bool:
+        """Return whether the file is seekable."""
+        return self.file.seekable()
+
+    def readinto(self, buffer) -> int:
+        """Read into a buffer."""
+        return self.file.readinto(buffer)  # type: ignore
+
+    def write(self, data) -> int:
+        """Write data."""
+        return self.file.write(data)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        """Move to a position."""
+        return self.file.seek(offset, whence)
+
+    def tell(self) -> int:
+        """Return the position."""
+        return self.file.tell()
+
+    def flush(self) -> None:
+        """Flush the underlying file, if still open."""
+        if not self.closed:
+            self.file.flush()
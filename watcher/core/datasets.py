@@ -0,0 +1,96 @@
+"""Datasets."""
+
+from __future__ import annotations
+
+import dataclasses
+import functools
+import threading
+from typing import Any, Generic, Mapping, Sequence, TypeVar
+
+from .statistics import DatasetStatistics, collect_statistics
+
+T = TypeVar("T")
+
+
+@dataclasses.dataclass(frozen=True)
+class Dataset(Generic[T]):
+    """Dataset loaded in memory, indexed by primary key."""
+
+    version: str
+    items: Sequence[T]
+    index: Mapping[int, T]
+    positions: dict[str, Mapping[Any, Sequence[int]]] = dataclasses.field(
+        default_factory=dict, repr=False, compare=False
+    )
+
+    @functools.cached_property
+    def statistics(self) -> DatasetStatistics:
+        """Return the statistics of the fields of the items."""
+        return collect_statistics(self.items)
+
+    def get_positions(self, field: str) -> Mapping[Any, Sequence[int]]:
+        """Get an inverted index of the positions of items by a field.
+
+        Indexes are built on first use and kept with the dataset. Unlike
+        indexes of primary keys, they tell apart items sharing a key.
+        """
+        try:
+            return self.positions[field]
+        except KeyError:
+            pass
+
+        positions: dict[Any, list[int]] = {}
+        for position, item in enumerate(self.items):
+            value = getattr(item, field)
+            try:
+                positions[value].append(position)
+            except KeyError:
+                positions[value] = [position]
+        self.positions[field] = positions
+        return positions
+
+
+class DatasetRegistry:
+    """Dataset registry.
+
+    Holds the current generation of each dataset loaded in memory. Swapping
+    in a new generation is atomic: readers holding the previous one finish
+    on it, and it's freed once the last of them lets it go.
+    """
+
+    def __init__(self) -> None:
+        """Initialize registry."""
+        self._datasets: dict[str, Dataset] = {}
+        self._watched: set[str] = set()
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> Dataset | None:
+        """Get the current generation of a dataset."""
+        return self._datasets.get(name)
+
+    def swap(self, name: str, dataset: Dataset) -> Dataset | None:
+        """Swap in a new generation of a dataset, returning the old one."""
+        with self._lock:
+            old_dataset = self._datasets.get(name)
+            self._datasets[name] = dataset
+        return old_dataset
+
+    def watch(self, name: str) -> None:
+        """Mark a dataset as kept up to date by a reloader."""
+        with self._lock:
+            self._watched.add(name)
+
+    def unwatch(self, name: str) -> None:
+        """Mark a dataset as no longer kept up to date by a reloader."""
+        with self._lock:
+            self._watched.discard(name)
+
+    def is_watched(self, name: str) -> bool:
+        """Check if a dataset is kept up to date by a reloader."""
+        return name in self._watched
+
+    def clear(self) -> None:
+        """Remove every dataset."""
+        with self._lock:
+            self._datasets.clear()
+            self._watched.clear()
@@ -0,0 +1,109 @@
+"""Feeds."""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import threading
+from collections import deque
+from typing import Callable, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class Feed(Generic[T]):
+    """Feed.
+
+    Thread-safe, in-memory log of the latest events, numbered in sequence
+    from 1. Readers keep a cursor, the sequence number of the last event
+    they read, and wait for the events after it, so a reader costs nothing
+    but its cursor. Readers in an event loop wait without holding a
+    thread. Only the latest events are kept: readers that fall further
+    behind must resync.
+    """
+
+    def __init__(self, name: str, max_size: int = 1024) -> None:
+        """Initialize feed."""
+        if max_size < 1:
+            raise ValueError("The feed size must be positive.")
+        self.name = name
+        self._events: deque[tuple[int, T]] = deque(maxlen=max_size)
+        self._sequence = 0
+        self._condition = threading.Condition()
+        self._waiters: set[Callable[[], None]] = set()
+
+    @property
+    def sequence(self) -> int:
+        """Return the sequence number of the last event published."""
+        with self._condition:
+            return self._sequence
+
+    def publish(self, event: T) -> int:
+        """Publish an event, returning its sequence number."""
+        with self._condition:
+            self._sequence += 1
+            self._events.append((self._sequence, event))
+            self._condition.notify_all()
+            for waiter in self._waiters:
+                waiter()
+            return self._sequence
+
+    def read(
+        self, cursor: int, timeout: float | None = None
+    ) -> list[tuple[int, T]] | None:
+        """Get the events after a cursor, waiting up to a timeout for them.
+
+        Returns None if the cursor is stale: events after it were dropped,
+        or it's ahead of the feed, as cursors of a previous process are.
+        """
+        with self._condition:
+            if cursor > self._sequence:
+                return None
+
+            self._condition.wait_for(lambda: self._sequence > cursor, timeout)
+            if self._events:
+                first = self._events[0][0]
+            else:
+                first = self._sequence + 1
+            if cursor + 1 < first:
+                return None
+            return list(
+                itertools.islice(self._events, cursor + 1 - first, None)
+            )
+
+    async def aread(
+        self, cursor: int, timeout: float | None = None
+    ) -> list[tuple[int, T]] | None:
+        """Get the events after a cursor, waiting in the event loop.
+
+        Like read, but the event loop is woken up by the publisher instead
+        of a thread waiting for the events.
+        """
+        loop = asyncio.get_running_loop()
+        published = asyncio.Event()
+
+        def notify() -> None:
+            try:
+                loop.call_soon_threadsafe(published.set)
+            except RuntimeError:
+                # The loop was closed while the reader was waiting.
+                pass
+
+        with self._condition:
+            if self._sequence != cursor:
+                return self.read(cursor, timeout=0)
+            self._waiters.add(notify)
+
+        try:
+            await asyncio.wait_for(published.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._condition:
+                self._waiters.discard(notify)
+        return self.read(cursor, timeout=0)
+
+    def clear(self) -> None:
+        """Remove all events, keeping the sequence."""
+        with self._condition:
+            self._events.clear()
@@ -0,0 +1,138 @@
+"""Instrumentation."""
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any, ContextManager, Generator, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+_CURRENT_TIMING: ContextVar[Timing | None] = ContextVar(
+    "current_timing", default=None
+)
+
+
+class Timing:
+    """Timing.
+
+    Collects phase durations and row counters for a unit of work, usually
+    a request. Nested phases are accounted exclusively, so the time spent
+    in a child phase is not counted again in its parent.
+    """
+
+    __slots__ = ["durations", "counters", "_stack"]
+
+    def __init__(self) -> None:
+        """Initialize timing."""
+        self.durations: dict[str, float] = {}
+        self.counters: dict[str, int] = {}
+        self._stack: list[list[float]] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Generator[None, None, None]:
+        """Measure the duration of a phase."""
+        frame = [0.0]
+        self._stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._stack.pop()
+            self.durations[name] = (
+                self.durations.get(name, 0.0) + elapsed - frame[0]
+            )
+            if self._stack:
+                self._stack[-1][0] += elapsed
+
+    def add_duration(self, name: str, elapsed: float) -> None:
+        """Add a duration measured elsewhere to a phase."""
+        self.durations[name] = self.durations.get(name, 0.0) + elapsed
+        if self._stack:
+            self._stack[-1][0] += elapsed
+
+    def increment(self, name: str, value: int = 1) -> None:
+        """Increment a counter."""
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def measure(
+        self, name: str, iterable: Iterable[T], *names: str
+    ) -> Generator[T, None, None]:
+        """Generate items, measuring the time spent producing them.
+
+        Only the time spent inside the iterable is added to the phase, not
+        the time the consumer spends between items.
+        """
+        iterator: Iterator[T] = iter(iterable)
+        perf_counter = time.perf_counter
+        elapsed = 0.0
+        count = 0
+        try:
+            while True:
+                start = perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    elapsed += perf_counter() - start
+                    break
+                elapsed += perf_counter() - start
+                count += 1
+                yield item
+        finally:
+            self.add_duration(name, elapsed)
+            for counter_name in names:
+                self.increment(counter_name, count)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return durations in milliseconds and counters as a dict."""
+        return {
+            "durations": {
+                name: round(elapsed * 1000, 3)
+                for name, elapsed in self.durations.items()
+            },
+            "counters": dict(self.counters),
+        }
+
+    def as_header(self) -> str:
+        """Return durations and counters as a Server-Timing header value."""
+        metrics = [
+            f"{name};dur={elapsed * 1000:.3f}"
+            for name, elapsed in self.durations.items()
+        ]
+        metrics.extend(
+            f'{name};desc="{value}"' for name, value in self.counters.items()
+        )
+        return ", ".join(metrics)
+
+
+def get_timing() -> Timing | None:
+    """Return the timing of the current context, if any."""
+    return _CURRENT_TIMING.get()
+
+
+@contextmanager
+def start_timing() -> Generator[Timing, None, None]:
+    """Collect timing for the current context."""
+    timing = Timing()
+    token = _CURRENT_TIMING.set(timing)
+    try:
+        yield timing
+    finally:
+        _CURRENT_TIMING.reset(token)
+
+
+def phase(name: str) -> ContextManager[None]:
+    """Measure the duration of a phase, if timing is enabled."""
+    timing = _CURRENT_TIMING.get()
+    if timing is None:
+        return nullcontext()
+    return timing.phase(name)
+
+
+def increment(name: str, value: int = 1) -> None:
+    """Increment a counter, if timing is enabled."""
+    timing = _CURRENT_TIMING.get()
+    if timing is not None:
+        timing.increment(name, value)
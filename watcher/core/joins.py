@@ -0,0 +1,191 @@
+"""Joins."""
+
+from __future__ import annotations
+
+import enum
+import operator
+from typing import (
+    Any,
+    Callable,
+    Generator,
+    Generic,
+    Hashable,
+    Iterable,
+    TypeVar,
+)
+
+from .repositories import IterableReadRepository, ReadRepository
+
+L = TypeVar("L")
+R = TypeVar("R")
+
+JoinInput = ReadRepository | Iterable
+JoinKey = str | Callable[[Any], Hashable]
+
+
+class JoinType(enum.Enum):
+    """Join type."""
+
+    INNER = "inner"
+    LEFT_OUTER = "left_outer"
+
+
+def _get_key_fn(key: JoinKey) -> Callable[[Any], Hashable]:
+    """Get the key function of a field name or key function."""
+    if isinstance(key, str):
+        return operator.attrgetter(key)
+    return key
+
+
+def _get_count_estimate(rows: JoinInput) -> int | None:
+    """Get an estimate of the number of rows of an input, if known."""
+    if isinstance(rows, ReadRepository):
+        return rows.get_count_estimate()
+    try:
+        return len(rows)  # type: ignore
+    except TypeError:
+        return None
+
+
+def _iter_rows(rows: JoinInput) -> Iterable[Any]:
+    """Iterate the rows of an input, streaming repositories."""
+    if isinstance(rows, IterableReadRepository):
+        return rows.iter_items()
+    if isinstance(rows, ReadRepository):
+        return rows.get_all()
+    return rows
+
+
+def _build_table(
+    rows: Iterable[Any], key: Callable[[Any], Hashable]
+) -> tuple[dict[Hashable, Any], bool]:
+    """Build the hash table of rows by key.
+
+    Returns the table and whether its keys are unique, in which case each
+    key maps to its row instead of to a list of rows.
+    """
+    table: dict[Hashable, list[Any]] = {}
+    for row in rows:
+        row_key = key(row)
+        try:
+            table[row_key].append(row)
+        except KeyError:
+            table[row_key] = [row]
+
+    if all(len(bucket) == 1 for bucket in table.values()):
+        return {row_key: bucket[0] for row_key, bucket in table.items()}, True
+    return table, False
+
+
+class HashJoin(Generic[L, R]):
+    """Hash join.
+
+    Joins the rows of two repositories or iterables with equal keys into
+    (left, right) pairs. The hash table is built on the input estimated to
+    be the smaller, the right one on ties or without estimates, and the
+    other input is streamed. Either way, pairs are generated in the order
+    of the left input, and the matches of a left row in the order of the
+    right input. Left outer joins pair left rows without a match with a
+    default, built from their key, or None. The number of left rows
+    without a match is counted as they're found.
+    """
+
+    def __init__(
+        self,
+        left: JoinInput,
+        right: JoinInput,
+        left_key: JoinKey,
+        right_key: JoinKey,
+        join_type: JoinType = JoinType.INNER,
+        default: Callable[[Any], R] | None = None,
+    ) -> None:
+        """Initialize join."""
+        self.left = left
+        self.right = right
+        self.left_key = _get_key_fn(left_key)
+        self.right_key = _get_key_fn(right_key)
+        self.join_type = join_type
+        self.default = default
+        self.unmatched = 0
+
+    def builds_left(self) -> bool:
+        """Return whether the hash table is built on the left input."""
+        left_count = _get_count_estimate(self.left)
+        right_count = _get_count_estimate(self.right)
+        if left_count is None or right_count is None:
+            return False
+        return left_count < right_count
+
+    def __iter__(self) -> Generator[tuple[L, R], None, None]:
+        """Generate the pairs of joined rows."""
+        self.unmatched = 0
+        if self.builds_left():
+            return self._iter_build_left()
+        return self._iter_build_right()
+
+    def _get_default(self, key: Hashable) -> R | None:
+        """Get the default right row of a key."""
+        if self.default is None:
+            return None
+        return self.default(key)
+
+    def _iter_build_right(self) -> Generator[tuple[L, R], None, None]:
+        """Build the table on the right input and stream the left one."""
+        table, unique = _build_table(_iter_rows(self.right), self.right_key)
+        left_key = self.left_key
+        outer = self.join_type == JoinType.LEFT_OUTER
+
+        for left in _iter_rows(self.left):
+            key = left_key(left)
+            try:
+                match = table[key]
+            except KeyError:
+                self.unmatched += 1
+                if outer:
+                    yield left, self._get_default(key)  # type: ignore
+                continue
+
+            if unique:
+                yield left, match
+            else:
+                for right in match:
+                    yield left, right
+
+    def _iter_build_left(self) -> Generator[tuple[L, R], None, None]:
+        """Build the table on the left input and stream the right one.
+
+        Matches are collected by left row as the right input is streamed,
+        then generated in the order of the left input, as when the table is
+        built on the right input.
+        """
+        lefts = list(_iter_rows(self.left))
+        left_key = self.left_key
+        table: dict[Hashable, list[int]] = {}
+        for position, left in enumerate(lefts):
+            key = left_key(left)
+            try:
+                table[key].append(position)
+            except KeyError:
+                table[key] = [position]
+
+        right_key = self.right_key
+        matches: list[list[R] | None] = [None] * len(lefts)
+        for right in _iter_rows(self.right):
+            for position in table.get(right_key(right), ()):
+                rights = matches[position]
+                if rights is None:
+                    matches[position] = [right]
+                else:
+                    rights.append(right)
+
+        outer = self.join_type == JoinType.LEFT_OUTER
+        for left, rights in zip(lefts, matches):
+            if rights is None:
+                self.unmatched += 1
+                if outer:
+                    default = self._get_default(left_key(left))
+                    yield left, default  # type: ignore
+                continue
+
+            for right in rights:
+                yield left, right
@@ -0,0 +1,282 @@
+"""Metrics."""
+
+from __future__ import annotations
+
+import abc
+import bisect
+import threading
+from typing import Generator, Iterable, TypeVar
+
+M = TypeVar("M", bound="Metric")
+
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value."""
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_label_value(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Iterable[tuple[str, str]]) -> str:
+    """Format labels."""
+    pairs = [
+        f'{name}="{_escape_label_value(value)}"' for name, value in labels
+    ]
+    if not pairs:
+        return ""
+    return "{" + ",".join(pairs) + "}"
+
+
+class Metric(abc.ABC):
+    """Metric.
+
+    Samples are stored per combination of label values and updated under a
+    lock, so metrics can be shared between threads.
+    """
+
+    type: str
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Iterable[str] = ()
+    ) -> None:
+        """Initialize metric."""
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, object]) -> tuple[str, ...]:
+        """Return the sample key for the given labels."""
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"Metric '{self.name}' expects labels {self.labelnames}, "
+                f"got {tuple(labels)}."
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    @abc.abstractmethod
+    def collect(self) -> Generator[str, None, None]:
+        """Generate the exposition lines of the samples."""
+
+
+class Counter(Metric):
+    """Counter."""
+
+    type = "counter"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Iterable[str] = ()
+    ) -> None:
+        """Initialize counter."""
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, value: float = 1, **labels: object) -> None:
+        """Increment counter."""
+        if value < 0:
+            raise ValueError("Counters can only be incremented.")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    def get(self, **labels: object) -> float:
+        """Get counter value."""
+        key = self._key(labels)
+        with self._lock:
+            return self._values.get(key, 0)
+
+    def collect(self) -> Generator[str, None, None]:
+        """Generate the exposition lines of the samples."""
+        with self._lock:
+            values = list(self._values.items())
+
+        for key, value in values:
+            labels = _format_labels(zip(self.labelnames, key))
+            yield f"{self.name}{labels} {_format_value(value)}"
+
+
+class Histogram(Metric):
+    """Histogram."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        """Initialize histogram."""
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: object) -> None:
+        """Observe a value."""
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            try:
+                counts, total = self._values[key]
+            except KeyError:
+                counts, total = [0] * (len(self.buckets) + 1), [0.0]
+                self._values[key] = counts, total
+            counts[index] += 1
+            total[0] += value
+
+    def get_count(self, **labels: object) -> int:
+        """Get the number of observed values."""
+        key = self._key(labels)
+        with self._lock:
+            try:
+                counts, _ = self._values[key]
+            except KeyError:
+                return 0
+            return sum(counts)
+
+    def collect(self) -> Generator[str, None, None]:
+        """Generate the exposition lines of the samples."""
+        with self._lock:
+            values = [
+                (key, list(counts), total[0])
+                for key, (counts, total) in self._values.items()
+            ]
+
+        for key, counts, total in values:
+            labels = list(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                bucket_labels = _format_labels(
+                    labels + [("le", _format_value(bound))]
+                )
+                yield f"{self.name}_bucket{bucket_labels} {cumulative}"
+
+            formatted_labels = _format_labels(labels)
+            yield f"{self.name}_sum{formatted_labels} {_format_value(total)}"
+            yield f"{self.name}_count{formatted_labels} {cumulative}"
+
+
+class MetricsRegistry:
+    """Metrics registry."""
+
+    def __init__(self) -> None:
+        """Initialize registry."""
+        self._metrics: dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: M) -> M:
+        """Register a metric."""
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric '{metric.name}' already registered.")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+
+        lines: list[str] = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+REPOSITORY_SCANS = REGISTRY.register(
+    Counter(
+        "watcher_repository_scans_total",
+        "Number of dataset scans.",
+        ["dataset"],
+    )
+)
+REPOSITORY_ROWS_PARSED = REGISTRY.register(
+    Counter(
+        "watcher_repository_rows_parsed_total",
+        "Number of dataset rows parsed.",
+        ["dataset"],
+    )
+)
+REPOSITORY_BYTES_READ = REGISTRY.register(
+    Counter(
+        "watcher_repository_bytes_read_total",
+        "Number of dataset bytes read from storage.",
+        ["dataset"],
+    )
+)
+STORAGE_BYTES_FETCHED = REGISTRY.register(
+    Counter(
+        "watcher_storage_bytes_fetched_total",
+        "Number of dataset bytes copied from storage to the local cache.",
+        ["dataset"],
+    )
+)
+CACHE_REQUESTS = REGISTRY.register(
+    Counter(
+        "watcher_cache_requests_total",
+        "Number of cache lookups.",
+        ["cache", "result"],
+    )
+)
+CACHE_EVICTIONS = REGISTRY.register(
+    Counter(
+        "watcher_cache_evictions_total",
+        "Number of cache entries evicted to make room for new ones.",
+        ["cache"],
+    )
+)
+COALESCED_CALLS = REGISTRY.register(
+    Counter(
+        "watcher_coalesced_calls_total",
+        "Number of calls that waited for the same call in flight.",
+        ["group"],
+    )
+)
+SPECIFICATION_EVALUATIONS = REGISTRY.register(
+    Counter(
+        "watcher_specification_evaluations_total",
+        "Number of objects tested against a specification.",
+        ["dataset"],
+    )
+)
+DATASET_RELOADS = REGISTRY.register(
+    Counter(
+        "watcher_dataset_reloads_total",
+        "Number of dataset reloads in the background.",
+        ["dataset", "result"],
+    )
+)
+VIEW_LATENCY = REGISTRY.register(
+    Histogram(
+        "watcher_view_latency_seconds",
+        "View response latency in seconds.",
+        ["view", "method"],
+    )
+)
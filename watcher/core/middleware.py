@@ -0,0 +1,124 @@
+"""Middleware."""
+
+import json
+import logging
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from .instrumentation import get_timing, start_timing
+from .metrics import VIEW_LATENCY
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ServerTimingMiddleware:
+    """Server timing middleware.
+
+    Collects per-phase durations and row counters for each request and
+    reports them in a Server-Timing header and, optionally, a structured
+    log line. The middleware is removed from the chain when disabled.
+
+    Streaming responses do their work as their content is consumed, after
+    headers are sent, so they get no Server-Timing header, and their log
+    line is written once their content is consumed or closed.
+    """
+
+    def __init__(self, get_response):
+        """Initialize middleware."""
+        if not getattr(settings, "SERVER_TIMING_ENABLED", False):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.log = getattr(settings, "SERVER_TIMING_LOG", False)
+
+    def __call__(self, request):
+        """Handle request."""
+        with start_timing() as timing:
+            start = time.perf_counter()
+            response = self.get_response(request)
+            timing.durations["total"] = time.perf_counter() - start
+
+        if not response.streaming:
+            response["Server-Timing"] = timing.as_header()
+            if self.log:
+                self.log_timing(request, response, timing)
+        elif self.log:
+            if response.is_async:
+                iter_logged = self.aiter_logged
+            else:
+                iter_logged = self.iter_logged
+            response.streaming_content = iter_logged(
+                response.streaming_content, request, response, timing, start
+            )
+
+        return response
+
+    def iter_logged(self, content, request, response, timing, start):
+        """Generate streamed content, logging the timing at the end."""
+        try:
+            yield from content
+        finally:
+            timing.durations["total"] = time.perf_counter() - start
+            self.log_timing(request, response, timing)
+
+    async def aiter_logged(self, content, request, response, timing, start):
+        """Generate streamed content, logging the timing at the end."""
+        try:
+            async for chunk in content:
+                yield chunk
+        finally:
+            timing.durations["total"] = time.perf_counter() - start
+            self.log_timing(request, response, timing)
+
+    def log_timing(self, request, response, timing):
+        """Log the timing of a request."""
+        _LOGGER.info(
+            json.dumps(
+                {
+                    "method": request.method,
+                    "path": request.path,
+                    "status": response.status_code,
+                    **timing.as_dict(),
+                }
+            )
+        )
+
+    def process_template_response(self, request, response):
+        """Measure template rendering."""
+        timing = get_timing()
+        if timing is None:
+            return response
+
+        start = time.perf_counter()
+
+        def add_render_duration(response):
+            timing.add_duration("render", time.perf_counter() - start)
+
+        response.add_post_render_callback(add_render_duration)
+        return response
+
+
+class MetricsMiddleware:
+    """Metrics middleware.
+
+    Observes the response latency of each view in a histogram. The
+    middleware is removed from the chain when disabled.
+    """
+
+    def __init__(self, get_response):
+        """Initialize middleware."""
+        if not getattr(settings, "METRICS_ENABLED", False):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        """Handle request."""
+        start = time.perf_counter()
+        response = self.get_response(request)
+        elapsed = time.perf_counter() - start
+
+        resolver_match = request.resolver_match
+        view = resolver_match.view_name if resolver_match else "unmatched"
+        VIEW_LATENCY.observe(elapsed, view=view, method=request.method)
+        return response
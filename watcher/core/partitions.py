@@ -0,0 +1,214 @@
+"""Partitions."""
+
+from __future__ import annotations
+
+import csv
+import dataclasses
+import io
+import json
+import os
+import posixpath
+from typing import IO, Any, Iterable, Mapping, Sequence
+
+from django.core.files.storage import Storage
+
+from .compression import get_compression, open_decompressed
+from .specifications import (
+    AndSpecification,
+    OrSpecification,
+    Specification,
+    get_lookup_values,
+)
+
+MANIFEST_EXTENSION = ".json"
+MANIFEST_NAME = "manifest.json"
+PARTITION_EXTENSIONS = (".csv", ".csv.gz", ".csv.bz2", ".csv.xz")
+
+
+def is_manifest(file_path: str) -> bool:
+    """Check if a dataset file path is a partition manifest."""
+    return file_path.endswith(MANIFEST_EXTENSION)
+
+
+def get_dataset_file_paths(storage: Storage, file_path: str) -> list[str]:
+    """Get the paths of the files of a dataset, with its partitions."""
+    if not is_manifest(file_path):
+        return [file_path]
+
+    with storage.open(file_path, mode="rb") as file:
+        manifest = PartitionManifest.read(file, file_path)
+    return [file_path] + [
+        partition.file_path for partition in manifest.partitions
+    ]
+
+
+def may_satisfy(
+    spec: Specification, ranges: Mapping[str, Sequence[Any]]
+) -> bool:
+    """Check if rows with fields in ranges may satisfy a specification.
+
+    Ranges map fields to their (minimum, maximum) values. Only lookups of
+    fields with ranges and their conjunctions and disjunctions rule rows
+    out; other specifications may be satisfied by any row.
+    """
+    if isinstance(spec, AndSpecification):
+        return all(may_satisfy(child, ranges) for child in spec.specs)
+    if isinstance(spec, OrSpecification):
+        return any(may_satisfy(child, ranges) for child in spec.specs)
+
+    for field, (minimum, maximum) in ranges.items():
+        values = get_lookup_values(spec, field)
+        if values is None:
+            continue
+        try:
+            return any(minimum <= value <= maximum for value in values)
+        except TypeError:
+            return True
+    return True
+
+
+@dataclasses.dataclass(frozen=True)
+class Partition:
+    """Partition of a dataset.
+
+    A file of the rows of a dataset, with the ranges of the values of its
+    partition key fields.
+    """
+
+    file_path: str
+    ranges: Mapping[str, tuple[Any, Any]]
+    rows: int | None = None
+
+    def may_satisfy(self, spec: Specification | None) -> bool:
+        """Check if rows of the partition may satisfy a specification."""
+        return spec is None or may_satisfy(spec, self.ranges)
+
+
+@dataclasses.dataclass(frozen=True)
+class PartitionManifest:
+    """Partition manifest.
+
+    Lists the partition files of a dataset, relative to the manifest, with
+    the ranges of their partition keys.
+    """
+
+    partitions: tuple[Partition, ...]
+
+    @property
+    def rows(self) -> int | None:
+        """Return the number of rows, if known for every partition."""
+        if any(partition.rows is None for partition in self.partitions):
+            return None
+        return sum(partition.rows for partition in self.partitions)  # type: ignore
+
+    @classmethod
+    def parse(
+        cls, data: Mapping[str, Any], file_path: str
+    ) -> PartitionManifest:
+        """Parse the manifest data of a manifest file."""
+        directory = posixpath.dirname(file_path)
+        try:
+            return cls(
+                partitions=tuple(
+                    Partition(
+                        file_path=posixpath.join(directory, item["file"]),
+                        ranges={
+                            field: (minimum, maximum)
+                            for field, (minimum, maximum) in item.get(
+                                "ranges", {}
+                            ).items()
+                        },
+                        rows=item.get("rows"),
+                    )
+                    for item in data["partitions"]
+                )
+            )
+        except (KeyError, TypeError, ValueError) as err:
+            raise ValueError(
+                f"Invalid partition manifest: {file_path}"
+            ) from err
+
+    @classmethod
+    def read(cls, file: IO[bytes], file_path: str) -> PartitionManifest:
+        """Read a manifest file."""
+        try:
+            data = json.load(file)
+        except ValueError as err:
+            raise ValueError(
+                f"Invalid partition manifest: {file_path}"
+            ) from err
+        return cls.parse(data, file_path)
+
+    def prune(self, spec: Specification | None) -> list[Partition]:
+        """Get the partitions whose rows may satisfy a specification."""
+        return [
+            partition
+            for partition in self.partitions
+            if partition.may_satisfy(spec)
+        ]
+
+
+def build_manifest(directory: str, fields: Iterable[str]) -> dict[str, Any]:
+    """Build the manifest data of the partition files of a local directory.
+
+    Every CSV file of the directory, compressed or not, is a partition, in
+    name order. Values of the partition key fields are compared as
+    integers, or as strings if they aren't.
+    """
+    fields = list(fields)
+    partitions = []
+    for file_name in sorted(os.listdir(directory)):
+        if not file_name.endswith(PARTITION_EXTENSIONS):
+            continue
+
+        with open(os.path.join(directory, file_name), "rb") as file:
+            rows, ranges = _scan_partition(file, file_name, fields)
+        partitions.append({"file": file_name, "rows": rows, "ranges": ranges})
+    return {"partitions": partitions}
+
+
+def write_manifest(directory: str, fields: Iterable[str]) -> str:
+    """Write the manifest of the partition files of a local directory."""
+    manifest = build_manifest(directory, fields)
+    path = os.path.join(directory, MANIFEST_NAME)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=2)
+    os.replace(temp_path, path)
+    return path
+
+
+def _scan_partition(
+    file: IO[bytes], file_name: str, fields: list[str]
+) -> tuple[int, dict[str, list[Any]]]:
+    """Count the rows of a partition file and get its key ranges."""
+    stream = open_decompressed(file, get_compression(file_name))
+    text_file = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+    ranges: dict[str, list[Any]] = {}
+    rows = 0
+    for rows, row in enumerate(csv.DictReader(text_file), 1):
+        for field in fields:
+            try:
+                value = parse_value(row[field])
+            except KeyError as err:
+                raise ValueError(
+                    f"Missing partition key field '{field}' in {file_name}."
+                ) from err
+            try:
+                minimum, maximum = ranges[field]
+            except KeyError:
+                ranges[field] = [value, value]
+                continue
+            if value < minimum:
+                ranges[field][0] = value
+            elif value > maximum:
+                ranges[field][1] = value
+    return rows, ranges
+
+
+def parse_value(value: str) -> int | str:
+    """Parse a CSV value to compare, as an integer if it's one."""
+    try:
+        return int(value)
+    except ValueError:
+        return value
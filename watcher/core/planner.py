@@ -0,0 +1,170 @@
+"""Planner."""
+
+from __future__ import annotations
+
+import dataclasses
+import math
+from typing import Any, Callable, Iterable, Sized
+
+from .specifications import (
+    AndSpecification,
+    ContainsSpecification,
+    EqualsSpecification,
+    InSpecification,
+    OrSpecification,
+    Specification,
+)
+from .statistics import DatasetStatistics
+
+DEFAULT_SELECTIVITY = 0.5
+CONTAINS_CHARS_PER_COMPARISON = 16
+
+
+@dataclasses.dataclass(frozen=True)
+class Estimate:
+    """Estimate of the selectivity and evaluation cost of a specification.
+
+    Costs are measured in field comparisons per object.
+    """
+
+    selectivity: float
+    cost: float
+
+
+def _and_rank(estimate: Estimate) -> float:
+    """Rank conjunction children by cost per object they rule out."""
+    if estimate.selectivity >= 1:
+        return math.inf
+    return estimate.cost / (1 - estimate.selectivity)
+
+
+def _or_rank(estimate: Estimate) -> float:
+    """Rank disjunction children by cost per object they match."""
+    if estimate.selectivity <= 0:
+        return math.inf
+    return estimate.cost / estimate.selectivity
+
+
+class SpecificationPlanner:
+    """Specification planner.
+
+    Orders the children of conjunctions by cheapest and most selective
+    first, so their evaluation stops early on most objects, and those of
+    disjunctions by cheapest and most likely to match first. Estimates
+    come from the statistics of the dataset. Children are only reordered,
+    so planned specifications are satisfied by the same objects.
+    """
+
+    def __init__(self, statistics: DatasetStatistics) -> None:
+        """Initialize planner."""
+        self.statistics = statistics
+
+    def plan(self, spec: Specification) -> Specification:
+        """Plan the evaluation order of a specification."""
+        return self._plan(spec)[0]
+
+    def estimate(self, spec: Specification) -> Estimate:
+        """Estimate the selectivity and cost of a specification."""
+        return self._plan(spec)[1]
+
+    def explain(self, spec: Specification) -> str:
+        """Describe a specification with its estimates, in order."""
+        estimate = self.estimate(spec)
+        if isinstance(spec, (AndSpecification, OrSpecification)):
+            operator = "and" if isinstance(spec, AndSpecification) else "or"
+            children = ", ".join(self.explain(child) for child in spec.specs)
+            description = f"{operator}({children})"
+        elif isinstance(spec, EqualsSpecification):
+            description = f"{spec.field} = {spec.value!r}"
+        elif isinstance(spec, InSpecification):
+            description = f"{spec.field} in {_describe_values(spec.value)}"
+        elif isinstance(spec, ContainsSpecification):
+            description = f"{spec.field} contains {spec.value!r}"
+        else:
+            description = type(spec).__name__
+
+        return (
+            f"{description} [selectivity={estimate.selectivity:.3g}, "
+            f"cost={estimate.cost:.3g}]"
+        )
+
+    def _plan(self, spec: Specification) -> tuple[Specification, Estimate]:
+        """Plan a specification, estimating its selectivity and cost."""
+        if isinstance(spec, AndSpecification):
+            return self._plan_composite(spec, _and_rank, conjunction=True)
+        if isinstance(spec, OrSpecification):
+            return self._plan_composite(spec, _or_rank, conjunction=False)
+        return spec, self._estimate_atomic(spec)
+
+    def _plan_composite(
+        self,
+        spec: AndSpecification | OrSpecification,
+        rank: Callable[[Estimate], float],
+        conjunction: bool,
+    ) -> tuple[Specification, Estimate]:
+        """Plan a composite specification, ordering its children."""
+        children = [self._plan(child) for child in spec.specs]
+        children.sort(key=lambda child: rank(child[1]))
+
+        # Each child is only evaluated on the objects the previous ones
+        # didn't settle, i.e. that satisfied a conjunction so far, or
+        # didn't satisfy a disjunction.
+        cost = 0.0
+        remaining = 1.0
+        for _, estimate in children:
+            cost += remaining * estimate.cost
+            if conjunction:
+                remaining *= estimate.selectivity
+            else:
+                remaining *= 1 - estimate.selectivity
+
+        selectivity = remaining if conjunction else 1 - remaining
+        planned = type(spec)(*(child for child, _ in children))
+        return planned, Estimate(selectivity=selectivity, cost=cost)
+
+    def _estimate_atomic(self, spec: Specification) -> Estimate:
+        """Estimate the selectivity and cost of an atomic specification."""
+        field = getattr(spec, "field", None)
+        field_statistics = self.statistics.fields.get(field)  # type: ignore
+        if field_statistics is None:
+            return Estimate(selectivity=DEFAULT_SELECTIVITY, cost=1.0)
+
+        if isinstance(spec, EqualsSpecification):
+            return Estimate(
+                selectivity=field_statistics.get_frequency(spec.value),
+                cost=1.0,
+            )
+
+        if isinstance(spec, InSpecification):
+            values = spec.value
+            cost = 1.0
+            if isinstance(values, Sized) and not isinstance(
+                values, (set, frozenset, dict)
+            ):
+                # Membership in other collections takes a linear search.
+                cost = float(max(len(values), 1))
+            selectivity = sum(
+                field_statistics.get_frequency(value) for value in values
+            )
+            return Estimate(selectivity=min(selectivity, 1.0), cost=cost)
+
+        if isinstance(spec, ContainsSpecification):
+            selectivity = field_statistics.get_containing_fraction(spec.value)
+            average_length = field_statistics.average_length or 0.0
+            return Estimate(
+                selectivity=(
+                    DEFAULT_SELECTIVITY if selectivity is None else selectivity
+                ),
+                cost=1.0 + average_length / CONTAINS_CHARS_PER_COMPARISON,
+            )
+
+        return Estimate(selectivity=DEFAULT_SELECTIVITY, cost=1.0)
+
+
+def _describe_values(values: Iterable[Any]) -> str:
+    """Describe the values of an in specification."""
+    if isinstance(values, Sized) and len(values) > 5:
+        return f"<{len(values)} values>"
+    if isinstance(values, (set, frozenset)):
+        values = sorted(values, key=repr)
+    return repr(list(values))
@@ -0,0 +1,111 @@
+"""Reloader."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Iterable
+
+from .metrics import DATASET_RELOADS
+from .repositories import CsvReadRepository
+from .shared import SharedDatasetStore
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class DatasetReloader:
+    """Dataset reloader.
+
+    Polls the size and modification time of dataset files in a background
+    thread. Once a file stops changing, its new version is loaded off the
+    request path and swapped in as the current generation; until then,
+    requests keep being served from the previous one. Given a shared
+    dataset store, the new version is published there as well, for other
+    processes to attach instead of loading it again.
+    """
+
+    def __init__(
+        self,
+        repositories: Iterable[CsvReadRepository],
+        interval: float = 2.0,
+        store: SharedDatasetStore | None = None,
+    ) -> None:
+        """Initialize reloader."""
+        self.repositories = list(repositories)
+        self.interval = interval
+        self.store = store
+        self._pending: dict[str, str] = {}
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start watching the datasets in a background thread."""
+        for repository in self.repositories:
+            repository.datasets.watch(repository.file_path)
+
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self.run, name="dataset-reloader", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop watching the datasets."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        for repository in self.repositories:
+            repository.datasets.unwatch(repository.file_path)
+
+    def run(self) -> None:
+        """Poll the datasets until stopped."""
+        while not self._stopped.wait(self.interval):
+            self.poll()
+
+    def poll(self) -> list[str]:
+        """Reload the datasets that changed, returning their file paths."""
+        reloaded = []
+        for repository in self.repositories:
+            file_path = repository.file_path
+            try:
+                if self._reload(repository):
+                    reloaded.append(file_path)
+            except Exception:
+                DATASET_RELOADS.inc(dataset=file_path, result="failed")
+                _LOGGER.exception("Reloading %s failed.", file_path)
+        return reloaded
+
+    def _reload(self, repository: CsvReadRepository) -> bool:
+        """Reload a dataset if its file changed and stopped changing."""
+        file_path = repository.file_path
+        version = repository.get_file_version()
+        dataset = repository.datasets.get(file_path)
+        if version is None or (
+            dataset is not None and dataset.version == version
+        ):
+            self._pending.pop(file_path, None)
+            return False
+
+        if self._pending.get(file_path) != version:
+            # The file may still be being written, wait for the next poll.
+            self._pending[file_path] = version
+            return False
+
+        del self._pending[file_path]
+        start = time.perf_counter()
+        dataset = repository.load()
+        if dataset is None:
+            DATASET_RELOADS.inc(dataset=file_path, result="changed")
+            return False
+
+        if self.store is not None:
+            repository.publish(self.store, dataset)
+
+        DATASET_RELOADS.inc(dataset=file_path, result="success")
+        _LOGGER.info(
+            "Reloaded %s in %.3fs.", file_path, time.perf_counter() - start
+        )
+        return True
@@ -4,19 +4,113 @@ from __future__ import annotations
 
 import abc
 import csv
-from typing import Generator, Generic, TypeVar
+import dataclasses
+import io
+import logging
+import os
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    IO,
+    Any,
+    Generator,
+    Generic,
+    Iterable,
+    Iterator,
+    Mapping,
+    Sequence,
+    TypeVar,
+)
 
+from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
-from django.core.files.storage import default_storage
 
-from .specifications import EqualsSpecification, Specification
+from .caches import LRUCache, SingleFlight
+from .compression import (
+    READ_BUFFER_SIZE,
+    decompress_head,
+    get_compression,
+    open_compressed_append,
+    open_decompressed,
+)
+from .datasets import Dataset, DatasetRegistry
+from .instrumentation import Timing, get_timing
+from .metrics import (
+    REPOSITORY_BYTES_READ,
+    REPOSITORY_ROWS_PARSED,
+    REPOSITORY_SCANS,
+    SPECIFICATION_EVALUATIONS,
+)
+from .partitions import Partition, PartitionManifest, is_manifest
+from .planner import SpecificationPlanner
+from .shared import SharedDatasetStore, get_shared_store
+from .specifications import (
+    CompositeSpecification,
+    EqualsSpecification,
+    InSpecification,
+    Specification,
+    is_unsatisfiable,
+)
+from .storages import get_dataset_storage, get_file_version
+from .zonemaps import ZoneMap, get_zone_map_path
 
 T = TypeVar("T")
 
+_LOGGER = logging.getLogger(__name__)
+
+
+def _build_index(
+    items: Iterable[Any], field: str, pk_field: str
+) -> dict[Any, list[int]]:
+    """Build an inverted index of the primary keys of items by a field."""
+    index: dict[Any, list[int]] = {}
+    _add_to_index(index, items, field, pk_field)
+    return index
+
+
+def _add_to_index(
+    index: dict[Any, list[int]],
+    items: Iterable[Any],
+    field: str,
+    pk_field: str,
+) -> None:
+    """Add the primary keys of items to an inverted index by a field."""
+    for item in items:
+        value = getattr(item, field)
+        try:
+            index[value].append(getattr(item, pk_field))
+        except KeyError:
+            index[value] = [getattr(item, pk_field)]
+
+
+def _extend_index(
+    index: Mapping[Any, list[int]],
+    items: Iterable[Any],
+    field: str,
+    pk_field: str,
+) -> dict[Any, list[int]]:
+    """Get a copy of an inverted index with the primary keys of items added.
+
+    Only the lists of the values added to are copied, the index given is
+    left as is.
+    """
+    new_index = dict(index)
+    copied = set()
+    for item in items:
+        value = getattr(item, field)
+        if value not in copied:
+            new_index[value] = list(index.get(value, ()))
+            copied.add(value)
+        new_index[value].append(getattr(item, pk_field))
+    return new_index
+
 
 class ReadRepository(abc.ABC, Generic[T]):
     """Read repository."""
 
+    pk_field: str = "id"
+
     @classmethod
     @abc.abstractmethod
     def using(cls, **_) -> ReadRepository:
@@ -34,6 +128,39 @@ class ReadRepository(abc.ABC, Generic[T]):
     def get_dict(self, spec: Specification | None = None) -> dict[int, T]:
         """Get dict of items with their primary keys as indices."""
 
+    def get_many(self, pks: Sequence[int]) -> list[T]:
+        """Get items by primary keys, in the order of the keys."""
+        return [self.get_by_id(pk) for pk in pks]
+
+    def get_pk(self, item: T) -> int:
+        """Get the primary key of an item."""
+        return getattr(item, self.pk_field)
+
+    def get_index(self, field: str) -> Mapping[Any, Sequence[int]]:
+        """Get an inverted index of primary keys by the values of a field."""
+        return _build_index(self.get_all(), field, self.pk_field)
+
+    def get_by_index(self, field: str, value: Any) -> list[T]:
+        """Get the items with a field value, looked up in its index."""
+        return self.get_many(self.get_index(field).get(value, ()))
+
+    def get_many_by_values(
+        self, field: str, values: Iterable[Any]
+    ) -> list[T] | None:
+        """Get the items with any of the values of a field, if in memory.
+
+        Returns None if the items would have to be read to find them.
+        """
+        return None
+
+    def get_version(self) -> str | None:
+        """Get dataset version, or None if the dataset isn't versioned."""
+        return None
+
+    def get_count_estimate(self) -> int | None:
+        """Get an estimate of the number of items, or None if unknown."""
+        return None
+
 
 class IterableReadRepository(ReadRepository[T]):
     """Iterable read repository."""
@@ -58,6 +185,24 @@ class IterableReadRepository(ReadRepository[T]):
         """Get list of items."""
         return list(self.iter_items(spec))
 
+    def get_many(self, pks: Sequence[int]) -> list[T]:
+        """Get items by primary keys, in the order of the keys.
+
+        Items are read in a single pass, which stops as soon as every key
+        is found.
+        """
+        if not pks:
+            return []
+
+        pk_set = frozenset(pks)
+        item_dict: dict[int, T] = {}
+        for item in self.iter_items(InSpecification(self.pk_field, pk_set)):
+            item_dict[getattr(item, self.pk_field)] = item
+            if len(item_dict) == len(pk_set):
+                break
+
+        return [item_dict[pk] for pk in pks if pk in item_dict]
+
     def get_dict(self, spec: Specification | None = None) -> dict[int, T]:
         """Get dict of items with their primary keys as indices."""
         return {
@@ -67,9 +212,41 @@ class IterableReadRepository(ReadRepository[T]):
 
 
 class CsvReadRepository(IterableReadRepository[T]):
-    """CSV read repository."""
+    """CSV read repository.
+
+    Reads items from the CSV file on every call, unless the current version
+    of the file was loaded in memory beforehand. Files compressed with gzip,
+    bzip2 or xz, by their extension, are decompressed as they're read.
+
+    File paths of partition manifests, by their .json extension, point at
+    datasets split into partition files. Partitions whose key ranges rule
+    out a specification are skipped without being read, and the others are
+    scanned in parallel. Partitions are replaced by writing a new manifest,
+    whose version is the version of the dataset.
+
+    Blocks of uncompressed files whose zone map rules out a specification
+    are skipped the same way, while the zone map matches the file version.
+    """
 
     pk_field: str = "id"
+    datasets = DatasetRegistry()
+    loads: SingleFlight[tuple[str, str], Dataset | None] = SingleFlight(
+        "dataset_loads"
+    )
+    indexes: LRUCache[tuple[str, str, str], Mapping[Any, Sequence[int]]] = (
+        LRUCache("dataset_indexes", max_size=16)
+    )
+    count_estimate_sample_size = 64 * 1024
+    read_buffer_size = READ_BUFFER_SIZE
+    manifests: LRUCache[tuple[str, str], PartitionManifest] = LRUCache(
+        "partition_manifests", max_size=16
+    )
+    partition_scan_workers = 4
+    partition_scan_chunk_size = 1024
+    partition_scan_queue_size = 4
+    zone_maps: LRUCache[tuple[str, str, str | None], ZoneMap | None] = (
+        LRUCache("zone_maps", max_size=16)
+    )
 
     def __init__(self, file_path: str) -> None:
         """Initialize repository."""
@@ -80,6 +257,70 @@ class CsvReadRepository(IterableReadRepository[T]):
         """Return file path."""
         return self._file_path
 
+    @property
+    def compression(self) -> str | None:
+        """Return the compression of the file, if compressed."""
+        return get_compression(self.file_path)
+
+    @property
+    def is_partitioned(self) -> bool:
+        """Return whether the file is a partition manifest."""
+        return is_manifest(self.file_path)
+
+    def get_manifest(self) -> PartitionManifest:
+        """Get the partition manifest, read once per version."""
+        version = self.get_file_version()
+        if version is None:
+            return self._read_manifest()
+        return self.manifests.get_or_set(
+            (self.file_path, version), self._read_manifest
+        )
+
+    def _read_manifest(self) -> PartitionManifest:
+        """Read the partition manifest."""
+        with get_dataset_storage().open(self.file_path, mode="rb") as file:
+            return PartitionManifest.read(file, self.file_path)
+
+    def get_partitions(
+        self, spec: Specification | None = None
+    ) -> list[Partition]:
+        """Get the partitions whose rows may satisfy a specification."""
+        return self.get_manifest().prune(spec)
+
+    def get_zone_map(self, file_path: str | None = None) -> ZoneMap | None:
+        """Get the zone map of the current version of a file, if any.
+
+        Zone maps of other versions of the file are ignored, as are those
+        of compressed files, which can't be read from block offsets.
+        """
+        file_path = file_path or self.file_path
+        if get_compression(file_path) is not None:
+            return None
+
+        storage = get_dataset_storage()
+        version = get_file_version(storage, file_path)
+        if version is None:
+            return None
+
+        zone_map_path = get_zone_map_path(file_path)
+        zone_map_version = get_file_version(storage, zone_map_path)
+        zone_map = self.zone_maps.get_or_set(
+            (file_path, version, zone_map_version),
+            lambda: self._read_zone_map(zone_map_path, zone_map_version),
+        )
+        if zone_map is None or zone_map.version != version:
+            return None
+        return zone_map
+
+    def _read_zone_map(
+        self, zone_map_path: str, zone_map_version: str | None
+    ) -> ZoneMap | None:
+        """Read a zone map, if the file exists."""
+        if zone_map_version is None:
+            return None
+        with get_dataset_storage().open(zone_map_path, mode="rb") as file:
+            return ZoneMap.read(file, zone_map_path)
+
     @classmethod
     def using(cls, file_path: str | None = None, **_) -> ReadRepository:
         """Build repository from config params."""
@@ -87,21 +328,687 @@ class CsvReadRepository(IterableReadRepository[T]):
             raise ValueError("No file path provided.")
         return cls(file_path)
 
+    def get_version(self) -> str | None:
+        """Get the version of the dataset served.
+
+        That's the version of the generation loaded in memory when a
+        reloader keeps it up to date, or else the version of the file.
+        """
+        if self.datasets.is_watched(self.file_path):
+            dataset = self.datasets.get(self.file_path)
+            if dataset is not None:
+                return dataset.version
+        return self.get_file_version()
+
+    def get_count_estimate(self) -> int | None:
+        """Get an estimate of the number of items.
+
+        That's the number of items loaded in memory, if any, or else the
+        file size divided by the average size of the rows of its head. The
+        rows of compressed files are counted in the decompressed head, and
+        their size is the compressed one.
+        """
+        dataset = self.datasets.get(self.file_path)
+        if dataset is not None:
+            return len(dataset.items)
+        if self.is_partitioned:
+            try:
+                return self.get_manifest().rows
+            except (NotImplementedError, OSError):
+                return None
+
+        zone_map = self.get_zone_map()
+        if zone_map is not None:
+            return zone_map.rows
+
+        storage = get_dataset_storage()
+        try:
+            size = storage.size(self.file_path)
+            with storage.open(self.file_path, mode="rb") as file:
+                head = file.read(self.count_estimate_sample_size)
+        except (NotImplementedError, OSError):
+            return None
+
+        content = decompress_head(head, self.compression)
+        lines = content.count(b"\n")
+        if len(head) < self.count_estimate_sample_size:
+            rows = lines + bool(content and not content.endswith(b"\n"))
+        elif not lines:
+            return None
+        else:
+            rows = size * lines // len(head)
+        return max(rows - 1, 0)
+
+    def get_file_version(self) -> str | None:
+        """Get file version from the file size and modification time."""
+        return get_file_version(get_dataset_storage(), self.file_path)
+
+    def load(self) -> Dataset[T] | None:
+        """Load the current version of the file in memory.
+
+        The dataset is attached from the shared dataset store when it was
+        published there, and swapped in as the current generation. Returns
+        None, without swapping anything, if the file isn't versioned or if
+        it changed while being loaded.
+        """
+        version = self.get_file_version()
+        if version is None:
+            return None
+        return self._load(version)
+
+    def _load(self, version: str) -> Dataset[T] | None:
+        """Load a version of the file, once for all concurrent callers."""
+        dataset = self.datasets.get(self.file_path)
+        if dataset is not None and dataset.version == version:
+            return dataset
+
+        return self.loads.do(
+            (self.file_path, version), lambda: self._load_version(version)
+        )
+
+    def _load_version(self, version: str) -> Dataset[T] | None:
+        """Load a version of the file."""
+        dataset = self.datasets.get(self.file_path)
+        if dataset is not None and dataset.version == version:
+            return dataset
+
+        dataset = self._attach_dataset(version)
+        if dataset is not None:
+            return dataset
+
+        dataset = self._build_dataset(version)
+        if self.get_file_version() != version:
+            return None
+
+        self._collect_statistics(dataset)
+        self.datasets.swap(self.file_path, dataset)
+        return dataset
+
+    def publish(
+        self, store: SharedDatasetStore, dataset: Dataset[T] | None = None
+    ) -> bool:
+        """Publish a dataset of the file in a shared store.
+
+        Publishes the current version of the file, unless given a dataset
+        already loaded. Returns whether the dataset was published, i.e.
+        whether it is versioned and that version wasn't published yet.
+        """
+        if dataset is None:
+            version = self.get_file_version()
+            if version is None or store.get(self.file_path, version):
+                return False
+            dataset = self._build_dataset(version)
+        return store.publish(self.file_path, dataset, self.pk_field)
+
+    def get_dataset(self) -> Dataset[T] | None:
+        """Get the generation of the dataset served, if loaded in memory.
+
+        Unless a reloader keeps the dataset up to date, a generation is
+        only served while it matches the version of the file. Missing or
+        stale datasets are loaded on demand, if enabled.
+        """
+        dataset = self.datasets.get(self.file_path)
+        if dataset is not None and self.datasets.is_watched(self.file_path):
+            return dataset
+
+        version = self.get_file_version()
+        if version is None:
+            return None
+        if dataset is not None and dataset.version == version:
+            return dataset
+        if getattr(settings, "DATASET_LOAD_ON_DEMAND", False):
+            return self._load(version)
+        return self._attach_dataset(version)
+
+    def _attach_dataset(self, version: str) -> Dataset[T] | None:
+        """Attach a version of the dataset from the shared store, if any."""
+        store = get_shared_store()
+        if store is None:
+            return None
+
+        dataset = store.get(self.file_path, version)
+        if dataset is not None:
+            self._collect_statistics(dataset)
+            self.datasets.swap(self.file_path, dataset)
+        return dataset
+
+    def _collect_statistics(self, dataset: Dataset[T]) -> None:
+        """Collect the statistics of a dataset as it's loaded."""
+        statistics = dataset.statistics
+        _LOGGER.debug(
+            "Collected statistics of %s: %d rows, %s",
+            self.file_path,
+            statistics.rows,
+            ", ".join(
+                f"{field}={field_statistics.distinct} distinct"
+                for field, field_statistics in statistics.fields.items()
+            ),
+        )
+
+    def _build_dataset(self, version: str) -> Dataset[T]:
+        """Build a dataset from the CSV file."""
+        items = tuple(self._iter_items())
+        index = {getattr(item, self.pk_field): item for item in items}
+        return Dataset(version=version, items=items, index=index)
+
     @abc.abstractmethod
     def build_item(self, data: dict) -> T:
         """Build item from dict."""
 
+    def get_by_id(self, pk: int) -> T:
+        """Get item by primary key."""
+        dataset = self.get_dataset()
+        if dataset is None:
+            return super().get_by_id(pk)
+
+        try:
+            return dataset.index[pk]
+        except KeyError as err:
+            raise ObjectDoesNotExist() from err
+
+    def get_many(self, pks: Sequence[int]) -> list[T]:
+        """Get items by primary keys, in the order of the keys."""
+        dataset = self.get_dataset()
+        if dataset is None:
+            return super().get_many(pks)
+
+        index = dataset.index
+        return [index[pk] for pk in pks if pk in index]
+
+    def get_many_by_values(
+        self, field: str, values: Iterable[Any]
+    ) -> list[T] | None:
+        """Get the items with any of the values of a field, if in memory.
+
+        Items are looked up in an index of positions of the dataset loaded
+        in memory, and returned in the order of the file. Returns None if
+        the dataset isn't loaded.
+        """
+        dataset = self.get_dataset()
+        if dataset is None:
+            return None
+
+        positions = dataset.get_positions(field)
+        items = dataset.items
+        return [
+            items[position]
+            for position in sorted(
+                position
+                for value in values
+                for position in positions.get(value, ())
+            )
+        ]
+
+    def get_index(self, field: str) -> Mapping[Any, Sequence[int]]:
+        """Get an inverted index of primary keys by the values of a field.
+
+        Indexes are built once per dataset version, with a single scan.
+        """
+        version = self.get_version()
+        if version is None:
+            return super().get_index(field)
+
+        return self.indexes.get_or_set(
+            (self.file_path, version, field),
+            lambda: _build_index(self.iter_items(), field, self.pk_field),
+        )
+
+    def get_dict(self, spec: Specification | None = None) -> dict[int, T]:
+        """Get dict of items with their primary keys as indices."""
+        if spec is None:
+            dataset = self.get_dataset()
+            if dataset is not None:
+                return dict(dataset.index)
+        return super().get_dict(spec)
+
     def iter_items(
         self, spec: Specification | None = None
     ) -> Generator[T, None, None]:
         """Generate items, optionally filtered by a specification."""
-        with default_storage.open(self.file_path, mode="r") as file:
-            reader = csv.DictReader(file)
+        timing = get_timing()
+        if spec is not None and is_unsatisfiable(spec):
+            return (item for item in ())
+
+        dataset = self.get_dataset()
+        if dataset is not None:
+            items = self._iter_dataset_items(dataset, spec)
+        else:
+            items = self._iter_items(spec, timing)
+
+        if timing is None:
+            return items
+        return timing.measure("read", items, "rows_matched")
+
+    def _iter_dataset_items(
+        self, dataset: Dataset[T], spec: Specification | None = None
+    ) -> Generator[T, None, None]:
+        """Generate items from the dataset loaded in memory."""
+        if not spec:
+            yield from dataset.items
+            return
+
+        spec = self._plan_specification(dataset, spec)
+        evaluations = 0
+        try:
+            for evaluations, item in enumerate(dataset.items, 1):
+                if spec.is_satisfied_by(item):
+                    yield item
+        finally:
+            SPECIFICATION_EVALUATIONS.inc(evaluations, dataset=self.file_path)
+
+    def _plan_specification(
+        self, dataset: Dataset[T], spec: Specification
+    ) -> Specification:
+        """Order the evaluation of a specification from dataset statistics."""
+        if not isinstance(spec, CompositeSpecification):
+            return spec
 
-            for item_data in reader:
+        planner = SpecificationPlanner(dataset.statistics)
+        planned_spec = planner.plan(spec)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "Specification plan for %s: %s",
+                self.file_path,
+                planner.explain(planned_spec),
+            )
+        return planned_spec
+
+    def _iter_items(
+        self, spec: Specification | None = None, timing: Timing | None = None
+    ) -> Iterator[T]:
+        """Generate items from the CSV file, or from its partitions."""
+        if self.is_partitioned:
+            return self._iter_partition_items(spec, timing)
+        return self._iter_file_items(self.file_path, spec, timing)
+
+    def _iter_partition_items(
+        self, spec: Specification | None = None, timing: Timing | None = None
+    ) -> Generator[T, None, None]:
+        """Generate items from the partitions a specification may match.
+
+        Partitions are scanned in parallel, a few at a time, and their
+        items generated in manifest order. Scans hand their items over in
+        chunks through bounded queues, so at most partition_scan_queue_size
+        chunks of each partition being scanned are held in memory.
+        """
+        partitions = self.get_partitions(spec)
+        if len(partitions) <= 1 or self.partition_scan_workers <= 1:
+            for partition in partitions:
+                yield from self._iter_file_items(
+                    partition.file_path, spec, timing
+                )
+            return
+
+        stopped = threading.Event()
+        with ThreadPoolExecutor(
+            max_workers=self.partition_scan_workers,
+            thread_name_prefix="partition-scan",
+        ) as executor:
+            scans: list[tuple[Future[Timing], queue.Queue[list[T] | None]]]
+            scans = []
+            try:
+                for partition in partitions:
+                    chunks: queue.Queue[list[T] | None] = queue.Queue(
+                        maxsize=self.partition_scan_queue_size
+                    )
+                    future = executor.submit(
+                        self._scan_partition, partition, spec, chunks, stopped
+                    )
+                    scans.append((future, chunks))
+                    if len(scans) < self.partition_scan_workers:
+                        continue
+                    yield from self._iter_partition_chunks(*scans[0], timing)
+                    scans.pop(0)
+
+                while scans:
+                    yield from self._iter_partition_chunks(*scans[0], timing)
+                    scans.pop(0)
+            finally:
+                # Scans not started yet are dropped if generation stops, and
+                # running ones stop once a slot of their queue is freed.
+                stopped.set()
+                for future, chunks in scans:
+                    future.cancel()
+                    _drain(chunks)
+
+    def _scan_partition(
+        self,
+        partition: Partition,
+        spec: Specification | None,
+        chunks: queue.Queue[list[T] | None],
+        stopped: threading.Event,
+    ) -> Timing:
+        """Scan a partition into chunks, with its own timing counters.
+
+        The end of the scan is marked by None, also if it fails.
+        """
+        timing = Timing()
+        items = self._iter_file_items(partition.file_path, spec, timing)
+        try:
+            chunk: list[T] = []
+            for item in items:
+                chunk.append(item)
+                if len(chunk) < self.partition_scan_chunk_size:
+                    continue
+                if stopped.is_set():
+                    return timing
+                chunks.put(chunk)
+                chunk = []
+
+            if chunk and not stopped.is_set():
+                chunks.put(chunk)
+        finally:
+            items.close()
+            if not stopped.is_set():
+                chunks.put(None)
+        return timing
+
+    def _iter_partition_chunks(
+        self,
+        future: Future[Timing],
+        chunks: queue.Queue[list[T] | None],
+        timing: Timing | None,
+    ) -> Generator[T, None, None]:
+        """Generate the items of a partition scan, adding up its counters."""
+        while (chunk := chunks.get()) is not None:
+            yield from chunk
+
+        partition_timing = future.result()
+        if timing is not None:
+            for name, value in partition_timing.counters.items():
+                timing.increment(name, value)
+
+    def _iter_file_items(
+        self,
+        file_path: str,
+        spec: Specification | None = None,
+        timing: Timing | None = None,
+    ) -> Generator[T, None, None]:
+        """Generate items from a CSV file.
+
+        Only the blocks a specification may match are read if the file has
+        a zone map of its current version.
+        """
+        zone_map = self.get_zone_map(file_path) if spec else None
+        if zone_map is not None:
+            yield from self._iter_block_items(
+                file_path, zone_map, spec, timing
+            )
+            return
+
+        rows = 0
+        file = get_dataset_storage().open(file_path, mode="rb")
+        try:
+            stream = open_decompressed(
+                file, get_compression(file_path), self.read_buffer_size
+            )
+            text_file = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+            reader = csv.DictReader(text_file)
+
+            for rows, item_data in enumerate(reader, 1):
                 item = self.build_item(item_data)
 
                 if spec and not spec.is_satisfied_by(item):
                     continue
 
                 yield item
+        finally:
+            bytes_read = file.tell()
+            file.close()
+            self._record_scan(rows, bytes_read, spec, timing)
+
+    def _iter_block_items(
+        self,
+        file_path: str,
+        zone_map: ZoneMap,
+        spec: Specification | None,
+        timing: Timing | None,
+    ) -> Generator[T, None, None]:
+        """Generate items from the blocks of a CSV file a spec may match."""
+        blocks = zone_map.prune(spec)
+        _LOGGER.debug(
+            "Zone map of %s: reading %d of %d blocks.",
+            file_path,
+            len(blocks),
+            len(zone_map.blocks),
+        )
+        rows = 0
+        bytes_read = 0
+        file = get_dataset_storage().open(file_path, mode="rb")
+        try:
+            for block in blocks:
+                if file.tell() != block.offset:
+                    file.seek(block.offset)
+                data = file.read(block.length)
+                bytes_read += len(data)
+                text_file = io.StringIO(data.decode("utf-8"), newline="")
+                reader = csv.DictReader(text_file, fieldnames=zone_map.fields)
+
+                for item_data in reader:
+                    rows += 1
+                    item = self.build_item(item_data)
+
+                    if spec and not spec.is_satisfied_by(item):
+                        continue
+
+                    yield item
+        finally:
+            file.close()
+            self._record_scan(rows, bytes_read, spec, timing)
+
+    def _record_scan(
+        self,
+        rows: int,
+        bytes_read: int,
+        spec: Specification | None,
+        timing: Timing | None,
+    ) -> None:
+        """Record scan metrics."""
+        REPOSITORY_SCANS.inc(dataset=self.file_path)
+        REPOSITORY_ROWS_PARSED.inc(rows, dataset=self.file_path)
+        REPOSITORY_BYTES_READ.inc(bytes_read, dataset=self.file_path)
+        if spec:
+            SPECIFICATION_EVALUATIONS.inc(rows, dataset=self.file_path)
+
+        if timing is not None:
+            timing.increment("rows_read", rows)
+            timing.increment("objects_built", rows)
+
+
+class WriteRepository(abc.ABC, Generic[T]):
+    """Write repository."""
+
+    @abc.abstractmethod
+    def append_many(self, items: Iterable[T]) -> int:
+        """Append items, returning the number of items appended."""
+
+    def append(self, item: T) -> None:
+        """Append an item."""
+        self.append_many([item])
+
+
+class CsvRepository(CsvReadRepository[T], WriteRepository[T]):
+    """CSV repository.
+
+    Appends items to the end of the CSV file, which must be in a local
+    file system storage. Rows are written in large chunks, and synced to
+    disk once per batch. The dataset loaded in memory and the indexes of
+    the previous version of the file are carried over to the new one, with
+    the appended items, instead of being rebuilt.
+    """
+
+    write_locks: dict[str, threading.RLock] = {}
+    write_locks_lock = threading.Lock()
+    write_buffer_size = 1024 * 1024
+
+    @abc.abstractmethod
+    def serialize_item(self, item: T) -> dict[str, Any]:
+        """Serialize item to dict."""
+
+    def get_write_lock(self) -> threading.RLock:
+        """Get the lock of the writes to the file."""
+        with self.write_locks_lock:
+            try:
+                return self.write_locks[self.file_path]
+            except KeyError:
+                lock = self.write_locks[self.file_path] = threading.RLock()
+                return lock
+
+    def append_many(self, items: Iterable[T]) -> int:
+        """Append items, returning the number of items appended.
+
+        Raises NotImplementedError if the storage isn't a local file system
+        and ValueError if the dataset is partitioned.
+        """
+        if self.is_partitioned:
+            raise ValueError("Partitioned datasets can't be appended to.")
+
+        path = get_dataset_storage().path(self.file_path)
+        with self.get_write_lock():
+            version = self.get_file_version()
+            dataset = self.datasets.get(self.file_path)
+            if dataset is not None and dataset.version != version:
+                dataset = None
+
+            appended = self._write_items(path, items)
+            if not appended:
+                return 0
+
+            new_version = self.get_file_version()
+            if version is not None and new_version is not None:
+                self._carry_over(dataset, version, new_version, appended)
+        return len(appended)
+
+    def _write_items(self, path: str, items: Iterable[T]) -> list[T]:
+        """Write items to the end of the file, returning them."""
+        fieldnames = self._read_fieldnames(path)
+        compression = get_compression(path)
+        appended: list[T] = []
+        with open(path, "ab") as file:
+            stream = open_compressed_append(file, compression)
+            try:
+                buffer = io.StringIO()
+                if fieldnames is not None and not _ends_with_newline(
+                    file, compression
+                ):
+                    buffer.write("\n")
+                writer = csv.writer(buffer, lineterminator="\n")
+                for item in items:
+                    data = self.serialize_item(item)
+                    if fieldnames is None:
+                        fieldnames = list(data)
+                        writer.writerow(fieldnames)
+                    writer.writerow([data[name] for name in fieldnames])
+                    appended.append(item)
+
+                    if buffer.tell() >= self.write_buffer_size:
+                        stream.write(buffer.getvalue().encode("utf-8"))
+                        buffer.seek(0)
+                        buffer.truncate()
+
+                stream.write(buffer.getvalue().encode("utf-8"))
+            finally:
+                stream.close()
+
+            file.flush()
+            os.fsync(file.fileno())
+        return appended
+
+    def _read_fieldnames(self, path: str) -> list[str] | None:
+        """Read the header of the file, if it isn't empty."""
+        try:
+            file = open(path, "rb")
+        except FileNotFoundError:
+            return None
+
+        with file:
+            stream = open_decompressed(file, get_compression(path))
+            text_file = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+            return next(csv.reader(text_file), None)
+
+    def _carry_over(
+        self,
+        dataset: Dataset[T] | None,
+        version: str,
+        new_version: str,
+        appended: list[T],
+    ) -> None:
+        """Carry the dataset and indexes over to the new version."""
+        if dataset is not None:
+            index = dict(dataset.index)
+            for item in appended:
+                index[getattr(item, self.pk_field)] = item
+            self.datasets.swap(
+                self.file_path,
+                Dataset(
+                    version=new_version,
+                    items=(*dataset.items, *appended),
+                    index=index,
+                ),
+            )
+
+        # Indexes are copied on write, as readers of the previous version
+        # may still be using them.
+        for field in dataclasses.fields(appended[0]):  # type: ignore
+            key = (self.file_path, version, field.name)
+            field_index = self.indexes.pop(key)
+            if field_index is None:
+                continue
+
+            self.indexes.set(
+                (self.file_path, new_version, field.name),
+                _extend_index(
+                    field_index, appended, field.name, self.pk_field
+                ),
+            )
+
+
+def _drain(items: queue.Queue) -> None:
+    """Remove all items from a queue without waiting."""
+    while True:
+        try:
+            items.get_nowait()
+        except queue.Empty:
+            return
+
+
+def _ends_with_newline(file: IO[bytes], compression: str | None) -> bool:
+    """Check if a file open to append ends with a line break.
+
+    The end of compressed files isn't known without decompressing them
+    whole, so they're assumed not to, as readers skip blank lines.
+    """
+    if compression is not None:
+        return False
+    if not file.tell():
+        return True
+    with open(file.name, "rb") as read_file:
+        read_file.seek(-1, os.SEEK_END)
+        return read_file.read(1) in b"\r\n"
+
+
+class ResultList(Sequence[T]):
+    """Result list.
+
+    Sequence of the items matching a query, holding only their primary
+    keys and reading the items from the repository when sliced.
+    """
+
+    def __init__(self, repository: ReadRepository[T], pks: Sequence[int]):
+        """Initialize result list."""
+        self.repository = repository
+        self.pks = pks
+
+    def __len__(self) -> int:
+        """Return the number of items."""
+        return len(self.pks)
+
+    def __iter__(self) -> Iterator[T]:
+        """Iterate items, reading them in a single pass."""
+        return iter(self.repository.get_many(self.pks))
+
+    def __getitem__(self, index: Any) -> Any:
+        """Get an item or a list of items."""
+        if isinstance(index, slice):
+            return self.repository.get_many(self.pks[index])
+        return self.repository.get_by_id(self.pks[index])
@@ -0,0 +1,211 @@
+"""Serializers."""
+
+from __future__ import annotations
+
+import csv
+import dataclasses
+import functools
+import io
+import json
+import operator
+import types
+import typing
+from enum import Enum
+from json.encoder import encode_basestring_ascii
+from typing import Any, Callable, Generator, Iterable, TypeVar
+
+S = TypeVar("S", bound="Serializer")
+
+Encoder = Callable[[Any], str]
+
+
+def _encode_int(value: Any) -> str:
+    """Encode an integer, including integer enums."""
+    return int.__repr__(value)
+
+
+def _encode_float(value: Any) -> str:
+    """Encode a float."""
+    return json.dumps(value)
+
+
+def _encode_bool(value: Any) -> str:
+    """Encode a boolean."""
+    return "true" if value else "false"
+
+
+def _encode_optional(encoder: Encoder) -> Encoder:
+    """Wrap an encoder to support null values."""
+
+    def encode(value: Any) -> str:
+        if value is None:
+            return "null"
+        return encoder(value)
+
+    return encode
+
+
+def _get_encoder(field_type: Any) -> Encoder:
+    """Get the encoder of a field type."""
+    if isinstance(field_type, types.UnionType) or (
+        typing.get_origin(field_type) is typing.Union
+    ):
+        args = [arg for arg in field_type.__args__ if arg is not type(None)]
+        if len(args) == 1:
+            return _encode_optional(_get_encoder(args[0]))
+        return json.dumps
+
+    if isinstance(field_type, type):
+        if issubclass(field_type, bool):
+            return _encode_optional(_encode_bool)
+        if issubclass(field_type, int):
+            return _encode_optional(_encode_int)
+        if issubclass(field_type, float):
+            return _encode_optional(_encode_float)
+        if issubclass(field_type, str):
+            return _encode_optional(encode_basestring_ascii)
+
+    return json.dumps
+
+
+class Serializer:
+    """Serializer.
+
+    Base class for serializers that read the fields of objects straight
+    from their attributes.
+    """
+
+    def __init__(self, fields: dict[str, Any]) -> None:
+        """Initialize serializer from a field name to field type mapping."""
+        if not fields:
+            raise ValueError("No fields provided.")
+        self.fields = tuple(fields)
+        self.field_types = tuple(fields.values())
+        self._getter = operator.attrgetter(*self.fields)
+
+    @classmethod
+    @functools.cache
+    def for_dataclass(cls: type[S], model: type) -> S:
+        """Build serializer for a dataclass."""
+        type_hints = typing.get_type_hints(model)
+        return cls(
+            {
+                field.name: type_hints[field.name]
+                for field in dataclasses.fields(model)
+            }
+        )
+
+    def get_values(self, obj: Any) -> tuple[Any, ...]:
+        """Get the field values of an object."""
+        values = self._getter(obj)
+        if len(self.fields) == 1:
+            return (values,)
+        return values
+
+
+class JsonSerializer(Serializer):
+    """JSON serializer.
+
+    Serializes objects to JSON using one encoder per field chosen from the
+    field type, without building an intermediate dict per object.
+    """
+
+    def __init__(self, fields: dict[str, Any]) -> None:
+        """Initialize serializer from a field name to field type mapping."""
+        super().__init__(fields)
+        self._template = (
+            "{"
+            + ",".join(
+                f"{encode_basestring_ascii(name)}:%s" for name in self.fields
+            )
+            + "}"
+        )
+        self._encoders = tuple(
+            _get_encoder(field_type) for field_type in self.field_types
+        )
+
+    def serialize(self, obj: Any) -> str:
+        """Serialize an object."""
+        return self._template % tuple(
+            encode(value)
+            for encode, value in zip(self._encoders, self.get_values(obj))
+        )
+
+    def iter_chunks(
+        self, objs: Iterable[Any], chunk_size: int = 500
+    ) -> Generator[str, None, None]:
+        """Generate a JSON array of objects in chunks."""
+        serialize = self.serialize
+        chunk: list[str] = []
+        separator = "["
+        for obj in objs:
+            chunk.append(separator)
+            chunk.append(serialize(obj))
+            separator = ","
+            if len(chunk) >= chunk_size * 2:
+                yield "".join(chunk)
+                chunk = []
+
+        if separator == "[":
+            chunk.append("[")
+        chunk.append("]")
+        yield "".join(chunk)
+
+    def iter_lines(
+        self, objs: Iterable[Any], chunk_size: int = 500
+    ) -> Generator[str, None, None]:
+        """Generate newline-delimited JSON objects in chunks."""
+        serialize = self.serialize
+        chunk: list[str] = []
+        for obj in objs:
+            chunk.append(serialize(obj))
+            if len(chunk) >= chunk_size:
+                yield "\n".join(chunk) + "\n"
+                chunk = []
+
+        if chunk:
+            yield "\n".join(chunk) + "\n"
+
+
+class CsvSerializer(Serializer):
+    """CSV serializer."""
+
+    def __init__(self, fields: dict[str, Any]) -> None:
+        """Initialize serializer from a field name to field type mapping."""
+        super().__init__(fields)
+        self._enum_indexes = tuple(
+            index
+            for index, field_type in enumerate(self.field_types)
+            if isinstance(field_type, type) and issubclass(field_type, Enum)
+        )
+
+    def serialize_row(self, obj: Any) -> tuple[Any, ...] | list[Any]:
+        """Serialize an object to a CSV row."""
+        values = self.get_values(obj)
+        if not self._enum_indexes:
+            return values
+
+        row = list(values)
+        for index in self._enum_indexes:
+            row[index] = row[index].value
+        return row
+
+    def iter_chunks(
+        self, objs: Iterable[Any], chunk_size: int = 500
+    ) -> Generator[str, None, None]:
+        """Generate a CSV document, header included, in chunks."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(self.fields)
+        serialize_row = self.serialize_row
+        rows = 0
+        for obj in objs:
+            writer.writerow(serialize_row(obj))
+            rows += 1
+            if rows >= chunk_size:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+                rows = 0
+
+        yield buffer.getvalue()
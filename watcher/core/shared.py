@@ -0,0 +1,445 @@
+"""Shared datasets.
+
+Datasets are published once in shared memory, by a parent process, and
+attached read-only by worker processes, so they take the same memory
+however many workers there are. Each dataset is stored column by column
+in its own segment, and items are rebuilt from the columns as they are
+read. A manifest segment maps dataset names to the segment holding their
+current version.
+"""
+
+from __future__ import annotations
+
+import bisect
+import dataclasses
+import functools
+import json
+import secrets
+import struct
+import time
+import typing
+from array import array
+from enum import Enum
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Callable, Iterator, Mapping, Sequence, TypeVar
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from .datasets import Dataset
+
+T = TypeVar("T")
+
+_WORD = struct.calcsize("q")
+_MANIFEST_HEADER = struct.Struct("qq")
+_MANIFEST_PAYLOAD = _MANIFEST_HEADER.size
+_MANIFEST_SIZE = 1 << 16
+
+_INT = "int"
+_STR = "str"
+
+
+def _pad(size: int) -> int:
+    """Round a size up to a multiple of the word size."""
+    return -(-size // _WORD) * _WORD
+
+
+def _untrack(segment: shared_memory.SharedMemory) -> None:
+    """Stop the resource tracker from unlinking a segment at exit.
+
+    Segments outlive the processes creating or attaching them, and are
+    unlinked explicitly by the store instead.
+    """
+    resource_tracker.unregister(segment._name, "shared_memory")  # type: ignore
+
+
+def _get_field_kind(field_type: Any) -> str:
+    """Get the column kind of a field type."""
+    if isinstance(field_type, type):
+        if issubclass(field_type, (int, Enum)):
+            return _INT
+        if issubclass(field_type, str):
+            return _STR
+    raise TypeError(f"Unsupported shared field type: {field_type!r}")
+
+
+class _SharedMemory(shared_memory.SharedMemory):
+    """Shared memory closed by its owner only.
+
+    The base class closes itself when collected, which fails while views
+    of its buffer are alive, e.g. at interpreter exit.
+    """
+
+    def __del__(self) -> None:
+        """Leave closing to the owner."""
+
+
+class _Segment:
+    """Segment attached read-only, with the columns of a dataset."""
+
+    def __init__(self, name: str, entry: dict[str, Any]) -> None:
+        """Attach segment."""
+        self._views: list[memoryview] = []
+        self.shm: shared_memory.SharedMemory | None = None
+        self.shm = _SharedMemory(name=name)
+        _untrack(self.shm)
+
+        buffer = self.shm.buf
+        size = entry["size"]
+        self.columns: list[Sequence[Any]] = []
+        offset = 0
+        for field in entry["fields"]:
+            if field["kind"] == _INT:
+                column = self._view(buffer, offset, size * _WORD).cast("q")
+                offset += size * _WORD
+            else:
+                offsets = self._view(buffer, offset, (size + 1) * _WORD)
+                offsets = offsets.cast("q")
+                offset += (size + 1) * _WORD
+                blob = self._view(buffer, offset, offsets[size])
+                offset += _pad(offsets[size])
+                column = _StrColumn(offsets, blob)
+            self.columns.append(column)
+
+        self.pks = self._view(buffer, offset, size * _WORD).cast("q")
+        offset += size * _WORD
+        self.rows = self._view(buffer, offset, size * _WORD).cast("q")
+
+    def _view(self, buffer: memoryview, offset: int, size: int) -> memoryview:
+        """Get a view of part of the segment."""
+        end = offset + size
+        view = buffer[offset:end]
+        self._views.append(view)
+        return view
+
+    def close(self) -> None:
+        """Detach segment."""
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        if self.shm is not None:
+            self.shm.close()
+            self.shm = None
+
+    def __del__(self) -> None:
+        """Detach segment once no dataset uses it."""
+        try:
+            self.close()
+        except BufferError:
+            pass
+
+
+class _StrColumn(Sequence[str]):
+    """Column of strings, as offsets into a UTF-8 blob."""
+
+    def __init__(self, offsets: memoryview, blob: memoryview) -> None:
+        """Initialize column."""
+        self.offsets = offsets
+        self.blob = blob
+
+    def __len__(self) -> int:
+        """Return the number of strings."""
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: Any) -> Any:
+        """Get a string."""
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return str(self.blob[start:end], "utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate strings."""
+        blob = self.blob
+        offsets = self.offsets
+        start = 0
+        for index in range(1, len(offsets)):
+            end = offsets[index]
+            yield str(blob[start:end], "utf-8")
+            start = end
+
+
+class _SharedItems(Sequence[T]):
+    """Items of a shared dataset, rebuilt from its columns."""
+
+    def __init__(self, segment: _Segment, build: Callable[..., T]) -> None:
+        """Initialize items."""
+        self.segment = segment
+        self.build = build
+
+    def __len__(self) -> int:
+        """Return the number of items."""
+        return len(self.segment.pks)
+
+    def __getitem__(self, index: Any) -> Any:
+        """Get an item or a list of items."""
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return self.build(*(column[index] for column in self.segment.columns))
+
+    def __iter__(self) -> Iterator[T]:
+        """Iterate items."""
+        build = self.build
+        for values in zip(*self.segment.columns):
+            yield build(*values)
+
+
+class _SharedIndex(Mapping[int, T]):
+    """Primary key index of a shared dataset."""
+
+    def __init__(self, items: _SharedItems[T]) -> None:
+        """Initialize index."""
+        self.items = items
+        self.pks = items.segment.pks
+        self.rows = items.segment.rows
+
+    def _find(self, pk: Any) -> int:
+        """Find the position of a primary key, or -1 if missing."""
+        position = bisect.bisect_left(self.pks, pk)  # type: ignore
+        if position < len(self.pks) and self.pks[position] == pk:
+            return position
+        return -1
+
+    def __getitem__(self, pk: int) -> T:
+        """Get an item by primary key."""
+        if not isinstance(pk, int):
+            raise KeyError(pk)
+        position = self._find(pk)
+        if position < 0:
+            raise KeyError(pk)
+        return self.items[self.rows[position]]
+
+    def __contains__(self, pk: object) -> bool:
+        """Check if there's an item with a primary key."""
+        return isinstance(pk, int) and self._find(pk) >= 0
+
+    def __iter__(self) -> Iterator[int]:
+        """Iterate primary keys, in ascending order."""
+        return iter(self.pks)
+
+    def __len__(self) -> int:
+        """Return the number of items."""
+        return len(self.pks)
+
+
+def _make_builder(model: type) -> Callable[..., Any]:
+    """Make a function building model instances from column values."""
+    type_hints = typing.get_type_hints(model)
+    enum_positions = [
+        (index, type_hints[field.name])
+        for index, field in enumerate(dataclasses.fields(model))
+        if isinstance(type_hints[field.name], type)
+        and issubclass(type_hints[field.name], Enum)
+    ]
+    if not enum_positions:
+        return model
+
+    def build(*values: Any) -> Any:
+        row = list(values)
+        for index, enum_class in enum_positions:
+            row[index] = enum_class(row[index])
+        return model(*row)
+
+    return build
+
+
+class SharedDatasetStore:
+    """Shared dataset store.
+
+    A single process publishes datasets, any number of processes get them.
+    Publishing a new version of a dataset swaps the segment named in the
+    manifest, then unlinks the old one; processes still attached to it
+    keep it mapped until they let it go.
+    """
+
+    def __init__(self, name: str) -> None:
+        """Initialize store."""
+        self.name = name
+        self._manifest: shared_memory.SharedMemory | None = None
+        self._generation = -1
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._datasets: dict[str, Dataset] = {}
+
+    @property
+    def manifest_name(self) -> str:
+        """Return the name of the manifest segment."""
+        return f"{self.name}-manifest"
+
+    def get(self, key: str, version: str) -> Dataset | None:
+        """Get a version of a dataset, if published."""
+        entry = self._read_manifest().get(key)
+        if entry is None or entry["version"] != version:
+            return None
+
+        dataset = self._datasets.get(key)
+        if dataset is not None and dataset.version == version:
+            return dataset
+
+        try:
+            dataset = self._attach(entry)
+        except FileNotFoundError:
+            # The version was replaced while attaching it.
+            return None
+
+        self._datasets[key] = dataset
+        return dataset
+
+    def publish(
+        self, key: str, dataset: Dataset, pk_field: str = "id"
+    ) -> bool:
+        """Publish a dataset, unless its version is already published.
+
+        Returns whether the dataset was published.
+        """
+        entries = dict(self._read_manifest(create=True))
+        old_entry = entries.get(key)
+        if old_entry is not None and old_entry["version"] == dataset.version:
+            return False
+
+        entries[key] = self._create(dataset, pk_field)
+        self._write_manifest(entries)
+        if old_entry is not None:
+            self._unlink(old_entry["segment"])
+        return True
+
+    def unlink(self) -> None:
+        """Unlink every segment of the store."""
+        for entry in self._read_manifest().values():
+            self._unlink(entry["segment"])
+        self._datasets.clear()
+        self._entries = {}
+        if self._manifest is not None:
+            self._manifest.close()
+            self._manifest = None
+        self._unlink(self.manifest_name)
+
+    def _attach(self, entry: dict[str, Any]) -> Dataset:
+        """Attach a dataset segment."""
+        segment = _Segment(entry["segment"], entry)
+        model = import_string(entry["model"]) if entry["model"] else tuple
+        items = _SharedItems(segment, _make_builder(model))
+        return Dataset(
+            version=entry["version"], items=items, index=_SharedIndex(items)
+        )
+
+    def _create(self, dataset: Dataset, pk_field: str) -> dict[str, Any]:
+        """Create a dataset segment, returning its manifest entry."""
+        items = dataset.items
+        fields: list[dict[str, str]] = []
+        model = None
+        if items:
+            model_class = type(items[0])
+            type_hints = typing.get_type_hints(model_class)
+            fields = [
+                {
+                    "name": field.name,
+                    "kind": _get_field_kind(type_hints[field.name]),
+                }
+                for field in dataclasses.fields(model_class)
+            ]
+            model = f"{model_class.__module__}.{model_class.__qualname__}"
+
+        chunks: list[bytes] = []
+        for field in fields:
+            values = [getattr(item, field["name"]) for item in items]
+            if field["kind"] == _INT:
+                chunks.append(array("q", map(int, values)).tobytes())
+            else:
+                encoded = [value.encode("utf-8") for value in values]
+                offsets = array("q", [0])
+                for value in encoded:
+                    offsets.append(offsets[-1] + len(value))
+                blob = b"".join(encoded)
+                chunks.append(offsets.tobytes())
+                chunks.append(blob.ljust(_pad(len(blob)), b"\0"))
+
+        pk_rows = sorted(
+            (getattr(item, pk_field), row) for row, item in enumerate(items)
+        )
+        chunks.append(array("q", (pk for pk, _ in pk_rows)).tobytes())
+        chunks.append(array("q", (row for _, row in pk_rows)).tobytes())
+
+        data = b"".join(chunks)
+        name = f"{self.name}-{secrets.token_hex(4)}"
+        segment = shared_memory.SharedMemory(
+            name=name, create=True, size=max(len(data), 1)
+        )
+        _untrack(segment)
+        segment.buf[: len(data)] = data
+        segment.close()
+
+        return {
+            "segment": name,
+            "version": dataset.version,
+            "model": model,
+            "fields": fields,
+            "size": len(items),
+        }
+
+    def _read_manifest(self, create: bool = False) -> dict[str, Any]:
+        """Read the manifest, if it changed since it was last read."""
+        if self._manifest is None:
+            try:
+                self._manifest = shared_memory.SharedMemory(
+                    name=self.manifest_name
+                )
+            except FileNotFoundError:
+                if not create:
+                    return {}
+                self._manifest = shared_memory.SharedMemory(
+                    name=self.manifest_name, create=True, size=_MANIFEST_SIZE
+                )
+            _untrack(self._manifest)
+
+        buffer = self._manifest.buf
+        while True:
+            generation, length = _MANIFEST_HEADER.unpack_from(buffer)
+            if generation == self._generation:
+                return self._entries
+            if generation % 2:
+                # The manifest is being written.
+                time.sleep(0.001)
+                continue
+
+            end = _MANIFEST_PAYLOAD + length
+            payload = bytes(buffer[_MANIFEST_PAYLOAD:end])
+            if _MANIFEST_HEADER.unpack_from(buffer)[0] != generation:
+                continue
+
+            self._entries = json.loads(payload) if payload else {}
+            self._generation = generation
+            return self._entries
+
+    def _write_manifest(self, entries: dict[str, Any]) -> None:
+        """Write the manifest."""
+        assert self._manifest is not None
+        payload = json.dumps(entries).encode()
+        end = _MANIFEST_PAYLOAD + len(payload)
+        if end > self._manifest.size:
+            raise ValueError("The shared dataset manifest is full.")
+
+        buffer = self._manifest.buf
+        generation = _MANIFEST_HEADER.unpack_from(buffer)[0]
+        _MANIFEST_HEADER.pack_into(buffer, 0, generation + 1, 0)
+        buffer[_MANIFEST_PAYLOAD:end] = payload
+        _MANIFEST_HEADER.pack_into(buffer, 0, generation + 2, len(payload))
+
+    def _unlink(self, name: str) -> None:
+        """Unlink a segment, if it still exists."""
+        try:
+            segment = shared_memory.SharedMemory(name=name)
+        except FileNotFoundError:
+            return
+        segment.close()
+        segment.unlink()
+
+
+def get_shared_store() -> SharedDatasetStore | None:
+    """Get the shared dataset store, if enabled."""
+    if not getattr(settings, "SHARED_DATASETS_ENABLED", False):
+        return None
+    return _get_store(getattr(settings, "SHARED_DATASETS_NAME", "watcher"))
+
+
+@functools.cache
+def _get_store(name: str) -> SharedDatasetStore:
+    """Get the shared dataset store of a name."""
+    return SharedDatasetStore(name)
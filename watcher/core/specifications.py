@@ -2,7 +2,7 @@
 
 import abc
 from contextlib import suppress
-from typing import Any, Generator, Iterable, Mapping
+from typing import Any, Generator, Hashable, Iterable, Mapping, Sized
 
 from django.core.exceptions import ImproperlyConfigured
 from django.http import HttpRequest
@@ -20,6 +20,14 @@ class Specification(abc.ABC):
     def is_satisfied_by(self, obj: Any) -> bool:
         """Check if the given object satisfies the specification."""
 
+    def get_key(self) -> Hashable | None:
+        """Get a canonical key of the specification.
+
+        Specifications selecting the same objects by the same criteria
+        share a key. None means the specification can't be keyed.
+        """
+        return None
+
 
 class EqualsSpecification(Specification):
     """Equals specification.
@@ -38,6 +46,10 @@ class EqualsSpecification(Specification):
         """Check if the given object satisfies the specification."""
         return getattr(obj, self.field) == self.value
 
+    def get_key(self) -> Hashable | None:
+        """Get a canonical key of the specification."""
+        return _make_key(type(self), self.field, self.value)
+
 
 class InSpecification(Specification):
     """In specification.
@@ -56,6 +68,14 @@ class InSpecification(Specification):
         """Check if the given object satisfies the specification."""
         return getattr(obj, self.field) in self.value
 
+    def get_key(self) -> Hashable | None:
+        """Get a canonical key of the specification."""
+        try:
+            value = frozenset(self.value)
+        except TypeError:
+            return None
+        return (type(self), self.field, value)
+
 
 class ContainsSpecification(Specification):
     """Contains specification.
@@ -74,6 +94,10 @@ class ContainsSpecification(Specification):
         """Check if the given object satisfies the specification."""
         return self.value in getattr(obj, self.field)
 
+    def get_key(self) -> Hashable | None:
+        """Get a canonical key of the specification."""
+        return _make_key(type(self), self.field, self.value)
+
 
 class CompositeSpecification(Specification):
     """Composite specification."""
@@ -84,6 +108,31 @@ class CompositeSpecification(Specification):
         """Initialize specification."""
         self.specs = specs
 
+    def get_key(self) -> Hashable | None:
+        """Get a canonical key of the specification.
+
+        Nested specifications of the same type are flattened, and child
+        keys are compared regardless of their order and repetitions.
+        """
+        keys = set()
+        for spec in self._iter_flattened():
+            key = spec.get_key()
+            if key is None:
+                return None
+            keys.add(key)
+
+        if len(keys) == 1:
+            return keys.pop()
+        return (type(self), frozenset(keys))
+
+    def _iter_flattened(self) -> Generator[Specification, None, None]:
+        """Generate child specifications, flattening nested ones."""
+        for spec in self.specs:
+            if type(spec) is type(self):
+                yield from spec._iter_flattened()  # type: ignore
+            else:
+                yield spec
+
 
 class AndSpecification(CompositeSpecification):
     """And specification.
@@ -107,6 +156,159 @@ class OrSpecification(CompositeSpecification):
         return any(spec.is_satisfied_by(obj) for spec in self.specs)
 
 
+def _make_key(*parts: Any) -> Hashable | None:
+    """Make a key from its parts, or None if any part isn't hashable."""
+    try:
+        hash(parts)
+    except TypeError:
+        return None
+    return parts
+
+
+def simplify_specification(spec: Specification) -> Specification:
+    """Simplify a specification before evaluating it.
+
+    Leaves that can't be satisfied, like membership in an empty
+    collection, are folded into an empty disjunction, never satisfied.
+    Nested composites are flattened, equalities on the same field are
+    merged into a single set lookup, conflicting equalities fold their
+    conjunction, and composites settled by a child are folded into an
+    empty conjunction, always satisfied, or an empty disjunction.
+    """
+    if isinstance(spec, (AndSpecification, OrSpecification)):
+        return _simplify_composite(spec)
+    if _is_unsatisfiable(spec):
+        return OrSpecification()
+    return spec
+
+
+def is_unsatisfiable(spec: Specification) -> bool:
+    """Check if a simplified specification is never satisfied."""
+    return type(spec) is OrSpecification and not spec.specs
+
+
+def get_conjuncts(spec: Specification) -> tuple[Specification, ...]:
+    """Get the specifications all of which a specification requires."""
+    if type(spec) is AndSpecification:
+        return tuple(
+            conjunct
+            for child in spec.specs
+            for conjunct in get_conjuncts(child)
+        )
+    return (spec,)
+
+
+def get_fields(spec: Specification) -> frozenset[str] | None:
+    """Get the fields a specification reads, or None if unknown."""
+    if isinstance(spec, CompositeSpecification):
+        fields: set[str] = set()
+        for child in spec.specs:
+            child_fields = get_fields(child)
+            if child_fields is None:
+                return None
+            fields |= child_fields
+        return frozenset(fields)
+
+    field = getattr(spec, "field", None)
+    if not isinstance(field, str):
+        return None
+    return frozenset((field,))
+
+
+def get_lookup_values(spec: Specification, field: str) -> frozenset | None:
+    """Get the values of a field an equality or membership lookup accepts.
+
+    None means the specification isn't a lookup of the field.
+    """
+    if getattr(spec, "field", None) != field:
+        return None
+    return _get_lookup_values(spec)
+
+
+def _is_unsatisfiable(spec: Specification) -> bool:
+    """Check if an atomic specification is never satisfied."""
+    if isinstance(spec, InSpecification) and isinstance(spec.value, Sized):
+        return not spec.value
+    return False
+
+
+def _get_lookup_values(spec: Specification) -> frozenset | None:
+    """Get the values an equality or membership lookup accepts, if any."""
+    try:
+        if type(spec) is EqualsSpecification:
+            return frozenset((spec.value,))
+        if type(spec) is InSpecification:
+            return frozenset(spec.value)
+    except TypeError:
+        pass
+    return None
+
+
+def _simplify_composite(
+    spec: AndSpecification | OrSpecification,
+) -> Specification:
+    """Simplify a composite specification."""
+    conjunction = isinstance(spec, AndSpecification)
+    absorbing_type = OrSpecification if conjunction else AndSpecification
+
+    children: list[Specification] = []
+    for child in spec.specs:
+        child = simplify_specification(child)
+        if type(child) is type(spec):
+            children.extend(child.specs)  # type: ignore
+        elif type(child) is absorbing_type and not child.specs:  # type: ignore
+            return absorbing_type()
+        else:
+            children.append(child)
+
+    # Lookups on the same field take the place of the first of them.
+    lookups: dict[str, frozenset] = {}
+    simplified: list[Specification | str] = []
+    keys: set[Hashable] = set()
+    for child in children:
+        values = _get_lookup_values(child)
+        if values is not None:
+            field = child.field  # type: ignore
+            if field not in lookups:
+                lookups[field] = values
+                simplified.append(field)
+            elif conjunction:
+                lookups[field] &= values
+            else:
+                lookups[field] |= values
+            continue
+
+        key = child.get_key()
+        if key is not None:
+            if key in keys:
+                continue
+            keys.add(key)
+        simplified.append(child)
+
+    if conjunction and not all(lookups.values()):
+        return OrSpecification()
+
+    specs = [
+        (
+            _make_lookup(child, lookups[child])
+            if isinstance(child, str)
+            else child
+        )
+        for child in simplified
+    ]
+    if len(specs) == 1:
+        return specs[0]
+    return type(spec)(*specs)
+
+
+def _make_lookup(field: str, values: frozenset) -> Specification:
+    """Make an equality or membership lookup of a field."""
+    if len(values) == 1:
+        (value,) = values
+        return EqualsSpecification(field, value)
+    return InSpecification(field, values)
+
+
 class AtomicSpecificationBuilder(abc.ABC):
     """Atomic specification builder."""
 
@@ -222,13 +424,11 @@ class SearchSpecificationBackend(SpecificationBackend):
         params: dict[str, Any] = {}
         for field, field_type in search_fields.items():
             field_lookup_list = params.setdefault(field, [])
-            if isinstance(search, list):
-                for value in search:
-                    value = self._cast_type(value, field_type)
+            for value in search if isinstance(search, list) else [search]:
+                value = self._cast_type(value, field_type)
+                # Values that can't be cast to the field type can't match.
+                if value is not None:
                     field_lookup_list.append(value)
-            else:
-                value = self._cast_type(search, field_type)
-                field_lookup_list.append(value)
 
         field_spec_builder = DefaultAtomicSpecificationBuilder()
         or_spec_builder = DefaultCompositeSpecificationBuilder(
@@ -237,6 +437,7 @@ class SearchSpecificationBackend(SpecificationBackend):
         return or_spec_builder.build(params)
 
     def _cast_type(self, value: Any, field_type: Any) -> Any:
-        """Cast lookup value to field type."""
+        """Cast lookup value to field type, or None if it can't be cast."""
         with suppress(ValueError, TypeError):
             return field_type(value)
+        return None
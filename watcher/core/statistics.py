@@ -0,0 +1,122 @@
+"""Statistics."""
+
+from __future__ import annotations
+
+import dataclasses
+import random
+from collections import Counter
+from typing import Any, Mapping, Sequence
+
+SAMPLE_SIZE = 10_000
+
+
+@dataclasses.dataclass(frozen=True)
+class FieldStatistics:
+    """Field statistics.
+
+    Estimated from a sample of the rows of a dataset: the number of
+    distinct values, the sample frequencies of the values seen more than
+    once and the number of sampled rows with them, and the sampled values
+    themselves.
+    """
+
+    distinct: int
+    frequencies: Mapping[Any, int]
+    values: Sequence[Any]
+    common_rows: int = 0
+    average_length: float | None = None
+
+    def get_frequency(self, value: Any) -> float:
+        """Estimate the fraction of rows with a value."""
+        sample_size = len(self.values)
+        if not sample_size:
+            return 0.0
+
+        try:
+            count = self.frequencies.get(value)
+        except TypeError:
+            count = None
+        if count is not None:
+            return count / sample_size
+
+        # Values seen at most once share the rows of uncommon values.
+        uncommon_rows = sample_size - self.common_rows
+        uncommon_values = max(self.distinct - len(self.frequencies), 1)
+        return uncommon_rows / sample_size / uncommon_values
+
+    def get_containing_fraction(self, value: Any) -> float | None:
+        """Estimate the fraction of rows containing a value, if known."""
+        if not self.values:
+            return 0.0
+
+        try:
+            matched = sum(
+                1 for field_value in self.values if value in field_value
+            )
+        except TypeError:
+            return None
+        return matched / len(self.values)
+
+
+@dataclasses.dataclass(frozen=True)
+class DatasetStatistics:
+    """Dataset statistics."""
+
+    rows: int
+    fields: Mapping[str, FieldStatistics]
+
+
+def collect_statistics(
+    items: Sequence[Any], sample_size: int = SAMPLE_SIZE
+) -> DatasetStatistics:
+    """Collect the statistics of the fields of a dataset of dataclasses.
+
+    Rows are sampled at random, with a fixed seed so statistics are
+    reproducible. Statistics of datasets up to the sample size are exact.
+    """
+    rows = len(items)
+    if rows <= sample_size:
+        sample = list(items)
+    else:
+        indexes = random.Random(0).sample(range(rows), sample_size)
+        sample = [items[index] for index in sorted(indexes)]
+    if not sample or not dataclasses.is_dataclass(sample[0]):
+        return DatasetStatistics(rows=rows, fields={})
+
+    fields = {}
+    for field in dataclasses.fields(sample[0]):
+        values = [getattr(item, field.name) for item in sample]
+        fields[field.name] = _collect_field_statistics(values, rows)
+    return DatasetStatistics(rows=rows, fields=fields)
+
+
+def _collect_field_statistics(values: list[Any], rows: int) -> FieldStatistics:
+    """Collect the statistics of the sampled values of a field."""
+    try:
+        counts = Counter(values)
+    except TypeError:
+        return FieldStatistics(distinct=rows, frequencies={}, values=values)
+
+    # Values seen once in the sample are scaled up to the whole dataset,
+    # as in the Duj1 estimator of Haas et al.
+    singletons = sum(1 for count in counts.values() if count == 1)
+    sampled_fraction = len(values) / rows
+    unseen_fraction = (1 - sampled_fraction) * singletons / len(values)
+    distinct = rows
+    if unseen_fraction < 1:
+        distinct = round(len(counts) / (1 - unseen_fraction))
+
+    average_length = None
+    if all(isinstance(value, str) for value in values):
+        average_length = sum(map(len, values)) / len(values)
+
+    frequencies = {
+        value: count for value, count in counts.items() if count > 1
+    }
+    return FieldStatistics(
+        distinct=min(max(distinct, len(counts)), rows),
+        frequencies=frequencies,
+        values=values,
+        common_rows=sum(frequencies.values()),
+        average_length=average_length,
+    )
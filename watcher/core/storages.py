@@ -0,0 +1,307 @@
+"""Storages."""
+
+from __future__ import annotations
+
+import functools
+import glob
+import hashlib
+import io
+import os
+import string
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import (
+    FileSystemStorage,
+    Storage,
+    default_storage,
+    storages,
+)
+from django.utils._os import safe_join
+
+from .caches import SingleFlight
+from .metrics import CACHE_REQUESTS, STORAGE_BYTES_FETCHED
+
+DATASET_STORAGE_ALIAS = "datasets"
+CHUNK_SIZE = 8 * 1024 * 1024
+DIGEST_SIZE = 16
+
+
+def get_dataset_storage() -> Storage:
+    """Get the storage datasets are read from.
+
+    That's the datasets storage, if configured, or else the default one,
+    behind a local read-through cache if a cache directory is set.
+    """
+    if DATASET_STORAGE_ALIAS in settings.STORAGES:
+        storage = storages[DATASET_STORAGE_ALIAS]
+    else:
+        storage = default_storage
+
+    cache_dir = getattr(settings, "DATASET_CACHE_DIR", None)
+    if cache_dir:
+        return _get_cached_storage(storage, os.fspath(cache_dir))
+    return storage
+
+
+@functools.lru_cache(maxsize=16)
+def _get_cached_storage(storage: Storage, cache_dir: str) -> CachedStorage:
+    """Get the cached storage of a storage, shared by every caller."""
+    return CachedStorage(storage, cache_dir)
+
+
+def get_file_version(storage: Storage, name: str) -> str | None:
+    """Get the version of a file from its size and modification time."""
+    try:
+        size = storage.size(name)
+        modified_time = storage.get_modified_time(name)
+    except (NotImplementedError, OSError):
+        return None
+    return f"{size}-{modified_time.timestamp()}"
+
+
+class CachedStorage(Storage):
+    """Read-through cache of a storage in a local directory.
+
+    Files are copied to the cache directory, in chunks, on their first
+    read, and read from there while their validator is unchanged: the
+    etag, if the storage provides one, or else the size and modification
+    time. Each copy is named after a digest of its validator, so it's
+    written at once with its validator, and readers of other processes
+    never pair a validator with another version of the file. Metadata is
+    still read from the storage. Only reads are supported.
+    """
+
+    fetches: SingleFlight[tuple[str, str], str] = SingleFlight(
+        "dataset_fetches"
+    )
+
+    def __init__(
+        self, storage: Storage, location: str, chunk_size: int = CHUNK_SIZE
+    ) -> None:
+        """Initialize storage."""
+        self.storage = storage
+        self.location = os.fspath(location)
+        self.chunk_size = chunk_size
+
+    def _open(self, name: str, mode: str = "rb") -> File:
+        """Open the cached copy of a file, fetching it if outdated."""
+        if any(char in mode for char in "wax+"):
+            raise ValueError("Cached storages are read-only.")
+
+        path = self.fetch(name)
+        try:
+            file = open(path, mode, buffering=self.chunk_size)
+        except FileNotFoundError:
+            # The copy was replaced by a newer version in between.
+            path = self.fetch(name)
+            file = open(path, mode, buffering=self.chunk_size)
+        return File(file, name)
+
+    def _save(self, name, content):
+        """Refuse to save files."""
+        raise NotImplementedError("Cached storages are read-only.")
+
+    def exists(self, name: str) -> bool:
+        """Check if a file exists in the storage."""
+        return self.storage.exists(name)
+
+    def size(self, name: str) -> int:
+        """Get the size of a file in the storage."""
+        return self.storage.size(name)
+
+    def get_modified_time(self, name: str):
+        """Get the modification time of a file in the storage."""
+        return self.storage.get_modified_time(name)
+
+    def get_validator(self, name: str) -> str:
+        """Get the validator of the current version of a file."""
+        get_etag = getattr(self.storage, "get_etag", None)
+        if get_etag is not None:
+            return f"etag:{get_etag(name)}"
+
+        size = self.storage.size(name)
+        modified_time = self.storage.get_modified_time(name)
+        return f"{size}-{modified_time.timestamp()}"
+
+    def get_cache_path(self, name: str, validator: str) -> str:
+        """Get the path of the cached copy of a version of a file."""
+        digest = hashlib.sha256(validator.encode()).hexdigest()
+        return safe_join(self.location, f"{name}.{digest[:DIGEST_SIZE]}")
+
+    def fetch(self, name: str) -> str:
+        """Copy a file to the cache, unless up to date, and get its path."""
+        validator = self.get_validator(name)
+        path = self.get_cache_path(name, validator)
+        if os.path.exists(path):
+            CACHE_REQUESTS.inc(cache="dataset_files", result="hit")
+            return path
+
+        CACHE_REQUESTS.inc(cache="dataset_files", result="miss")
+        return self.fetches.do(
+            (path, validator), lambda: self._fetch(name, path)
+        )
+
+    def _fetch(self, name: str, path: str) -> str:
+        """Copy a file to the cache, removing copies of other versions.
+
+        The copy is written to a temporary file and moved into place, so
+        readers never see a partial copy.
+        """
+        if os.path.exists(path):
+            return path
+
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".fetch-")
+        fetched = 0
+        try:
+            with os.fdopen(fd, "wb") as cache_file:
+                with self.storage.open(name, "rb") as file:
+                    while chunk := file.read(self.chunk_size):
+                        cache_file.write(chunk)
+                        fetched += len(chunk)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        finally:
+            STORAGE_BYTES_FETCHED.inc(fetched, dataset=name)
+
+        self._remove_stale_copies(name, path)
+        return path
+
+    def _remove_stale_copies(self, name: str, path: str) -> None:
+        """Remove the cached copies of other versions of a file."""
+        prefix = safe_join(self.location, name) + "."
+        for stale_path in glob.glob(glob.escape(prefix) + "*"):
+            digest = stale_path.removeprefix(prefix)
+            if stale_path == path or not _is_digest(digest):
+                continue
+            try:
+                os.unlink(stale_path)
+            except FileNotFoundError:
+                pass
+
+    def prefetch(
+        self, names: Iterable[str], max_workers: int | None = None
+    ) -> list[str]:
+        """Copy files to the cache in parallel, and get their paths."""
+        names = list(names)
+        if not names:
+            return []
+
+        with ThreadPoolExecutor(
+            max_workers=max_workers or len(names),
+            thread_name_prefix="dataset-prefetch",
+        ) as executor:
+            return list(executor.map(self.fetch, names))
+
+
+def _is_digest(value: str) -> bool:
+    """Check if a file name suffix is a validator digest."""
+    return len(value) == DIGEST_SIZE and all(
+        char in string.hexdigits for char in value
+    )
+
+
+class SlowFileSystemStorage(FileSystemStorage):
+    """File system storage with the latency and bandwidth of a remote one.
+
+    Stand-in for object stores in tests and benchmarks: every request waits
+    for the latency, reads are throttled to the bandwidth, in bytes per
+    second, and requests and bytes read are counted.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.05,
+        bandwidth: float | None = None,
+        **kwargs,
+    ) -> None:
+        """Initialize storage."""
+        super().__init__(**kwargs)
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.requests = 0
+        self.bytes_read = 0
+        self._lock = threading.Lock()
+
+    def _request(self) -> None:
+        """Wait for the latency of a request."""
+        with self._lock:
+            self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _read(self, size: int) -> None:
+        """Wait for the transfer time of a read."""
+        with self._lock:
+            self.bytes_read += size
+        if self.bandwidth:
+            time.sleep(size / self.bandwidth)
+
+    def _open(self, name: str, mode: str = "rb") -> File:
+        """Open a file, throttling its reads."""
+        self._request()
+        file = super()._open(name, "rb")
+        stream = io.BufferedReader(_SlowReader(file, self))
+        if "b" not in mode:
+            stream = io.TextIOWrapper(stream, encoding="utf-8")
+        return File(stream, name)
+
+    def exists(self, name: str) -> bool:
+        """Check if a file exists."""
+        self._request()
+        return super().exists(name)
+
+    def size(self, name: str) -> int:
+        """Get the size of a file."""
+        self._request()
+        return super().size(name)
+
+    def get_modified_time(self, name: str):
+        """Get the modification time of a file."""
+        self._request()
+        return super().get_modified_time(name)
+
+
+class _SlowReader(io.RawIOBase):
+    """Reader of a file of a slow storage."""
+
+    def __init__(self, file: File, storage: SlowFileSystemStorage) -> None:
+        """Initialize reader."""
+        self.file = file
+        self.storage = storage
+
+    def readable(self) -> bool:
+        """Return whether the file is readable."""
+        return True
+
+    def seekable(self) -> bool:
+        """Return whether the file is seekable."""
+        return True
+
+    def readinto(self, buffer) -> int:
+        """Read into a buffer, waiting for the transfer time."""
+        size = self.file.readinto(buffer)
+        self.storage._read(size)
+        return size
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        """Move to a position."""
+        return self.file.seek(offset, whence)
+
+    def tell(self) -> int:
+        """Return the position."""
+        return self.file.tell()
+
+    def close(self) -> None:
+        """Close the file."""
+        self.file.close()
+        super().close()
@@ -0,0 +1,12 @@
+"""URLs."""
+
+from django.urls import path
+
+from .views import MetricsView, ReadinessView
+
+app_name = "core"
+
+urlpatterns = [
+    path("metrics/", MetricsView.as_view(), name="metrics"),
+    path("healthz/ready", ReadinessView.as_view(), name="readiness"),
+]
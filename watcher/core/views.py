@@ -1,17 +1,35 @@
 """Views."""
 
-from typing import Any
+import json
+import sys
+from array import array
+from typing import Any, Generator, Hashable, Iterator
 
+from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
-from django.views.generic import ListView
+from django.core.paginator import Page, Paginator
+from django.http import (
+    Http404,
+    HttpResponse,
+    HttpResponseBadRequest,
+    JsonResponse,
+    StreamingHttpResponse,
+)
+from django.views.generic import ListView, View
 
-from .repositories import ReadRepository
+from .caches import LRUCache
+from .instrumentation import increment, phase
+from .metrics import REGISTRY
+from .repositories import ReadRepository, ResultList
+from .serializers import CsvSerializer, JsonSerializer
 from .specifications import (
     AndSpecification,
     Specification,
     SpecificationBackend,
+    simplify_specification,
 )
 from .typing import ObjectOrType
+from .warmup import is_ready
 
 
 class SpecificationMixin:
@@ -27,25 +45,232 @@ class SpecificationMixin:
             return None
 
         specs: list[Specification] = []
-        for backend in self.specification_backends:
-            if callable(backend):
-                backend = backend()
+        with phase("spec"):
+            for backend in self.specification_backends:
+                if callable(backend):
+                    backend = backend()
+
+                spec = backend.build(self.request, self)  # type: ignore
+                if spec:
+                    specs.append(spec)
+
+            if not specs:
+                return None
+
+            spec = simplify_specification(AndSpecification(*specs))
+
+        # An empty conjunction is satisfied by every object, like no spec.
+        if type(spec) is AndSpecification and not spec.specs:
+            return None
+
+        return spec
+
 
-            spec = backend.build(self.request, self)  # type: ignore
-            if spec:
-                specs.append(spec)
+class QueryCacheMixin:
+    """Query cache mixin class.
 
-        if not specs:
+    Caches query results by the dataset version and the canonical key of
+    the specification, so paging through a filtered result, or repeating
+    a search, evaluates the specification once. Results taking more than
+    query_cache_max_bytes bytes aren't cached: the bytes of arrays, or of
+    the references held by other sequences.
+    """
+
+    model: type
+    query_cache: LRUCache[Hashable, Any] = LRUCache(
+        "query_results", max_size=256
+    )
+    query_cache_max_bytes: int = 4 * 1024 * 1024
+
+    def get_query_cache_key(
+        self, version: str | None, spec: Specification | None
+    ) -> Hashable | None:
+        """Get query cache key, or None if the query can't be cached."""
+        if version is None:
+            return None
+
+        if spec is None:
+            # An empty conjunction matches every object, like no spec.
+            spec = AndSpecification()
+
+        spec_key = spec.get_key()
+        if spec_key is None:
             return None
 
-        if len(specs) > 1:
-            return AndSpecification(*specs)
+        return (self.get_query_cache_namespace(), version, spec_key)
+
+    def get_query_cache_namespace(self) -> Hashable:
+        """Get the namespace of the query cache keys of the view."""
+        return self.model
+
+    def get_cached_query(self, key: Hashable | None) -> Any:
+        """Get a cached query result, or None if it isn't cached."""
+        if key is None:
+            return None
+
+        result = self.query_cache.get(key)
+        if result is not None:
+            increment("query_cache_hits")
+        return result
+
+    def set_cached_query(self, key: Hashable | None, result: Any) -> None:
+        """Cache a query result, unless it's too large to keep."""
+        if key is None:
+            return
+
+        try:
+            size = memoryview(result).nbytes
+        except TypeError:
+            size = sys.getsizeof(result)
+        if size <= self.query_cache_max_bytes:
+            self.query_cache.set(key, result)
+
+
+class InstrumentedListMixin:
+    """Instrumented list mixin class."""
+
+    def paginate_queryset(self, queryset, page_size):
+        """Paginate queryset."""
+        with phase("paginate"):
+            return super().paginate_queryset(  # type: ignore
+                queryset, page_size
+            )
+
+
+class JsonListMixin:
+    """JSON list mixin class.
+
+    Renders the paginated object list as a JSON document streamed in
+    chunks, instead of rendering a template.
+    """
+
+    model: type
+    page_size_kwarg = "page_size"
+    max_page_size = 1000
+    chunk_size = 500
+
+    def get_paginate_by(self, queryset) -> int | None:
+        """Get the page size, optionally overridden by a query parameter."""
+        page_size = self.request.GET.get(self.page_size_kwarg)  # type: ignore
+        if page_size:
+            try:
+                return min(max(int(page_size), 1), self.max_page_size)
+            except ValueError:
+                pass
+        return super().get_paginate_by(queryset)  # type: ignore
+
+    def get_serializer(self) -> JsonSerializer:
+        """Get serializer."""
+        if not hasattr(self, "model"):
+            raise ImproperlyConfigured("'model' attribute is not defined")
+        return JsonSerializer.for_dataclass(self.model)
+
+    def render_to_response(self, context, **response_kwargs):
+        """Render a streamed JSON response."""
+        return StreamingHttpResponse(
+            self.iter_json(
+                context["object_list"],
+                context.get("page_obj"),
+                context.get("paginator"),
+            ),
+            content_type="application/json",
+            **response_kwargs,
+        )
 
-        return specs[0]
+    def iter_json(
+        self,
+        object_list: list[Any],
+        page: Page | None,
+        paginator: Paginator | None,
+    ) -> Generator[str, None, None]:
+        """Generate the JSON document in chunks."""
+        if page is not None and paginator is not None:
+            meta = {
+                "count": paginator.count,
+                "num_pages": paginator.num_pages,
+                "page": page.number,
+                "page_size": paginator.per_page,
+            }
+        else:
+            meta = {"count": len(object_list)}
 
+        yield json.dumps(meta)[:-1] + ', "results": '
+        yield from self.get_serializer().iter_chunks(
+            object_list, self.chunk_size
+        )
+        yield "}"
 
-class RepositoryListView(SpecificationMixin, ListView):
-    """Repository list view."""
+
+class ExportMixin:
+    """Export mixin class.
+
+    Streams every item matching the view specification as CSV or NDJSON
+    when the export query parameter is given, without building the full
+    list of items.
+    """
+
+    model: type
+    export_kwarg = "export"
+    chunk_size = 500
+
+    def get(self, request, *args, **kwargs):
+        """Handle GET requests."""
+        export_format = request.GET.get(self.export_kwarg)
+        if not export_format:
+            return super().get(request, *args, **kwargs)  # type: ignore
+
+        if export_format == "csv":
+            serializer = CsvSerializer.for_dataclass(self.model)
+            chunks = serializer.iter_chunks(
+                self.iter_export_items(), self.chunk_size
+            )
+            content_type = "text/csv"
+        elif export_format == "ndjson":
+            chunks = JsonSerializer.for_dataclass(self.model).iter_lines(
+                self.iter_export_items(), self.chunk_size
+            )
+            content_type = "application/x-ndjson"
+        else:
+            return HttpResponseBadRequest(
+                f"Unsupported export format: {export_format}"
+            )
+
+        response = StreamingHttpResponse(chunks, content_type=content_type)
+        response["Content-Disposition"] = (
+            f'attachment; filename="{self.get_export_filename()}'
+            f'.{export_format}"'
+        )
+        return response
+
+    def get_export_filename(self) -> str:
+        """Get export file name, without extension."""
+        resolver_match = self.request.resolver_match  # type: ignore
+        if resolver_match and resolver_match.url_name:
+            return resolver_match.url_name
+        return "export"
+
+    def iter_export_items(self) -> Iterator[Any]:
+        """Generate the items to export, by default those of the queryset.
+
+        Views reading their items from a repository or a service override
+        it to stream them instead of listing them.
+        """
+        return iter(self.get_queryset())  # type: ignore
+
+
+class RepositoryListView(
+    ExportMixin,
+    InstrumentedListMixin,
+    QueryCacheMixin,
+    SpecificationMixin,
+    ListView,
+):
+    """Repository list view.
+
+    Caches the primary keys of the items matching the specification, as
+    an array of 8 bytes per item, so later pages only look up the items
+    they show. Unfiltered queries evaluate nothing, so they aren't cached.
+    """
 
     repository_class: type[ReadRepository]
 
@@ -53,7 +278,28 @@ class RepositoryListView(SpecificationMixin, ListView):
         """Get queryset."""
         repository = self.get_repository()
         spec = self.get_specification()
-        return repository.get_all(spec)
+        if spec is None:
+            return repository.get_all(spec)
+
+        key = self.get_query_cache_key(repository.get_version(), spec)
+        pks = self.get_cached_query(key)
+        if pks is not None:
+            return ResultList(repository, pks)
+
+        items = repository.get_all(spec)
+        self.set_cached_query(
+            key, array("q", [repository.get_pk(item) for item in items])
+        )
+        return items
+
+    def iter_export_items(self) -> Iterator[Any]:
+        """Generate the items to export."""
+        repository = self.get_repository()
+        spec = self.get_specification()
+        iter_items = getattr(repository, "iter_items", None)
+        if iter_items is None:
+            return iter(repository.get_all(spec))
+        return iter_items(spec)
 
     def get_repository(self) -> ReadRepository:
         """Get repository."""
@@ -68,3 +314,36 @@ class RepositoryListView(SpecificationMixin, ListView):
     def get_repository_config(self) -> dict[str, Any]:
         """Get repository config."""
         return {}
+
+    def get_query_cache_namespace(self) -> Hashable:
+        """Get the namespace of the query cache keys of the view."""
+        config = self.get_repository_config()
+        return (self.repository_class, tuple(sorted(config.items())))
+
+
+class MetricsView(View):
+    """Metrics view.
+
+    Exposes the in-process metrics in the Prometheus text format.
+    """
+
+    content_type = "text/plain; version=0.0.4; charset=utf-8"
+
+    def get(self, request, *args, **kwargs):
+        """Render metrics."""
+        if not getattr(settings, "METRICS_ENABLED", False):
+            raise Http404()
+        return HttpResponse(REGISTRY.render(), content_type=self.content_type)
+
+
+class ReadinessView(View):
+    """Readiness view.
+
+    Reports whether the app is ready to serve requests, i.e. whether the
+    warm-up is done.
+    """
+
+    def get(self, request, *args, **kwargs):
+        """Get readiness."""
+        ready = is_ready()
+        return JsonResponse({"ready": ready}, status=200 if ready else 503)
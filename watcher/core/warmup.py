@@ -0,0 +1,63 @@
+"""Warm-up."""
+
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+_LOGGER = logging.getLogger(__name__)
+
+# The app is ready unless a warm-up is running.
+_READY = threading.Event()
+_READY.set()
+
+
+def is_ready() -> bool:
+    """Check if the warm-up is done."""
+    return _READY.is_set()
+
+
+def start_warm_up() -> threading.Thread | None:
+    """Run the warm-up tasks in a background thread, if enabled.
+
+    Called by the WSGI and ASGI applications, so only processes serving
+    requests warm up, not management commands or the autoreloader of the
+    development server. The app is ready right away when the warm-up is
+    disabled.
+    """
+    if not getattr(settings, "WARM_UP_ENABLED", False):
+        _READY.set()
+        return None
+
+    _READY.clear()
+    thread = threading.Thread(target=run_warm_up, name="warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+def run_warm_up() -> None:
+    """Run the warm-up tasks, then mark the app as ready.
+
+    A failing task is logged and doesn't prevent the others from running,
+    since the app can still serve requests without a warm cache.
+    """
+    start = time.perf_counter()
+    try:
+        for task_path in getattr(settings, "WARM_UP_TASKS", []):
+            task_start = time.perf_counter()
+            try:
+                import_string(task_path)()
+            except Exception:
+                _LOGGER.exception("Warm-up task %s failed.", task_path)
+            else:
+                _LOGGER.info(
+                    "Warm-up task %s done in %.3fs.",
+                    task_path,
+                    time.perf_counter() - task_start,
+                )
+    finally:
+        _READY.set()
+
+    _LOGGER.info("Warm-up done in %.3fs.", time.perf_counter() - start)
@@ -0,0 +1,205 @@
+"""Zone maps."""
+
+from __future__ import annotations
+
+import csv
+import dataclasses
+import json
+import os
+from typing import IO, Any, Iterator, Mapping
+
+from django.core.files.storage import FileSystemStorage
+
+from .partitions import may_satisfy, parse_value
+from .specifications import Specification
+from .storages import get_file_version
+
+ZONE_MAP_SUFFIX = ".zonemap.json"
+BLOCK_SIZE = 256 * 1024
+
+
+def get_zone_map_path(file_path: str) -> str:
+    """Get the path of the zone map of a CSV file."""
+    return f"{file_path}{ZONE_MAP_SUFFIX}"
+
+
+@dataclasses.dataclass(frozen=True)
+class Block:
+    """Block of a CSV file.
+
+    A run of whole rows at a byte offset of the file, with the ranges and
+    the number of distinct values of its fields.
+    """
+
+    offset: int
+    length: int
+    rows: int
+    ranges: Mapping[str, tuple[Any, Any]]
+    distinct: Mapping[str, int]
+
+    def may_satisfy(self, spec: Specification | None) -> bool:
+        """Check if rows of the block may satisfy a specification."""
+        return spec is None or may_satisfy(spec, self.ranges)
+
+
+@dataclasses.dataclass(frozen=True)
+class ZoneMap:
+    """Zone map.
+
+    Statistics of the blocks of the rows of a CSV file, for the version of
+    the file they were built from, with the header of the file.
+    """
+
+    version: str
+    fields: tuple[str, ...]
+    blocks: tuple[Block, ...]
+
+    @property
+    def rows(self) -> int:
+        """Return the number of rows."""
+        return sum(block.rows for block in self.blocks)
+
+    @classmethod
+    def parse(cls, data: Mapping[str, Any], file_path: str) -> ZoneMap:
+        """Parse the data of a zone map file."""
+        try:
+            return cls(
+                version=data["version"],
+                fields=tuple(data["fields"]),
+                blocks=tuple(
+                    Block(
+                        offset=item["offset"],
+                        length=item["length"],
+                        rows=item["rows"],
+                        ranges={
+                            field: (minimum, maximum)
+                            for field, (minimum, maximum) in item[
+                                "ranges"
+                            ].items()
+                        },
+                        distinct=item.get("distinct", {}),
+                    )
+                    for item in data["blocks"]
+                ),
+            )
+        except (KeyError, TypeError, ValueError) as err:
+            raise ValueError(f"Invalid zone map: {file_path}") from err
+
+    @classmethod
+    def read(cls, file: IO[bytes], file_path: str) -> ZoneMap:
+        """Read a zone map file."""
+        try:
+            data = json.load(file)
+        except ValueError as err:
+            raise ValueError(f"Invalid zone map: {file_path}") from err
+        return cls.parse(data, file_path)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Get the data of the zone map file."""
+        return {
+            "version": self.version,
+            "fields": list(self.fields),
+            "blocks": [
+                {
+                    "offset": block.offset,
+                    "length": block.length,
+                    "rows": block.rows,
+                    "ranges": {
+                        field: list(value_range)
+                        for field, value_range in block.ranges.items()
+                    },
+                    "distinct": dict(block.distinct),
+                }
+                for block in self.blocks
+            ],
+        }
+
+    def prune(self, spec: Specification | None) -> list[Block]:
+        """Get the blocks whose rows may satisfy a specification."""
+        return [block for block in self.blocks if block.may_satisfy(spec)]
+
+
+def build_zone_map(
+    file: IO[bytes], version: str, block_size: int = BLOCK_SIZE
+) -> ZoneMap:
+    """Build the zone map of an uncompressed CSV file in one pass.
+
+    Blocks end at the first row boundary past the block size. Values are
+    compared as integers, or as strings if they aren't, and fields whose
+    values in a block can't be compared get no range for that block.
+    """
+    if block_size < 1:
+        raise ValueError("The block size must be positive.")
+
+    consumed = 0
+
+    def iter_lines() -> Iterator[str]:
+        nonlocal consumed
+        for line in file:
+            consumed += len(line)
+            yield line.decode("utf-8")
+
+    # Readers pull lines one row at a time, so the bytes consumed after a
+    # row are its end offset.
+    reader = csv.reader(iter_lines())
+    fields = tuple(next(reader, ()))
+    blocks: list[Block] = []
+    offset = consumed
+    rows = 0
+    values: dict[str, set[Any]] = {field: set() for field in fields}
+    for row in reader:
+        if not row:
+            continue
+
+        rows += 1
+        for field, value in zip(fields, row):
+            values[field].add(parse_value(value))
+
+        if consumed - offset >= block_size:
+            blocks.append(_build_block(offset, consumed, rows, values))
+            offset = consumed
+            rows = 0
+            values = {field: set() for field in fields}
+
+    if rows:
+        blocks.append(_build_block(offset, consumed, rows, values))
+    return ZoneMap(version=version, fields=fields, blocks=tuple(blocks))
+
+
+def write_zone_map(path: str, block_size: int = BLOCK_SIZE) -> str:
+    """Write the zone map of a local uncompressed CSV file next to it."""
+    storage = FileSystemStorage(location=os.path.dirname(path))
+    version = get_file_version(storage, os.path.basename(path))
+    if version is None:
+        raise ValueError(f"Can't read the version of {path}.")
+
+    with open(path, "rb") as file:
+        zone_map = build_zone_map(file, version, block_size)
+
+    zone_map_path = get_zone_map_path(path)
+    temp_path = f"{zone_map_path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(zone_map.to_dict(), file)
+    os.replace(temp_path, zone_map_path)
+    return zone_map_path
+
+
+def _build_block(
+    offset: int, end: int, rows: int, values: dict[str, set[Any]]
+) -> Block:
+    """Build a block from the distinct values of its fields."""
+    ranges = {}
+    for field, field_values in values.items():
+        try:
+            ranges[field] = (min(field_values), max(field_values))
+        except (TypeError, ValueError):
+            continue
+    return Block(
+        offset=offset,
+        length=end - offset,
+        rows=rows,
+        ranges=ranges,
+        distinct={
+            field: len(value_set) for field, value_set in values.items()
+        },
+    )
@@ -35,6 +35,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "watcher.core.middleware.MetricsMiddleware",
+    "watcher.core.middleware.ServerTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -63,6 +65,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "watcher.wsgi.application"
+ASGI_APPLICATION = "watcher.asgi.application"
 
 
 # Password validation
@@ -128,6 +131,45 @@ LOGGING = {
 }
 
 
+# Instrumentation
+
+SERVER_TIMING_ENABLED = DEBUG
+SERVER_TIMING_LOG = False
+METRICS_ENABLED = True
+
+
+# Warm-up
+
+WARM_UP_ENABLED = False
+WARM_UP_TASKS = [
+    "watcher.votes.warmup.prefetch_datasets",
+    "watcher.votes.warmup.warm_up",
+]
+
+
+# Datasets
+
+DATASET_LOAD_ON_DEMAND = False
+DATASET_RELOAD_ENABLED = False
+DATASET_RELOAD_INTERVAL = 2.0
+DATASET_CACHE_DIR = None
+
+
+# Ingest
+
+INGEST_ENABLED = False
+INGEST_TOKEN = None
+INGEST_BATCH_SIZE = 50_000
+LIVE_TALLY_KEEPALIVE = 15.0
+LIVE_TALLY_MAX_LIFETIME = 300.0
+
+
+# Shared datasets
+
+SHARED_DATASETS_ENABLED = False
+SHARED_DATASETS_NAME = "watcher"
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.0/topics/i18n/
 
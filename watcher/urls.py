@@ -5,6 +5,7 @@ from django.urls import include, path
 
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path("", include("watcher.core.urls", namespace="core")),
     path("", include("watcher.home.urls", namespace="home")),
     path("", include("watcher.votes.urls", namespace="votes")),
 ]
@@ -0,0 +1,418 @@
+"""Benchmarks."""
+
+from __future__ import annotations
+
+import gc
+import platform
+import statistics
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Generator, Iterable
+
+from django.conf import settings
+from django.core.files.storage import Storage
+from django.test import Client, override_settings
+from django.urls import URLPattern, URLResolver, reverse
+
+from watcher.core.specifications import (
+    AndSpecification,
+    ContainsSpecification,
+    EqualsSpecification,
+    InSpecification,
+    OrSpecification,
+    Specification,
+)
+from watcher.core.storages import CachedStorage, SlowFileSystemStorage
+
+from . import urls
+from .generators import DATASET_FILE_NAMES, DatasetGenerator
+from .repositories import (
+    BillCsvRepository,
+    LegislatorCsvRepository,
+    VoteCsvRepository,
+    VoteResultCsvRepository,
+)
+from .services import BillVoteSummaryService, LegislatorVoteSummaryService
+
+
+@dataclass
+class BenchmarkResult:
+    """Benchmark result."""
+
+    name: str
+    size: int
+    metric: str
+    value: float
+    higher_is_better: bool = False
+
+    @property
+    def key(self) -> tuple[str, int, str]:
+        """Return the key used to match results across runs."""
+        return self.name, self.size, self.metric
+
+
+@dataclass
+class Regression:
+    """Benchmark regression."""
+
+    name: str
+    size: int
+    metric: str
+    baseline: float
+    current: float
+    change: float
+
+
+def measure(fn: Callable[[], Any], repeat: int) -> float:
+    """Return the median wall time of a callable in seconds."""
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def measure_peak_memory(fn: Callable[[], Any]) -> int:
+    """Return the peak memory allocated by a callable in bytes."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def iter_url_names(
+    patterns: Iterable[URLPattern | URLResolver], namespace: str
+) -> Generator[str, None, None]:
+    """Generate the names of all URL patterns without parameters.
+
+    Only views answering GET requests synchronously are named, so neither
+    POST-only views nor ASGI-only streams.
+    """
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from iter_url_names(pattern.url_patterns, namespace)
+        elif (
+            pattern.name
+            and not pattern.pattern.converters
+            and _is_sync_get_view(pattern.callback)
+        ):
+            yield f"{namespace}:{pattern.name}"
+
+
+def _is_sync_get_view(view: Callable[..., Any]) -> bool:
+    """Check if a view answers GET requests synchronously."""
+    view_class = getattr(view, "view_class", None)
+    if view_class is None:
+        return True
+    return (
+        "get" in view_class.http_method_names
+        and hasattr(view_class, "get")
+        and not view_class.view_is_async
+    )
+
+
+class BenchmarkSuite:
+    """Benchmark suite.
+
+    Runs the repository, storage, specification, service and view
+    benchmarks against a generated dataset of a given size.
+    """
+
+    storage_latency = 0.01
+    storage_bandwidth = 100 * 1024 * 1024
+
+    def __init__(self, repeat: int = 5, seed: int = 0) -> None:
+        """Initialize benchmark suite."""
+        self.repeat = repeat
+        self.seed = seed
+
+    def run(self, sizes: Iterable[int]) -> list[BenchmarkResult]:
+        """Run all benchmarks for each dataset size."""
+        results: list[BenchmarkResult] = []
+        for size in sizes:
+            with tempfile.TemporaryDirectory() as media_root:
+                DatasetGenerator(
+                    vote_results=size, missing_rate=0.01, seed=self.seed
+                ).write(f"{media_root}/csv")
+                media_files = {
+                    name: f"csv/{file_name}"
+                    for name, file_name in DATASET_FILE_NAMES.items()
+                }
+                with override_settings(
+                    MEDIA_ROOT=media_root,
+                    MEDIA_FILES=media_files,
+                    ALLOWED_HOSTS=["testserver"],
+                ):
+                    results.extend(self.run_size(size, media_files))
+        return results
+
+    def run_size(
+        self, size: int, media_files: dict[str, str]
+    ) -> Generator[BenchmarkResult, None, None]:
+        """Run all benchmarks for a dataset size."""
+        repositories = {
+            "legislators": LegislatorCsvRepository(media_files["legislators"]),
+            "bills": BillCsvRepository(media_files["bills"]),
+            "votes": VoteCsvRepository(media_files["votes"]),
+            "vote_results": VoteResultCsvRepository(
+                media_files["vote_results"]
+            ),
+        }
+        yield from self.bench_repositories(size, repositories)
+        yield from self.bench_storages(size, media_files["vote_results"])
+        yield from self.bench_specifications(size, repositories)
+        yield from self.bench_services(size, repositories)
+        yield from self.bench_views(size)
+
+    def bench_repositories(
+        self, size: int, repositories: dict[str, Any]
+    ) -> Generator[BenchmarkResult, None, None]:
+        """Benchmark repository scans and lookups."""
+        for name, repository in repositories.items():
+            rows = sum(1 for _ in repository.iter_items())
+            elapsed = measure(
+                lambda: sum(1 for _ in repository.iter_items()), self.repeat
+            )
+            yield BenchmarkResult(
+                name=f"repositories.iter_items.{name}",
+                size=size,
+                metric="rows_per_sec",
+                value=rows / elapsed if elapsed else 0.0,
+                higher_is_better=True,
+            )
+
+            pks = self._sample_pks(repository)
+            elapsed = measure(
+                lambda: [repository.get_by_id(pk) for pk in pks], self.repeat
+            )
+            yield BenchmarkResult(
+                name=f"repositories.get_by_id.{name}",
+                size=size,
+                metric="seconds",
+                value=elapsed / len(pks),
+            )
+
+    def bench_storages(
+        self, size: int, file_path: str
+    ) -> Generator[BenchmarkResult, None, None]:
+        """Benchmark file reads from a slow storage and its local cache."""
+        remote = SlowFileSystemStorage(
+            latency=self.storage_latency,
+            bandwidth=self.storage_bandwidth,
+            location=settings.MEDIA_ROOT,
+        )
+        with tempfile.TemporaryDirectory() as cache_dir:
+            storages = {
+                "remote": remote,
+                "cached": CachedStorage(remote, cache_dir),
+            }
+            for name, storage in storages.items():
+                self._read(storage, file_path)
+                yield BenchmarkResult(
+                    name=f"storages.read.{name}",
+                    size=size,
+                    metric="seconds",
+                    value=measure(
+                        lambda: self._read(storage, file_path), self.repeat
+                    ),
+                )
+
+    def bench_specifications(
+        self, size: int, repositories: dict[str, Any]
+    ) -> Generator[BenchmarkResult, None, None]:
+        """Benchmark specification evaluation per tree shape."""
+        bills = repositories["bills"].get_all()
+        sample = bills[len(bills) // 2]
+        for shape, spec in self._spec_shapes(sample).items():
+            elapsed = measure(
+                lambda: [spec.is_satisfied_by(bill) for bill in bills],
+                self.repeat,
+            )
+            yield BenchmarkResult(
+                name=f"specifications.{shape}",
+                size=size,
+                metric="seconds_per_row",
+                value=elapsed / len(bills),
+            )
+
+    def bench_services(
+        self, size: int, repositories: dict[str, Any]
+    ) -> Generator[BenchmarkResult, None, None]:
+        """Benchmark vote summary services."""
+        services = {
+            "legislator_vote_summary": LegislatorVoteSummaryService(
+                vote_repository=repositories["votes"],
+                vote_result_repository=repositories["vote_results"],
+                legislator_repository=repositories["legislators"],
+            ),
+            "bill_vote_summary": BillVoteSummaryService(
+                vote_repository=repositories["votes"],
+                vote_result_repository=repositories["vote_results"],
+                bill_repository=repositories["bills"],
+                legislator_repository=repositories["legislators"],
+            ),
+        }
+        for name, service in services.items():
+            yield BenchmarkResult(
+                name=f"services.{name}.summarize_votes",
+                size=size,
+                metric="seconds",
+                value=measure(service.summarize_votes, self.repeat),
+            )
+            yield BenchmarkResult(
+                name=f"services.{name}.summarize_votes",
+                size=size,
+                metric="peak_memory_bytes",
+                value=measure_peak_memory(service.summarize_votes),
+            )
+
+    def bench_views(self, size: int) -> Generator[BenchmarkResult, None, None]:
+        """Benchmark end-to-end response time of the votes URLs.
+
+        JSON API views are also compared with their HTML counterparts, as
+        requests per second on a single core.
+        """
+        client = Client()
+        timings: dict[str, float] = {}
+        for url_name in iter_url_names(urls.urlpatterns, urls.app_name):
+            url = reverse(url_name)
+            timings[url_name] = measure(
+                lambda: self._get(client, url), self.repeat
+            )
+            yield BenchmarkResult(
+                name=f"views.{url_name}",
+                size=size,
+                metric="seconds",
+                value=timings[url_name],
+            )
+
+        for url_name, elapsed in timings.items():
+            html_url_name = url_name.replace(":api-", ":", 1)
+            if html_url_name == url_name or html_url_name not in timings:
+                continue
+
+            for name, value in (
+                (html_url_name, timings[html_url_name]),
+                (url_name, elapsed),
+            ):
+                yield BenchmarkResult(
+                    name=f"throughput.{name}",
+                    size=size,
+                    metric="requests_per_sec",
+                    value=1 / value if value else 0.0,
+                    higher_is_better=True,
+                )
+
+    def _get(self, client: Client, url: str) -> bytes:
+        """Request a URL and read the whole response content."""
+        response = client.get(url)
+        if response.status_code != 200:
+            raise RuntimeError(
+                f"GET {url} answered {response.status_code}, "
+                "so it can't be benchmarked."
+            )
+        if not response.streaming:
+            return response.content
+        return b"".join(response.streaming_content)
+
+    def _read(self, storage: Storage, file_path: str) -> int:
+        """Read a whole file from a storage, in chunks."""
+        size = 0
+        with storage.open(file_path, "rb") as file:
+            while chunk := file.read(1024 * 1024):
+                size += len(chunk)
+        return size
+
+    def _sample_pks(self, repository: Any) -> list[int]:
+        """Return the first, middle and last primary keys of a dataset."""
+        pks = [
+            getattr(item, repository.pk_field)
+            for item in repository.iter_items()
+        ]
+        return [pks[0], pks[len(pks) // 2], pks[-1]]
+
+    def _spec_shapes(self, bill: Any) -> dict[str, Specification]:
+        """Return specifications of different tree shapes."""
+        equals = EqualsSpecification("id", bill.id)
+        contains = ContainsSpecification("title", "Act")
+        return {
+            "equals": equals,
+            "in": InSpecification("sponsor_id", {bill.sponsor_id}),
+            "contains": contains,
+            "and": AndSpecification(contains, equals),
+            "or": OrSpecification(
+                EqualsSpecification("id", None),
+                EqualsSpecification("sponsor_id", None),
+                contains,
+            ),
+            "nested": AndSpecification(
+                OrSpecification(equals, contains),
+                InSpecification("sponsor_id", {bill.sponsor_id}),
+            ),
+        }
+
+
+def compare_results(
+    baseline: Iterable[BenchmarkResult],
+    current: Iterable[BenchmarkResult],
+    threshold: float,
+) -> list[Regression]:
+    """Compare benchmark results and return the regressions.
+
+    A result regresses when it is worse than the baseline by more than the
+    given threshold, expressed as a fraction of the baseline value.
+    """
+    baseline_dict = {result.key: result for result in baseline}
+    regressions: list[Regression] = []
+
+    for result in current:
+        try:
+            baseline_result = baseline_dict[result.key]
+        except KeyError:
+            continue
+
+        if not baseline_result.value:
+            continue
+
+        change = (result.value - baseline_result.value) / baseline_result.value
+        if result.higher_is_better:
+            change = -change
+
+        if change > threshold:
+            regressions.append(
+                Regression(
+                    name=result.name,
+                    size=result.size,
+                    metric=result.metric,
+                    baseline=baseline_result.value,
+                    current=result.value,
+                    change=change,
+                )
+            )
+
+    return regressions
+
+
+def dump_results(results: Iterable[BenchmarkResult]) -> dict[str, Any]:
+    """Dump benchmark results to a JSON serializable dict."""
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.time(),
+        },
+        "results": [asdict(result) for result in results],
+    }
+
+
+def load_results(data: dict[str, Any]) -> list[BenchmarkResult]:
+    """Load benchmark results from a JSON deserialized dict."""
+    return [BenchmarkResult(**result) for result in data["results"]]
@@ -0,0 +1,324 @@
+"""Generators."""
+
+from __future__ import annotations
+
+import csv
+import itertools
+import math
+import random
+from pathlib import Path
+from typing import Generator, TextIO
+
+from .enum import VoteType
+
+LEGISLATOR_ID_BASE = 400000
+BILL_ID_BASE = 2000000
+VOTE_ID_BASE = 3000000
+VOTE_RESULT_ID_BASE = 90000000
+
+PARTIES = ("D", "R", "I")
+PARTY_WEIGHTS = (0.49, 0.49, 0.02)
+
+FIRST_NAMES = (
+    "Adam",
+    "Alexandria",
+    "Andrew",
+    "Anthony",
+    "Ayanna",
+    "Brian",
+    "Chris",
+    "Cori",
+    "David",
+    "Don",
+    "Fred",
+    "Ilhan",
+    "Jamaal",
+    "Jeff",
+    "John",
+    "Nicole",
+    "Rashida",
+    "Tom",
+)
+LAST_NAMES = (
+    "Bacon",
+    "Bowman",
+    "Bush",
+    "Fitzpatrick",
+    "Garbarino",
+    "Gonzalez",
+    "Katko",
+    "Kinzinger",
+    "Malliotakis",
+    "McKinley",
+    "Omar",
+    "Pressley",
+    "Reed",
+    "Smith",
+    "Tlaib",
+    "Upton",
+    "Young",
+    "Yarmuth",
+)
+STATES = (
+    "AK",
+    "IL",
+    "KY",
+    "MA",
+    "MI",
+    "MN",
+    "MO",
+    "NE",
+    "NJ",
+    "NY",
+    "OH",
+    "PA",
+    "WV",
+)
+BILL_SUBJECTS = (
+    "Build Back Better Act",
+    "Infrastructure Investment and Jobs Act",
+    "Telehealth Modernization Act",
+    "Clean Water Act Amendments",
+    "Rural Broadband Expansion Act",
+    "Veterans Health Care Act",
+    "Small Business Relief Act",
+    "Energy Independence Act",
+)
+
+DATASET_FILE_NAMES = {
+    "legislators": "legislators.csv",
+    "bills": "bills.csv",
+    "votes": "votes.csv",
+    "vote_results": "vote_results.csv",
+}
+
+
+class DatasetGenerator:
+    """Synthetic dataset generator.
+
+    Deterministically generates linked legislators, bills, votes and vote
+    results. Rows are streamed to the output files, so memory usage only
+    grows with the number of legislators, not with the number of vote
+    results.
+    """
+
+    def __init__(
+        self,
+        vote_results: int,
+        legislators: int = 435,
+        votes_per_bill: float = 1.5,
+        turnout: float = 0.95,
+        party_discipline: float = 0.9,
+        sponsorship_skew: float = 1.1,
+        missing_rate: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        """Initialize generator."""
+        if vote_results < 1:
+            raise ValueError("The number of vote results must be positive.")
+        if legislators < 1:
+            raise ValueError("The number of legislators must be positive.")
+        if votes_per_bill <= 0:
+            raise ValueError("The number of votes per bill must be positive.")
+        for name, value in (
+            ("turnout", turnout),
+            ("party_discipline", party_discipline),
+            ("missing_rate", missing_rate),
+        ):
+            if not 0 <= value <= 1:
+                raise ValueError(f"'{name}' must be between 0 and 1.")
+        if turnout == 0:
+            raise ValueError("'turnout' must be greater than 0.")
+
+        self.vote_results = vote_results
+        self.legislators = legislators
+        self.votes_per_bill = votes_per_bill
+        self.turnout = turnout
+        self.party_discipline = party_discipline
+        self.sponsorship_skew = sponsorship_skew
+        self.missing_rate = missing_rate
+        self.seed = seed
+
+    @property
+    def votes(self) -> int:
+        """Return the expected number of votes."""
+        results_per_vote = max(1.0, self.legislators * self.turnout)
+        return math.ceil(self.vote_results / results_per_vote)
+
+    @property
+    def bills(self) -> int:
+        """Return the number of bills."""
+        return max(1, math.ceil(self.votes / self.votes_per_bill))
+
+    def write(self, output_dir: str | Path) -> dict[str, Path]:
+        """Write all datasets to a directory and return their paths."""
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        paths = {
+            name: output_dir / file_name
+            for name, file_name in DATASET_FILE_NAMES.items()
+        }
+        rng = random.Random(self.seed)
+        parties = self._choose_parties(rng)
+
+        with open(paths["legislators"], "w", newline="") as file:
+            self._write_rows(
+                file,
+                ("id", "name"),
+                self.iter_legislators(rng, parties),
+            )
+
+        with open(paths["bills"], "w", newline="") as file:
+            self._write_rows(
+                file,
+                ("id", "title", "sponsor_id"),
+                self.iter_bills(rng),
+            )
+
+        with (
+            open(paths["votes"], "w", newline="") as vote_file,
+            open(paths["vote_results"], "w", newline="") as vote_result_file,
+        ):
+            vote_writer = csv.writer(vote_file)
+            vote_writer.writerow(("id", "bill_id"))
+            vote_result_writer = csv.writer(vote_result_file)
+            vote_result_writer.writerow(
+                ("id", "legislator_id", "vote_id", "vote_type")
+            )
+            for vote_row, vote_result_rows in self.iter_votes(rng, parties):
+                vote_writer.writerow(vote_row)
+                vote_result_writer.writerows(vote_result_rows)
+
+        return paths
+
+    def iter_legislators(
+        self, rng: random.Random, parties: list[str]
+    ) -> Generator[tuple[int, str], None, None]:
+        """Generate legislator rows."""
+        for index, party in enumerate(parties):
+            name = "Rep. {} {} ({}-{}-{})".format(
+                rng.choice(FIRST_NAMES),
+                rng.choice(LAST_NAMES),
+                party,
+                rng.choice(STATES),
+                rng.randint(1, 20),
+            )
+            yield LEGISLATOR_ID_BASE + index, name
+
+    def iter_bills(
+        self, rng: random.Random
+    ) -> Generator[tuple[int, str, int], None, None]:
+        """Generate bill rows.
+
+        Sponsorship follows a Zipf-like distribution, so a few legislators
+        sponsor most of the bills.
+        """
+        ranking = list(range(self.legislators))
+        rng.shuffle(ranking)
+        cum_weights = list(
+            itertools.accumulate(
+                1 / (rank + 1) ** self.sponsorship_skew
+                for rank in range(self.legislators)
+            )
+        )
+
+        for index in range(self.bills):
+            if self._is_missing(rng):
+                sponsor_id = self._missing_id(LEGISLATOR_ID_BASE, index)
+            else:
+                rank = rng.choices(ranking, cum_weights=cum_weights)[0]
+                sponsor_id = LEGISLATOR_ID_BASE + rank
+
+            title = "H.R. {}: {}".format(index + 1, rng.choice(BILL_SUBJECTS))
+            yield BILL_ID_BASE + index, title, sponsor_id
+
+    def iter_votes(
+        self, rng: random.Random, parties: list[str]
+    ) -> Generator[
+        tuple[tuple[int, int], list[tuple[int, int, int, int]]], None, None
+    ]:
+        """Generate vote rows along with their vote result rows.
+
+        Each vote has a position per party and legislators follow their
+        party position with a probability given by the party discipline.
+        """
+        votes = self.votes
+        bills = self.bills
+        remaining = self.vote_results
+        vote_result_id = VOTE_RESULT_ID_BASE
+
+        for index in itertools.count():
+            if remaining <= 0:
+                break
+
+            vote_id = VOTE_ID_BASE + index
+            if self._is_missing(rng):
+                bill_id = self._missing_id(BILL_ID_BASE, index)
+            else:
+                bill_id = BILL_ID_BASE + min(index * bills // votes, bills - 1)
+
+            positions = self._choose_positions(rng)
+            vote_result_rows = []
+
+            for legislator_index, party in enumerate(parties):
+                if remaining <= 0:
+                    break
+                if rng.random() >= self.turnout:
+                    continue
+
+                vote_type = positions[party]
+                if rng.random() >= self.party_discipline:
+                    vote_type = self._flip(vote_type)
+
+                if self._is_missing(rng):
+                    legislator_id = self._missing_id(
+                        LEGISLATOR_ID_BASE, legislator_index
+                    )
+                else:
+                    legislator_id = LEGISLATOR_ID_BASE + legislator_index
+
+                result_vote_id = vote_id
+                if self._is_missing(rng):
+                    result_vote_id = self._missing_id(VOTE_ID_BASE, index)
+
+                vote_result_rows.append(
+                    (
+                        vote_result_id,
+                        legislator_id,
+                        result_vote_id,
+                        int(vote_type),
+                    )
+                )
+                vote_result_id += 1
+                remaining -= 1
+
+            yield (vote_id, bill_id), vote_result_rows
+
+    def _choose_parties(self, rng: random.Random) -> list[str]:
+        """Choose a party for each legislator."""
+        return rng.choices(PARTIES, weights=PARTY_WEIGHTS, k=self.legislators)
+
+    def _choose_positions(self, rng: random.Random) -> dict[str, VoteType]:
+        """Choose the position of each party on a vote."""
+        majority = VoteType.YES if rng.random() < 0.5 else VoteType.NO
+        minority = self._flip(majority) if rng.random() < 0.7 else majority
+        independent = VoteType.YES if rng.random() < 0.5 else VoteType.NO
+        return {"R": majority, "D": minority, "I": independent}
+
+    def _flip(self, vote_type: VoteType) -> VoteType:
+        """Return the opposite vote type."""
+        return VoteType.NO if vote_type == VoteType.YES else VoteType.YES
+
+    def _is_missing(self, rng: random.Random) -> bool:
+        """Check whether a foreign key should point to a missing row."""
+        return bool(self.missing_rate) and rng.random() < self.missing_rate
+
+    def _missing_id(self, id_base: int, index: int) -> int:
+        """Return an ID that doesn't exist in any dataset."""
+        return id_base - 1 - index % (id_base // 2)
+
+    def _write_rows(self, file: TextIO, header: tuple[str, ...], rows) -> None:
+        """Write CSV rows to a file."""
+        writer = csv.writer(file)
+        writer.writerow(header)
+        writer.writerows(rows)
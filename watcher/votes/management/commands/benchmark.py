@@ -0,0 +1,83 @@
+"""Benchmark command."""
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from watcher.votes.benchmarks import (
+    BenchmarkSuite,
+    compare_results,
+    dump_results,
+    load_results,
+)
+
+
+class Command(BaseCommand):
+    """Run the benchmark suite."""
+
+    help = (
+        "Benchmark repositories, specifications, services and views against "
+        "generated datasets, optionally comparing with a saved baseline."
+    )
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            "--sizes",
+            type=lambda value: [int(size) for size in value.split(",")],
+            default=[1000, 10000, 100000],
+            help="Comma-separated number of vote results of each dataset.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Number of times each benchmark is repeated.",
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Random seed.")
+        parser.add_argument(
+            "--output", help="Path of the JSON file to write results to."
+        )
+        parser.add_argument(
+            "--compare", help="Path of a baseline JSON file to compare with."
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.1,
+            help="Relative slowdown tolerated before flagging a regression.",
+        )
+
+    def handle(self, *args, **options):
+        """Handle command."""
+        suite = BenchmarkSuite(repeat=options["repeat"], seed=options["seed"])
+        results = suite.run(options["sizes"])
+
+        for result in results:
+            self.stdout.write(
+                f"{result.name} [{result.size}] {result.metric}: "
+                f"{result.value:.6g}"
+            )
+
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                json.dump(dump_results(results), file, indent=2)
+
+        if not options["compare"]:
+            return
+
+        with open(options["compare"]) as file:
+            baseline = load_results(json.load(file))
+
+        regressions = compare_results(baseline, results, options["threshold"])
+        for regression in regressions:
+            self.stderr.write(
+                f"Regression: {regression.name} [{regression.size}] "
+                f"{regression.metric}: {regression.baseline:.6g} -> "
+                f"{regression.current:.6g} ({regression.change:+.1%})"
+            )
+
+        if regressions:
+            raise CommandError(f"{len(regressions)} regression(s) found.")
+
+        self.stdout.write("No regressions found.")
@@ -0,0 +1,33 @@
+"""Build manifest command."""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from watcher.core.partitions import write_manifest
+
+
+class Command(BaseCommand):
+    """Build the partition manifest of a partitioned dataset."""
+
+    help = (
+        "Write the manifest of the partition CSV files of a directory, with "
+        "the ranges of their partition key fields."
+    )
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument("directory", help="Partition files directory.")
+        parser.add_argument(
+            "--fields",
+            nargs="+",
+            default=["id"],
+            help="Partition key fields.",
+        )
+
+    def handle(self, *args, **options):
+        """Handle command."""
+        try:
+            path = write_manifest(options["directory"], options["fields"])
+        except (OSError, ValueError) as err:
+            raise CommandError(str(err)) from err
+
+        self.stdout.write(f"Wrote {path}.")
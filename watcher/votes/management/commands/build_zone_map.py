@@ -0,0 +1,34 @@
+"""Build zone map command."""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from watcher.core.zonemaps import BLOCK_SIZE, write_zone_map
+
+
+class Command(BaseCommand):
+    """Build the zone maps of CSV files."""
+
+    help = (
+        "Write the zone map of uncompressed CSV files, with the ranges of "
+        "the values of their fields in each block, next to them."
+    )
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument("paths", nargs="+", help="CSV file paths.")
+        parser.add_argument(
+            "--block-size",
+            type=int,
+            default=BLOCK_SIZE,
+            help="Block size, in bytes.",
+        )
+
+    def handle(self, *args, **options):
+        """Handle command."""
+        for path in options["paths"]:
+            try:
+                zone_map_path = write_zone_map(path, options["block_size"])
+            except (OSError, ValueError) as err:
+                raise CommandError(str(err)) from err
+
+            self.stdout.write(f"Wrote {zone_map_path}.")
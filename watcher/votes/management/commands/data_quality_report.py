@@ -0,0 +1,36 @@
+"""Data quality report command."""
+
+import json
+from dataclasses import asdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from watcher.votes.repositories import (
+    BillCsvRepository,
+    LegislatorCsvRepository,
+    VoteCsvRepository,
+    VoteResultCsvRepository,
+)
+from watcher.votes.services import DataQualityService
+
+
+class Command(BaseCommand):
+    """Print the data quality report."""
+
+    help = "Report rows referencing IDs missing from other datasets."
+
+    def handle(self, *args, **options):
+        """Handle command."""
+        service = DataQualityService(
+            vote_repository=VoteCsvRepository(settings.MEDIA_FILES["votes"]),
+            vote_result_repository=VoteResultCsvRepository(
+                settings.MEDIA_FILES["vote_results"]
+            ),
+            bill_repository=BillCsvRepository(settings.MEDIA_FILES["bills"]),
+            legislator_repository=LegislatorCsvRepository(
+                settings.MEDIA_FILES["legislators"]
+            ),
+        )
+        report = service.get_report()
+        self.stdout.write(json.dumps(asdict(report), indent=2))
@@ -0,0 +1,81 @@
+"""Generate dataset command."""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from watcher.votes.generators import DatasetGenerator
+
+
+class Command(BaseCommand):
+    """Generate a synthetic dataset."""
+
+    help = (
+        "Generate linked legislators, bills, votes and vote results CSV "
+        "files at a given scale."
+    )
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument("output_dir", help="Output directory.")
+        parser.add_argument(
+            "--vote-results",
+            type=int,
+            default=10000,
+            help="Number of vote results to generate.",
+        )
+        parser.add_argument(
+            "--legislators",
+            type=int,
+            default=435,
+            help="Number of legislators to generate.",
+        )
+        parser.add_argument(
+            "--votes-per-bill",
+            type=float,
+            default=1.5,
+            help="Average number of votes per bill.",
+        )
+        parser.add_argument(
+            "--turnout",
+            type=float,
+            default=0.95,
+            help="Probability that a legislator takes part in a vote.",
+        )
+        parser.add_argument(
+            "--party-discipline",
+            type=float,
+            default=0.9,
+            help="Probability that a legislator votes along party lines.",
+        )
+        parser.add_argument(
+            "--sponsorship-skew",
+            type=float,
+            default=1.1,
+            help="Zipf exponent of the bill sponsorship distribution.",
+        )
+        parser.add_argument(
+            "--missing-rate",
+            type=float,
+            default=0.0,
+            help="Probability that a foreign key points to a missing row.",
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Random seed.")
+
+    def handle(self, *args, **options):
+        """Handle command."""
+        try:
+            generator = DatasetGenerator(
+                vote_results=options["vote_results"],
+                legislators=options["legislators"],
+                votes_per_bill=options["votes_per_bill"],
+                turnout=options["turnout"],
+                party_discipline=options["party_discipline"],
+                sponsorship_skew=options["sponsorship_skew"],
+                missing_rate=options["missing_rate"],
+                seed=options["seed"],
+            )
+        except ValueError as err:
+            raise CommandError(str(err)) from err
+
+        paths = generator.write(options["output_dir"])
+        for name, path in paths.items():
+            self.stdout.write(f"{name}: {path}")
@@ -0,0 +1,37 @@
+"""Publish datasets command."""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from watcher.core.shared import get_shared_store
+from watcher.votes.warmup import publish_datasets
+
+
+class Command(BaseCommand):
+    """Publish the datasets in shared memory."""
+
+    help = (
+        "Load the datasets once and publish them in shared memory, for "
+        "worker processes to attach."
+    )
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            "--unlink",
+            action="store_true",
+            help="Remove the published datasets from shared memory instead.",
+        )
+
+    def handle(self, *args, **options):
+        """Handle command."""
+        store = get_shared_store()
+        if store is None:
+            raise CommandError("Shared datasets are disabled.")
+
+        if options["unlink"]:
+            store.unlink()
+            self.stdout.write("Removed the published datasets.")
+            return
+
+        for file_path in publish_datasets(store):
+            self.stdout.write(f"Published {file_path}.")
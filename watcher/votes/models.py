@@ -1,6 +1,9 @@
 """Models."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Sequence
+
+from watcher.core.bitsets import Bitset
 
 from .enum import VoteType
 
@@ -60,3 +63,128 @@ class BillVoteSummary:
     sponsor_name: str
     supporters: int = 0
     opposers: int = 0
+
+
+@dataclass
+class BillVoteDetail:
+    """Bill vote detail.
+
+    Vote result cast on a vote of a bill.
+    """
+
+    vote_id: int
+    vote_result_id: int
+    legislator_id: int
+    legislator_name: str
+    vote_type: VoteType
+
+
+@dataclass
+class LegislatorVoteDetail:
+    """Legislator vote detail.
+
+    Vote result cast by a legislator.
+    """
+
+    vote_result_id: int
+    vote_id: int
+    bill_id: int | None
+    bill_title: str
+    vote_type: VoteType
+
+
+@dataclass
+class LegislatorAgreement:
+    """Legislator agreement.
+
+    How often a legislator voted the same way as another legislator on the
+    votes both of them cast.
+    """
+
+    legislator_id: int
+    legislator_name: str
+    other_legislator_id: int
+    other_legislator_name: str
+    alignment: str
+    shared_votes: int = 0
+    agreements: int = 0
+    agreement_rate: float = 0.0
+
+
+@dataclass
+class AgreementMatrix:
+    """Agreement matrix.
+
+    Square legislator by legislator matrices, stored row-major, of the
+    number of votes each pair cast and agreed on, and the other legislators
+    of each legislator ranked by agreement rate, then by shared votes,
+    stored back to back from the offset of each legislator.
+    """
+
+    legislator_ids: list[int]
+    legislator_names: list[str]
+    shared_votes: Sequence[int]
+    agreements: Sequence[int]
+    rankings: Sequence[int]
+    ranking_offsets: Sequence[int]
+
+
+@dataclass
+class LegislatorVoteAggregate:
+    """Legislator vote aggregate.
+
+    Bills each legislator supported and opposed, as bitsets of dense bill
+    indexes, the number of vote results of each legislator, and the number
+    of vote results of missing votes.
+    """
+
+    legislator_votes: dict[int, tuple[Bitset, Bitset]]
+    bill_indexes: dict[int, int]
+    dangling_votes: int = 0
+    vote_results: dict[int, int] = field(default_factory=dict)
+
+
+@dataclass
+class BillVoteAggregate:
+    """Bill vote aggregate.
+
+    Number of supporters and opposers of each bill, and the number of vote
+    results of missing votes.
+    """
+
+    bill_votes: dict[int, list[int]]
+    dangling_votes: int = 0
+
+
+@dataclass
+class VoteSummaryDelta:
+    """Vote summary delta.
+
+    Vote summaries changed by appended vote results, as of a version.
+    """
+
+    event: str
+    version: str | None
+    summaries: Sequence[LegislatorVoteSummary | BillVoteSummary]
+
+
+@dataclass
+class DanglingReferences:
+    """Dangling references.
+
+    Rows of a dataset referencing IDs missing from another dataset.
+    """
+
+    kind: str
+    source: str
+    target: str
+    rows: int = 0
+    missing_ids: dict[int, int] = field(default_factory=dict)
+
+
+@dataclass
+class DataQualityReport:
+    """Data quality report."""
+
+    version: str | None
+    dangling_references: list[DanglingReferences]
@@ -1,6 +1,6 @@
 """Repositories."""
 
-from watcher.core.repositories import CsvReadRepository
+from watcher.core.repositories import CsvReadRepository, CsvRepository
 
 from .enum import VoteType
 from .models import Bill, Vote, VoteResult, Person
@@ -34,7 +34,7 @@ class VoteCsvRepository(CsvReadRepository[Vote]):
         return Vote(id=int(data["id"]), bill_id=int(data["bill_id"]))
 
 
-class VoteResultCsvRepository(CsvReadRepository[VoteResult]):
+class VoteResultCsvRepository(CsvRepository[VoteResult]):
     """Vote result CSV repository."""
 
     def build_item(self, data: dict) -> VoteResult:
@@ -45,3 +45,12 @@ class VoteResultCsvRepository(CsvReadRepository[VoteResult]):
             vote_id=int(data["vote_id"]),
             vote_type=VoteType(int(data["vote_type"])),
         )
+
+    def serialize_item(self, item: VoteResult) -> dict:
+        """Serialize item to dict."""
+        return {
+            "id": item.id,
+            "legislator_id": item.legislator_id,
+            "vote_id": item.vote_id,
+            "vote_type": int(item.vote_type),
+        }
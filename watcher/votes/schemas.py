@@ -68,3 +68,19 @@ class BillVoteSummaryQueryParams(BaseModel):
     supporters: list[int] | None = Field(title="Supporters", default=None)
     opposers: list[int] | None = Field(title="Opposers", default=None)
     model_config = ConfigDict(extra="ignore")
+
+
+class LegislatorAgreementQueryParams(BaseModel):
+    """Legislator agreement query params."""
+
+    legislator_id: list[int] | None = Field(
+        title="Legislator ID", default=None
+    )
+    legislator_name: list[str] | None = Field(
+        title="Legislator name", default=None
+    )
+    other_legislator_id: list[int] | None = Field(
+        title="Other legislator ID", default=None
+    )
+    alignment: list[str] | None = Field(title="Alignment", default=None)
+    model_config = ConfigDict(extra="ignore")
@@ -1,25 +1,148 @@
 """Services."""
 
+import itertools
 import logging
+import operator
+from array import array
+from typing import Any, Callable, Generator, Iterable, Sequence, TypeVar
 
-from watcher.core.repositories import ReadRepository
-from watcher.core.specifications import Specification
+import numpy as np
+
+from watcher.core.bitsets import Bitset
+from watcher.core.caches import LRUCache
+from watcher.core.feeds import Feed
+from watcher.core.instrumentation import increment, phase
+from watcher.core.joins import HashJoin, JoinType
+from watcher.core.metrics import SPECIFICATION_EVALUATIONS
+from watcher.core.repositories import CsvRepository, ReadRepository
+from watcher.core.specifications import (
+    AndSpecification,
+    Specification,
+    get_conjuncts,
+    get_fields,
+    get_lookup_values,
+)
 
 from .enum import VoteType
 from .models import (
+    AgreementMatrix,
     Bill,
+    BillVoteAggregate,
+    BillVoteDetail,
     BillVoteSummary,
+    DanglingReferences,
+    DataQualityReport,
+    LegislatorAgreement,
+    LegislatorVoteAggregate,
+    LegislatorVoteDetail,
     LegislatorVoteSummary,
     Person,
     Vote,
     VoteResult,
+    VoteSummaryDelta,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+S = TypeVar("S")
+
+
+def _log_dangling_references(
+    summary_name: str, dangling_references: dict[str, int]
+) -> None:
+    """Log the number of dangling references found in a summary run."""
+    total = sum(dangling_references.values())
+    if not total:
+        return
+
+    increment("dangling_references", total)
+    _LOGGER.debug(
+        "Dangling references in %s: %s",
+        summary_name,
+        ", ".join(
+            f"{kind}={count}" for kind, count in dangling_references.items()
+        ),
+    )
+
+
+def _get_sponsor_id(bill_pair: tuple[Any, Bill | None]) -> int | None:
+    """Get the sponsor ID of the bill of a joined pair, if any."""
+    bill = bill_pair[1]
+    return None if bill is None else bill.sponsor_id
+
+
+def _select_keys(
+    spec: Specification | None,
+    key_field: str,
+    identity_fields: frozenset[str],
+    iter_identities: Callable[[], Iterable[S]],
+    placeholder: S,
+) -> frozenset | None:
+    """Select the keys of the summaries a specification may be satisfied by.
+
+    Lookups of the key field select keys as they are. Other conjuncts on
+    identity fields are resolved through the summaries of the identities
+    of a dimension table, unless they can be satisfied by the placeholder
+    summary of dangling references. Returns None if every summary may
+    satisfy the specification, which is still applied to the summaries.
+    """
+    if spec is None:
+        return None
+
+    keys = None
+    identity_conjuncts = []
+    for conjunct in get_conjuncts(spec):
+        fields = get_fields(conjunct)
+        if fields is None or not fields <= identity_fields:
+            continue
+
+        values = get_lookup_values(conjunct, key_field)
+        if values is not None:
+            keys = values if keys is None else keys & values
+        elif key_field not in fields:
+            identity_conjuncts.append(conjunct)
+
+    if keys is not None:
+        return keys
+    if not identity_conjuncts:
+        return None
+
+    identity_spec = AndSpecification(*identity_conjuncts)
+    if identity_spec.is_satisfied_by(placeholder):
+        return None
+    return frozenset(
+        getattr(identity, key_field)
+        for identity in iter_identities()
+        if identity_spec.is_satisfied_by(identity)
+    )
+
+
+def _get_version(*repositories: ReadRepository) -> str | None:
+    """Get the combined version of several datasets."""
+    versions = [repository.get_version() for repository in repositories]
+    if None in versions:
+        return None
+    return ":".join(versions)  # type: ignore
+
+
+def _to_array(typecode: str, values: np.ndarray) -> array:
+    """Convert a numpy array into a flat array of the same C type."""
+    result = array(typecode)
+    result.frombytes(values.astype(np.dtype(typecode)).tobytes())
+    return result
+
 
 class LegislatorVoteSummaryService:
-    """Legislator vote summary service."""
+    """Legislator vote summary service.
+
+    Aggregates of all vote results are cached per dataset version, and
+    carried over to the next version when vote results are appended.
+    """
+
+    aggregate_cache: LRUCache[tuple[str, ...], LegislatorVoteAggregate] = (
+        LRUCache("legislator_vote_aggregates", 4)
+    )
+    feed_event = "legislators_votes"
 
     def __init__(
         self,
@@ -32,58 +155,420 @@ class LegislatorVoteSummaryService:
         self.vote_result_repository = vote_result_repository
         self.legislator_repository = legislator_repository
 
+    def get_version(self) -> str | None:
+        """Get the combined version of the summarized datasets."""
+        return _get_version(
+            self.vote_repository,
+            self.vote_result_repository,
+            self.legislator_repository,
+        )
+
     def summarize_votes(
         self, spec: Specification | None = None
     ) -> list[LegislatorVoteSummary]:
         """Summarize vote results into legislator vote summary list."""
-        vote_result_list = self.vote_result_repository.get_all()
-        vote_dict = self.vote_repository.get_dict()
-        legislator_dict = self.legislator_repository.get_dict()
-        legislator_vote_dict: dict[int, tuple[set[int], set[int]]] = {}
-        vote_summary_list: list[LegislatorVoteSummary] = []
+        with phase("aggregate"):
+            vote_summary_list = list(self.iter_vote_summaries(spec))
+        increment("objects_built", len(vote_summary_list))
+        return vote_summary_list
 
-        for vote_result in vote_result_list:
+    def iter_vote_summaries(
+        self, spec: Specification | None = None
+    ) -> Generator[LegislatorVoteSummary, None, None]:
+        """Generate legislator vote summaries matching a specification.
+
+        Filters on legislators are pushed down to the vote results, if
+        loaded in memory.
+        """
+        vote_results = self._select_vote_results(spec)
+        if vote_results is self.vote_result_repository:
+            aggregate = self.get_aggregate()
+        else:
+            aggregate = self.build_aggregate(vote_results)
+        yield from self._iter_aggregate_summaries(aggregate, spec)
+
+    def summarize_changes(
+        self, legislator_ids: Iterable[int]
+    ) -> list[LegislatorVoteSummary]:
+        """Summarize the votes of legislators from the cached aggregate."""
+        return list(
+            self._iter_aggregate_summaries(
+                self.get_aggregate(), keys=legislator_ids
+            )
+        )
+
+    def _iter_aggregate_summaries(
+        self,
+        aggregate: LegislatorVoteAggregate,
+        spec: Specification | None = None,
+        keys: Iterable[int] | None = None,
+    ) -> Generator[LegislatorVoteSummary, None, None]:
+        """Generate the legislator vote summaries of an aggregate."""
+        legislator_vote_dict = aggregate.legislator_votes
+        legislator_vote_items: Iterable[tuple[int, tuple[Bitset, Bitset]]]
+        if keys is None:
+            legislator_vote_items = legislator_vote_dict.items()
+        else:
+            legislator_vote_items = [
+                (key, legislator_vote_dict[key])
+                for key in sorted(keys)
+                if key in legislator_vote_dict
+            ]
+
+        if spec:
+            SPECIFICATION_EVALUATIONS.inc(
+                len(legislator_vote_dict), dataset="legislator_vote_summary"
+            )
+
+        legislators = HashJoin(
+            legislator_vote_items,
+            self.legislator_repository,
+            operator.itemgetter(0),
+            "id",
+            JoinType.LEFT_OUTER,
+        )
+        dangling_references = {
+            "vote": aggregate.dangling_votes,
+            "legislator": 0,
+        }
+
+        # Dangling references are counted once per vote result, also when
+        # generation stops early.
+        try:
+            for (legislator_id, legislator_votes), legislator in legislators:
+                if legislator is None:
+                    vote_results = aggregate.vote_results.get(legislator_id, 0)
+                    dangling_references["legislator"] += vote_results
+                    legislator_name = "N/A"
+                else:
+                    legislator_name = legislator.name
+
+                supported_bills, opposed_bills = legislator_votes
+                vote_summary = LegislatorVoteSummary(
+                    legislator_id=legislator_id,
+                    legislator_name=legislator_name,
+                    supported_bills=len(supported_bills),
+                    opposed_bills=len(opposed_bills),
+                )
+
+                if spec and not spec.is_satisfied_by(vote_summary):
+                    continue
+
+                yield vote_summary
+        finally:
+            _log_dangling_references(
+                "legislator vote summary", dangling_references
+            )
+
+    def get_aggregate(self) -> LegislatorVoteAggregate:
+        """Get the aggregate of all vote results, cached per version."""
+        version = self.get_version()
+        if version is None:
+            return self.build_aggregate(self.vote_result_repository)
+        return self.aggregate_cache.get_or_set(
+            (version,),
+            lambda: self.build_aggregate(self.vote_result_repository),
+        )
+
+    def build_aggregate(
+        self,
+        vote_results: ReadRepository[VoteResult] | Iterable[VoteResult],
+        aggregate: LegislatorVoteAggregate | None = None,
+        touched: set[int] | None = None,
+    ) -> LegislatorVoteAggregate:
+        """Aggregate vote results, optionally into an existing aggregate.
+
+        Keys of the aggregate updated are added to the touched set, if any.
+        """
+        if aggregate is None:
+            aggregate = LegislatorVoteAggregate(
+                legislator_votes={}, bill_indexes={}
+            )
+        vote_result_pairs = HashJoin(
+            vote_results, self.vote_repository, "vote_id", "id"
+        )
+        legislator_vote_dict = aggregate.legislator_votes
+        vote_result_counts = aggregate.vote_results
+
+        # Bills are numbered densely, so bill sets can be stored as bitsets.
+        bill_indexes = aggregate.bill_indexes
+
+        for vote_result, vote in vote_result_pairs:
             try:
-                vote = vote_dict[vote_result.vote_id]
+                bill_index = bill_indexes[vote.bill_id]
+            except KeyError:
+                bill_index = bill_indexes[vote.bill_id] = len(bill_indexes)
+
+            try:
+                supported_bills, opposed_bills = legislator_vote_dict[
+                    vote_result.legislator_id
+                ]
             except KeyError:
-                _LOGGER.debug("Vote not found: %s", vote_result.vote_id)
-                continue
+                supported_bills, opposed_bills = legislator_vote_dict[
+                    vote_result.legislator_id
+                ] = (Bitset(), Bitset())
 
-            supported_bills, opposed_bills = legislator_vote_dict.setdefault(
-                vote_result.legislator_id, (set(), set())
+            if vote_result.vote_type == VoteType.YES:
+                supported_bills.add(bill_index)
+            else:
+                opposed_bills.add(bill_index)
+            vote_result_counts[vote_result.legislator_id] = (
+                vote_result_counts.get(vote_result.legislator_id, 0) + 1
             )
 
+            if touched is not None:
+                touched.add(vote_result.legislator_id)
+
+        aggregate.dangling_votes += vote_result_pairs.unmatched
+        return aggregate
+
+    def apply_vote_results(
+        self, version: str, vote_results: Sequence[VoteResult]
+    ) -> set[int]:
+        """Carry the aggregate of a version over to the current version.
+
+        The appended vote results are added to a copy of the aggregate, so
+        readers of the previous version aren't affected. Returns the keys
+        of the summaries changed, if the aggregate was carried over.
+        """
+        touched: set[int] = set()
+        aggregate = self.aggregate_cache.pop((version,))
+        new_version = self.get_version()
+        if aggregate is None or new_version is None:
+            return touched
+
+        aggregate = LegislatorVoteAggregate(
+            legislator_votes={
+                legislator_id: (supported_bills.copy(), opposed_bills.copy())
+                for legislator_id, (
+                    supported_bills,
+                    opposed_bills,
+                ) in aggregate.legislator_votes.items()
+            },
+            bill_indexes=dict(aggregate.bill_indexes),
+            dangling_votes=aggregate.dangling_votes,
+            vote_results=dict(aggregate.vote_results),
+        )
+        self.aggregate_cache.set(
+            (new_version,),
+            self.build_aggregate(vote_results, aggregate, touched),
+        )
+        return touched
+
+    def _select_vote_results(
+        self, spec: Specification | None
+    ) -> ReadRepository[VoteResult] | list[VoteResult]:
+        """Select the vote results of the legislators a spec may match."""
+        legislator_ids = _select_keys(
+            spec,
+            "legislator_id",
+            frozenset(("legislator_id", "legislator_name")),
+            lambda: (
+                LegislatorVoteSummary(
+                    legislator_id=legislator.id,
+                    legislator_name=legislator.name,
+                )
+                for legislator in self.legislator_repository.get_all()
+            ),
+            LegislatorVoteSummary(legislator_id=0, legislator_name="N/A"),
+        )
+        if legislator_ids is None:
+            return self.vote_result_repository
+
+        # Vote results are only selected in memory, as reading them would
+        # take a scan, while the aggregate of all of them is cached.
+        vote_results = self.vote_result_repository.get_many_by_values(
+            "legislator_id", legislator_ids
+        )
+        if vote_results is None:
+            return self.vote_result_repository
+        return vote_results
+
+
+class LegislatorAgreementService:
+    """Legislator agreement service.
+
+    Counts, for each pair of legislators, the votes both of them cast and
+    the votes they agreed on, as the product of the legislator by vote
+    matrix of yes (+1) and no (-1) votes with its transpose. Matrix rows
+    are bitsets, so each pair takes a few popcounts instead of a loop over
+    votes. Matrices are cached per dataset version.
+    """
+
+    matrix_cache: LRUCache[tuple[str, ...], AgreementMatrix] = LRUCache(
+        "legislator_agreement_matrix", max_size=4
+    )
+
+    def __init__(
+        self,
+        vote_result_repository: ReadRepository[VoteResult],
+        legislator_repository: ReadRepository[Person],
+    ) -> None:
+        """Initialize service."""
+        self.vote_result_repository = vote_result_repository
+        self.legislator_repository = legislator_repository
+
+    def get_version(self) -> str | None:
+        """Get the combined version of the datasets of the matrix."""
+        return _get_version(
+            self.vote_result_repository, self.legislator_repository
+        )
+
+    def get_matrix(self) -> AgreementMatrix:
+        """Get the agreement matrix of the current dataset version."""
+        version = self.get_version()
+        if version is None:
+            return self.build_matrix()
+
+        return self.matrix_cache.get_or_set((version,), self.build_matrix)
+
+    def build_matrix(self) -> AgreementMatrix:
+        """Build the agreement matrix.
+
+        Votes are laid out as legislator by vote matrices of the votes
+        each legislator cast and voted yes or no on, so the votes each
+        pair shared and agreed on are matrix products.
+        """
+        vote_indexes: dict[int, int] = {}
+        legislator_indexes: dict[int, int] = {}
+        yes_cells: tuple[list[int], list[int]] = ([], [])
+        no_cells: tuple[list[int], list[int]] = ([], [])
+        for vote_result in self.vote_result_repository.get_all():
+            vote_index = vote_indexes.setdefault(
+                vote_result.vote_id, len(vote_indexes)
+            )
+            legislator_index = legislator_indexes.setdefault(
+                vote_result.legislator_id, len(legislator_indexes)
+            )
             if vote_result.vote_type == VoteType.YES:
-                supported_bills.add(vote.bill_id)
+                cells = yes_cells
             else:
-                opposed_bills.add(vote.bill_id)
+                cells = no_cells
+            cells[0].append(legislator_index)
+            cells[1].append(vote_index)
 
-        for legislator_id, legislator_votes in legislator_vote_dict.items():
+        legislator_dict = self.legislator_repository.get_dict()
+        legislator_ids = list(legislator_indexes)
+        legislator_names = []
+        for legislator_id in legislator_ids:
             try:
-                legislator = legislator_dict[legislator_id]
-                legislator_name = legislator.name
+                legislator_names.append(legislator_dict[legislator_id].name)
             except KeyError:
-                _LOGGER.debug("Legislator not found: %s", legislator_id)
-                legislator_name = "N/A"
+                legislator_names.append("N/A")
 
-            supported_bills, opposed_bills = legislator_votes
-            vote_summary = LegislatorVoteSummary(
-                legislator_id=legislator_id,
-                legislator_name=legislator_name,
-                supported_bills=len(supported_bills),
-                opposed_bills=len(opposed_bills),
+        # Counts are exact in single precision up to 2 ** 24 votes, and
+        # products of floating point matrices are much faster than of
+        # integer ones.
+        size = len(legislator_ids)
+        yes = np.zeros((size, len(vote_indexes)), dtype=np.float32)
+        yes[yes_cells] = 1
+        cast = yes.copy()
+        cast[no_cells] = 1
+        # Two legislators agreed on the votes both cast but one of them
+        # only voted yes on, even if the other also voted no on them.
+        no = cast - yes
+        shared_matrix = (cast @ cast.T).astype(np.int32)
+        agreement_matrix = (yes @ yes.T + no @ no.T).astype(np.int32)
+
+        # The other legislators of each legislator are ranked by agreement
+        # rate, then by shared votes, then in order. Legislators sharing
+        # no votes aren't ranked, so they're sorted last and cut off.
+        candidates = shared_matrix > 0
+        np.fill_diagonal(candidates, False)
+        agreement_rates = agreement_matrix / np.maximum(shared_matrix, 1)
+        order = np.lexsort(
+            (-shared_matrix, np.where(candidates, -agreement_rates, np.inf))
+        )
+        counts = candidates.sum(axis=1)
+        ranked = np.arange(size) < counts[:, np.newaxis]
+        ranking_offsets = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(counts, out=ranking_offsets[1:])
+
+        return AgreementMatrix(
+            legislator_ids=legislator_ids,
+            legislator_names=legislator_names,
+            shared_votes=_to_array("i", shared_matrix),
+            agreements=_to_array("i", agreement_matrix),
+            rankings=_to_array("i", order[ranked]),
+            ranking_offsets=_to_array("q", ranking_offsets),
+        )
+
+    def get_agreements(
+        self, k: int = 5, min_votes: int = 1, spec: Specification | None = None
+    ) -> list[LegislatorAgreement]:
+        """Get the most and least aligned legislators of each legislator."""
+        with phase("aggregate"):
+            agreement_list = list(self.iter_agreements(k, min_votes, spec))
+        increment("objects_built", len(agreement_list))
+        return agreement_list
+
+    def iter_agreements(
+        self, k: int = 5, min_votes: int = 1, spec: Specification | None = None
+    ) -> Generator[LegislatorAgreement, None, None]:
+        """Generate the top k most and least aligned pairs of legislators.
+
+        Only pairs sharing at least a minimum number of votes, and
+        satisfying the specification, are ranked.
+        """
+        matrix = self.get_matrix()
+        legislator_ids = matrix.legislator_ids
+        legislator_names = matrix.legislator_names
+        size = len(legislator_ids)
+        min_votes = max(min_votes, 1)
+
+        ranking_view = memoryview(matrix.rankings)  # type: ignore
+        ranking_offsets = matrix.ranking_offsets
+        for i in range(size):
+            row = i * size
+            start, end = ranking_offsets[i], ranking_offsets[i + 1]
+            ranking = ranking_view[start:end]
+            rankings = (
+                ("most", ranking),
+                ("least", reversed(ranking)),
             )
+            for alignment, ranked_indexes in rankings:
+                ranked = 0
+                for j in ranked_indexes:
+                    if ranked == k:
+                        break
 
-            if spec and not spec.is_satisfied_by(vote_summary):
-                continue
+                    shared = matrix.shared_votes[row + j]
+                    if shared < min_votes:
+                        continue
 
-            vote_summary_list.append(vote_summary)
+                    agreements = matrix.agreements[row + j]
+                    agreement = LegislatorAgreement(
+                        legislator_id=legislator_ids[i],
+                        legislator_name=legislator_names[i],
+                        other_legislator_id=legislator_ids[j],
+                        other_legislator_name=legislator_names[j],
+                        alignment=alignment,
+                        shared_votes=shared,
+                        agreements=agreements,
+                        agreement_rate=agreements / shared,
+                    )
+                    if spec:
+                        SPECIFICATION_EVALUATIONS.inc(
+                            dataset="legislator_agreement"
+                        )
+                        if not spec.is_satisfied_by(agreement):
+                            continue
 
-        return vote_summary_list
+                    ranked += 1
+                    yield agreement
 
 
 class BillVoteSummaryService:
-    """Bill vote summary service."""
+    """Bill vote summary service.
+
+    Aggregates of all vote results are cached per dataset version, and
+    carried over to the next version when vote results are appended.
+    """
+
+    aggregate_cache: LRUCache[tuple[str, ...], BillVoteAggregate] = LRUCache(
+        "bill_vote_aggregates", 4
+    )
+    feed_event = "bills_votes"
 
     def __init__(
         self,
@@ -98,64 +583,544 @@ class BillVoteSummaryService:
         self.bill_repository = bill_repository
         self.legislator_repository = legislator_repository
 
+    def get_version(self) -> str | None:
+        """Get the combined version of the summarized datasets."""
+        return _get_version(
+            self.vote_repository,
+            self.vote_result_repository,
+            self.bill_repository,
+            self.legislator_repository,
+        )
+
     def summarize_votes(
         self, spec: Specification | None = None
     ) -> list[BillVoteSummary]:
         """Summarize vote results into bill vote summary list."""
-        vote_summary_dict: dict[int, BillVoteSummary] = {}
-        vote_dict = self.vote_repository.get_dict()
-        vote_result_list = self.vote_result_repository.get_all()
-        bill_dict = self.bill_repository.get_dict()
-        legislator_dict = self.legislator_repository.get_dict()
+        with phase("aggregate"):
+            vote_summary_list = list(self.iter_vote_summaries(spec))
+        increment("objects_built", len(vote_summary_list))
+        return vote_summary_list
 
-        for vote_result in vote_result_list:
-            try:
-                vote = vote_dict[vote_result.vote_id]
-            except KeyError:
-                _LOGGER.debug("Vote not found: %s", vote_result.vote_id)
-                continue
+    def iter_vote_summaries(
+        self, spec: Specification | None = None
+    ) -> Generator[BillVoteSummary, None, None]:
+        """Generate bill vote summaries matching a specification.
 
-            try:
-                bill = bill_dict[vote.bill_id]
-                bill_id = bill.id
-                bill_title = bill.title
-            except KeyError:
-                _LOGGER.debug("Bill not found: %s", vote.bill_id)
-                bill_id = vote.bill_id
+        Filters on bills and sponsors are pushed down to the vote results,
+        if loaded in memory.
+        """
+        vote_results = self._select_vote_results(spec)
+        if vote_results is self.vote_result_repository:
+            aggregate = self.get_aggregate()
+        else:
+            aggregate = self.build_aggregate(vote_results)
+        yield from self._iter_aggregate_summaries(aggregate, spec)
+
+    def summarize_changes(
+        self, bill_ids: Iterable[int]
+    ) -> list[BillVoteSummary]:
+        """Summarize the votes of bills from the cached aggregate."""
+        return list(
+            self._iter_aggregate_summaries(self.get_aggregate(), keys=bill_ids)
+        )
+
+    def _iter_aggregate_summaries(
+        self,
+        aggregate: BillVoteAggregate,
+        spec: Specification | None = None,
+        keys: Iterable[int] | None = None,
+    ) -> Generator[BillVoteSummary, None, None]:
+        """Generate the bill vote summaries of an aggregate."""
+        bill_vote_items: Iterable[tuple[int, list[int]]]
+        if keys is None:
+            bill_vote_items = aggregate.bill_votes.items()
+        else:
+            bill_vote_items = [
+                (key, aggregate.bill_votes[key])
+                for key in sorted(keys)
+                if key in aggregate.bill_votes
+            ]
+
+        bills = HashJoin(
+            bill_vote_items,
+            self.bill_repository,
+            operator.itemgetter(0),
+            "id",
+            JoinType.LEFT_OUTER,
+        )
+        sponsors = HashJoin(
+            bills,
+            self.legislator_repository,
+            _get_sponsor_id,
+            "id",
+            JoinType.LEFT_OUTER,
+        )
+        vote_summary_list: list[BillVoteSummary] = []
+        dangling_references = {
+            "vote": aggregate.dangling_votes,
+            "bill": 0,
+            "sponsor": 0,
+        }
+
+        # Dangling references are counted once per vote result.
+        for ((bill_id, bill_votes), bill), sponsor in sponsors:
+            supporters, opposers = bill_votes
+            if bill is None:
+                dangling_references["bill"] += supporters + opposers
                 bill_title = "N/A"
                 sponsor_id = None
                 sponsor_name = "N/A"
             else:
-                try:
-                    sponsor = legislator_dict[bill.sponsor_id]
-                    sponsor_id = sponsor.id
-                    sponsor_name = sponsor.name
-                except KeyError:
-                    _LOGGER.debug("Sponsor not found: %s", bill.sponsor_id)
-                    sponsor_id = bill.sponsor_id
+                bill_title = bill.title
+                sponsor_id = bill.sponsor_id
+                if sponsor is None:
+                    dangling_references["sponsor"] += supporters + opposers
                     sponsor_name = "N/A"
+                else:
+                    sponsor_name = sponsor.name
 
-            try:
-                vote_summary = vote_summary_dict[bill_id]
-            except KeyError:
-                vote_summary = BillVoteSummary(
+            vote_summary_list.append(
+                BillVoteSummary(
                     bill_id=bill_id,
                     bill_title=bill_title,
                     sponsor_id=sponsor_id,
                     sponsor_name=sponsor_name,
+                    supporters=supporters,
+                    opposers=opposers,
                 )
-                vote_summary_dict[bill_id] = vote_summary
+            )
+
+        _log_dangling_references("bill vote summary", dangling_references)
+
+        if not spec:
+            yield from vote_summary_list
+            return
+
+        SPECIFICATION_EVALUATIONS.inc(
+            len(vote_summary_list), dataset="bill_vote_summary"
+        )
+        for vote_summary in vote_summary_list:
+            if spec.is_satisfied_by(vote_summary):
+                yield vote_summary
+
+    def _select_vote_results(
+        self, spec: Specification | None
+    ) -> ReadRepository[VoteResult] | list[VoteResult]:
+        """Select the vote results of the bills a spec may match."""
+        bill_ids = _select_keys(
+            spec,
+            "bill_id",
+            frozenset(("bill_id", "bill_title", "sponsor_id", "sponsor_name")),
+            self._iter_bill_identities,
+            BillVoteSummary(
+                bill_id=0,
+                bill_title="N/A",
+                sponsor_id=None,
+                sponsor_name="N/A",
+            ),
+        )
+        if bill_ids is None:
+            return self.vote_result_repository
+
+        # Vote results are only selected in memory, as reading them would
+        # take a scan, while the aggregate of all of them is cached.
+        vote_index = self.vote_repository.get_index("bill_id")
+        vote_results = self.vote_result_repository.get_many_by_values(
+            "vote_id",
+            [
+                vote_id
+                for bill_id in bill_ids
+                for vote_id in vote_index.get(bill_id, ())
+            ],
+        )
+        if vote_results is None:
+            return self.vote_result_repository
+        return vote_results
+
+    def get_aggregate(self) -> BillVoteAggregate:
+        """Get the aggregate of all vote results, cached per version."""
+        version = self.get_version()
+        if version is None:
+            return self.build_aggregate(self.vote_result_repository)
+        return self.aggregate_cache.get_or_set(
+            (version,),
+            lambda: self.build_aggregate(self.vote_result_repository),
+        )
+
+    def build_aggregate(
+        self,
+        vote_results: ReadRepository[VoteResult] | Iterable[VoteResult],
+        aggregate: BillVoteAggregate | None = None,
+        touched: set[int] | None = None,
+    ) -> BillVoteAggregate:
+        """Aggregate vote results, optionally into an existing aggregate.
+
+        Keys of the aggregate updated are added to the touched set, if any.
+        """
+        if aggregate is None:
+            aggregate = BillVoteAggregate(bill_votes={})
+        vote_result_pairs = HashJoin(
+            vote_results, self.vote_repository, "vote_id", "id"
+        )
+        bill_vote_dict = aggregate.bill_votes
+        for vote_result, vote in vote_result_pairs:
+            try:
+                bill_votes = bill_vote_dict[vote.bill_id]
+            except KeyError:
+                bill_votes = bill_vote_dict[vote.bill_id] = [0, 0]
 
             if vote_result.vote_type == VoteType.YES:
-                vote_summary.supporters += 1
+                bill_votes[0] += 1
             else:
-                vote_summary.opposers += 1
+                bill_votes[1] += 1
 
-        if spec:
-            return [
-                vote_summary
-                for vote_summary in vote_summary_dict.values()
-                if spec.is_satisfied_by(vote_summary)
+            if touched is not None:
+                touched.add(vote.bill_id)
+
+        aggregate.dangling_votes += vote_result_pairs.unmatched
+        return aggregate
+
+    def apply_vote_results(
+        self, version: str, vote_results: Sequence[VoteResult]
+    ) -> set[int]:
+        """Carry the aggregate of a version over to the current version.
+
+        The appended vote results are added to a copy of the aggregate, so
+        readers of the previous version aren't affected. Returns the keys
+        of the summaries changed, if the aggregate was carried over.
+        """
+        touched: set[int] = set()
+        aggregate = self.aggregate_cache.pop((version,))
+        new_version = self.get_version()
+        if aggregate is None or new_version is None:
+            return touched
+
+        aggregate = BillVoteAggregate(
+            bill_votes={
+                bill_id: list(bill_votes)
+                for bill_id, bill_votes in aggregate.bill_votes.items()
+            },
+            dangling_votes=aggregate.dangling_votes,
+        )
+        self.aggregate_cache.set(
+            (new_version,),
+            self.build_aggregate(vote_results, aggregate, touched),
+        )
+        return touched
+
+    def _iter_bill_identities(self) -> Generator[BillVoteSummary, None, None]:
+        """Generate the identity fields of the summaries of every bill."""
+        legislator_dict = self.legislator_repository.get_dict()
+        for bill in self.bill_repository.get_all():
+            try:
+                sponsor_name = legislator_dict[bill.sponsor_id].name
+            except KeyError:
+                sponsor_name = "N/A"
+
+            yield BillVoteSummary(
+                bill_id=bill.id,
+                bill_title=bill.title,
+                sponsor_id=bill.sponsor_id,
+                sponsor_name=sponsor_name,
+            )
+
+
+class VoteDetailService:
+    """Vote detail service.
+
+    Drills down from a bill to the vote results of its votes, and from a
+    legislator to the vote results they cast. Rows are looked up in the
+    inverted indexes of the datasets, so only the relevant rows are read.
+    """
+
+    def __init__(
+        self,
+        vote_repository: ReadRepository[Vote],
+        vote_result_repository: ReadRepository[VoteResult],
+        bill_repository: ReadRepository[Bill],
+        legislator_repository: ReadRepository[Person],
+    ) -> None:
+        """Initialize service."""
+        self.vote_repository = vote_repository
+        self.vote_result_repository = vote_result_repository
+        self.bill_repository = bill_repository
+        self.legislator_repository = legislator_repository
+
+    def get_bill_votes(self, bill_id: int) -> list[BillVoteDetail]:
+        """Get the vote results cast on the votes of a bill."""
+        with phase("aggregate"):
+            vote_list = list(self.iter_bill_votes(bill_id))
+        increment("objects_built", len(vote_list))
+        return vote_list
+
+    def iter_bill_votes(
+        self, bill_id: int
+    ) -> Generator[BillVoteDetail, None, None]:
+        """Generate the vote results cast on the votes of a bill."""
+        vote_ids = self.vote_repository.get_index("bill_id").get(bill_id, ())
+        vote_result_index = self.vote_result_repository.get_index("vote_id")
+        vote_result_list = self.vote_result_repository.get_many(
+            [
+                vote_result_id
+                for vote_id in vote_ids
+                for vote_result_id in vote_result_index.get(vote_id, ())
             ]
+        )
+        legislator_dict = {
+            legislator.id: legislator
+            for legislator in self.legislator_repository.get_many(
+                list(
+                    dict.fromkeys(
+                        vote_result.legislator_id
+                        for vote_result in vote_result_list
+                    )
+                )
+            )
+        }
+
+        for vote_result in vote_result_list:
+            try:
+                legislator_name = legislator_dict[
+                    vote_result.legislator_id
+                ].name
+            except KeyError:
+                legislator_name = "N/A"
+
+            yield BillVoteDetail(
+                vote_id=vote_result.vote_id,
+                vote_result_id=vote_result.id,
+                legislator_id=vote_result.legislator_id,
+                legislator_name=legislator_name,
+                vote_type=vote_result.vote_type,
+            )
+
+    def get_legislator_votes(
+        self, legislator_id: int
+    ) -> list[LegislatorVoteDetail]:
+        """Get the vote results cast by a legislator."""
+        with phase("aggregate"):
+            vote_list = list(self.iter_legislator_votes(legislator_id))
+        increment("objects_built", len(vote_list))
+        return vote_list
+
+    def iter_legislator_votes(
+        self, legislator_id: int
+    ) -> Generator[LegislatorVoteDetail, None, None]:
+        """Generate the vote results cast by a legislator."""
+        vote_result_list = self.vote_result_repository.get_by_index(
+            "legislator_id", legislator_id
+        )
+        vote_dict = {
+            vote.id: vote
+            for vote in self.vote_repository.get_many(
+                list(
+                    dict.fromkeys(
+                        vote_result.vote_id for vote_result in vote_result_list
+                    )
+                )
+            )
+        }
+        bill_dict = {
+            bill.id: bill
+            for bill in self.bill_repository.get_many(
+                list(
+                    dict.fromkeys(vote.bill_id for vote in vote_dict.values())
+                )
+            )
+        }
+
+        for vote_result in vote_result_list:
+            try:
+                vote = vote_dict[vote_result.vote_id]
+            except KeyError:
+                bill_id = None
+                bill_title = "N/A"
+            else:
+                bill_id = vote.bill_id
+                try:
+                    bill_title = bill_dict[bill_id].title
+                except KeyError:
+                    bill_title = "N/A"
+
+            yield LegislatorVoteDetail(
+                vote_result_id=vote_result.id,
+                vote_id=vote_result.vote_id,
+                bill_id=bill_id,
+                bill_title=bill_title,
+                vote_type=vote_result.vote_type,
+            )
+
 
-        return list(vote_summary_dict.values())
+class DataQualityService:
+    """Data quality service.
+
+    Reports the rows referencing IDs missing from other datasets. Reports
+    are cached per dataset version, so they are computed once until a
+    dataset changes.
+    """
+
+    report_cache: LRUCache[tuple[str, ...], DataQualityReport] = LRUCache(
+        "data_quality_report", max_size=8
+    )
+
+    def __init__(
+        self,
+        vote_repository: ReadRepository[Vote],
+        vote_result_repository: ReadRepository[VoteResult],
+        bill_repository: ReadRepository[Bill],
+        legislator_repository: ReadRepository[Person],
+    ) -> None:
+        """Initialize service."""
+        self.vote_repository = vote_repository
+        self.vote_result_repository = vote_result_repository
+        self.bill_repository = bill_repository
+        self.legislator_repository = legislator_repository
+
+    def get_version(self) -> str | None:
+        """Get the combined version of all datasets."""
+        return _get_version(
+            self.vote_repository,
+            self.vote_result_repository,
+            self.bill_repository,
+            self.legislator_repository,
+        )
+
+    def get_report(self) -> DataQualityReport:
+        """Get the data quality report of the current dataset version."""
+        version = self.get_version()
+        if version is None:
+            return self.build_report(version)
+
+        return self.report_cache.get_or_set(
+            (version,), lambda: self.build_report(version)
+        )
+
+    def build_report(self, version: str | None) -> DataQualityReport:
+        """Build the data quality report."""
+        legislator_ids = set(self.legislator_repository.get_dict())
+        bill_ids = set(self.bill_repository.get_dict())
+        vote_ids: set[int] = set()
+        dangling_vote_ids = DanglingReferences(
+            kind="vote", source="vote_results.vote_id", target="votes.id"
+        )
+        dangling_legislator_ids = DanglingReferences(
+            kind="legislator",
+            source="vote_results.legislator_id",
+            target="legislators.id",
+        )
+        dangling_bill_ids = DanglingReferences(
+            kind="bill", source="votes.bill_id", target="bills.id"
+        )
+        dangling_sponsor_ids = DanglingReferences(
+            kind="sponsor", source="bills.sponsor_id", target="legislators.id"
+        )
+
+        for bill in self.bill_repository.get_all():
+            if bill.sponsor_id not in legislator_ids:
+                self._add_missing_id(dangling_sponsor_ids, bill.sponsor_id)
+
+        for vote in self.vote_repository.get_all():
+            vote_ids.add(vote.id)
+            if vote.bill_id not in bill_ids:
+                self._add_missing_id(dangling_bill_ids, vote.bill_id)
+
+        for vote_result in self.vote_result_repository.iter_items():
+            if vote_result.vote_id not in vote_ids:
+                self._add_missing_id(dangling_vote_ids, vote_result.vote_id)
+            if vote_result.legislator_id not in legislator_ids:
+                self._add_missing_id(
+                    dangling_legislator_ids, vote_result.legislator_id
+                )
+
+        return DataQualityReport(
+            version=version,
+            dangling_references=[
+                dangling_vote_ids,
+                dangling_legislator_ids,
+                dangling_bill_ids,
+                dangling_sponsor_ids,
+            ],
+        )
+
+    def _add_missing_id(
+        self, dangling_references: DanglingReferences, missing_id: int
+    ) -> None:
+        """Add a row referencing a missing ID."""
+        missing_ids = dangling_references.missing_ids
+        missing_ids[missing_id] = missing_ids.get(missing_id, 0) + 1
+        dangling_references.rows += 1
+
+
+class VoteResultIngestService:
+    """Vote result ingest service.
+
+    Appends vote results in batches, carrying the aggregates of the vote
+    summary services over to each new version of the vote results, so
+    neither the dataset nor the summaries are rebuilt. The summaries each
+    batch changed are published to the vote summary feed.
+    """
+
+    feed: Feed[VoteSummaryDelta] = Feed("vote_summary_deltas", 1024)
+
+    def __init__(
+        self,
+        vote_result_repository: CsvRepository[VoteResult],
+        summary_services: Iterable[
+            LegislatorVoteSummaryService | BillVoteSummaryService
+        ] = (),
+        batch_size: int = 50_000,
+    ) -> None:
+        """Initialize service."""
+        self.vote_result_repository = vote_result_repository
+        self.summary_services = list(summary_services)
+        self.batch_size = batch_size
+        self.ingested = 0
+
+    def ingest(self, vote_results: Iterable[VoteResult]) -> int:
+        """Append vote results, returning the number appended.
+
+        Batches are appended as they're read, so if reading fails, the
+        vote results of the previous batches stay appended.
+        """
+        self.ingested = 0
+        iterator = iter(vote_results)
+        while batch := list(itertools.islice(iterator, self.batch_size)):
+            # Versions are read under the write lock, so aggregates are
+            # only carried over the batch appended after them. Aggregates
+            # not cached yet are built first, so every batch is carried
+            # over and its changes published.
+            with self.vote_result_repository.get_write_lock():
+                versions = [
+                    service.get_version() for service in self.summary_services
+                ]
+                for service, version in zip(self.summary_services, versions):
+                    if version is not None:
+                        service.get_aggregate()
+                self.vote_result_repository.append_many(batch)
+                for service, version in zip(self.summary_services, versions):
+                    if version is not None:
+                        self.publish_changes(
+                            service,
+                            service.apply_vote_results(version, batch),
+                        )
+
+            self.ingested += len(batch)
+            increment("vote_results_ingested", len(batch))
+        return self.ingested
+
+    def publish_changes(
+        self,
+        service: LegislatorVoteSummaryService | BillVoteSummaryService,
+        keys: set[int],
+    ) -> None:
+        """Publish the summaries of a service changed by a batch."""
+        if not keys:
+            return
+
+        self.feed.publish(
+            VoteSummaryDelta(
+                event=service.feed_event,
+                version=service.get_version(),
+                summaries=service.summarize_changes(keys),
+            )
+        )
@@ -3,13 +3,28 @@
 from django.urls import path, include
 
 from .views import (
+    BillListApiView,
     BillListView,
+    BillVoteDetailListApiView,
+    BillVoteDetailListView,
+    BillVoteSummaryListApiView,
     BillVoteSummaryListView,
+    DataQualityReportView,
     DownloadAllView,
+    LegislatorAgreementListApiView,
+    LegislatorAgreementListView,
+    LegislatorListApiView,
     LegislatorListView,
+    LegislatorVoteDetailListApiView,
+    LegislatorVoteDetailListView,
+    LegislatorVoteSummaryListApiView,
     LegislatorVoteSummaryListView,
+    VoteListApiView,
     VoteListView,
+    VoteResultIngestApiView,
+    VoteResultListApiView,
     VoteResultListView,
+    VoteSummaryStreamView,
 )
 
 app_name = "votes"
@@ -22,6 +37,11 @@ dataset_urls = [
         "vote_results/", VoteResultListView.as_view(), name="vote-result-list"
     ),
     path("download_all/", DownloadAllView.as_view(), name="download-all"),
+    path(
+        "quality/",
+        DataQualityReportView.as_view(),
+        name="data-quality-report",
+    ),
 ]
 
 summary_urls = [
@@ -30,14 +50,88 @@ summary_urls = [
         LegislatorVoteSummaryListView.as_view(),
         name="legislator-vote-summary-list",
     ),
+    path(
+        "legislators_votes/<int:legislator_id>/",
+        LegislatorVoteDetailListView.as_view(),
+        name="legislator-vote-detail-list",
+    ),
+    path(
+        "legislators_agreement/",
+        LegislatorAgreementListView.as_view(),
+        name="legislator-agreement-list",
+    ),
     path(
         "bills_votes/",
         BillVoteSummaryListView.as_view(),
         name="bill-vote-summary-list",
     ),
+    path(
+        "bills_votes/<int:bill_id>/",
+        BillVoteDetailListView.as_view(),
+        name="bill-vote-detail-list",
+    ),
+]
+
+api_dataset_urls = [
+    path(
+        "legislators/",
+        LegislatorListApiView.as_view(),
+        name="api-legislator-list",
+    ),
+    path("bills/", BillListApiView.as_view(), name="api-bill-list"),
+    path("votes/", VoteListApiView.as_view(), name="api-vote-list"),
+    path(
+        "vote_results/",
+        VoteResultListApiView.as_view(),
+        name="api-vote-result-list",
+    ),
+    path(
+        "vote_results/ingest/",
+        VoteResultIngestApiView.as_view(),
+        name="api-vote-result-ingest",
+    ),
+]
+
+api_summary_urls = [
+    path(
+        "legislators_votes/",
+        LegislatorVoteSummaryListApiView.as_view(),
+        name="api-legislator-vote-summary-list",
+    ),
+    path(
+        "legislators_votes/<int:legislator_id>/",
+        LegislatorVoteDetailListApiView.as_view(),
+        name="api-legislator-vote-detail-list",
+    ),
+    path(
+        "legislators_agreement/",
+        LegislatorAgreementListApiView.as_view(),
+        name="api-legislator-agreement-list",
+    ),
+    path(
+        "bills_votes/",
+        BillVoteSummaryListApiView.as_view(),
+        name="api-bill-vote-summary-list",
+    ),
+    path(
+        "bills_votes/<int:bill_id>/",
+        BillVoteDetailListApiView.as_view(),
+        name="api-bill-vote-detail-list",
+    ),
+    path(
+        "stream/",
+        VoteSummaryStreamView.as_view(),
+        name="api-vote-summary-stream",
+    ),
+]
+
+api_urls = [
+    path("summaries/", include(api_summary_urls)),
+    path("datasets/", include(api_dataset_urls)),
 ]
 
 urlpatterns = [
     path("summaries/", include(summary_urls)),
     path("datasets/", include(dataset_urls)),
+    path("api/", include(api_urls)),
 ]
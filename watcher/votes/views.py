@@ -1,31 +1,73 @@
 """Views."""
 
+import codecs
+import csv
+import hmac
 import io
+import json
 import os
+import time
 import zipfile
-from typing import Any
+from dataclasses import asdict
+from typing import Any, AsyncGenerator, Hashable, Iterable, Iterator
 
 from django.conf import settings
-from django.core.files.storage import default_storage
-from django.http import FileResponse
+from django.core.exceptions import ObjectDoesNotExist
+from django.core.files.storage import Storage
+from django.core.handlers.asgi import ASGIRequest
+from django.http import FileResponse, JsonResponse, StreamingHttpResponse
+from django.utils.decorators import method_decorator
+from django.views.decorators.csrf import csrf_exempt
 from django.views.generic import ListView, View
 
+from watcher.core.compression import get_compression
+from watcher.core.feeds import Feed
 from watcher.core.forms import SearchForm
+from watcher.core.partitions import get_dataset_file_paths, is_manifest
+from watcher.core.serializers import JsonSerializer
 from watcher.core.specifications import (
     FieldSpecificationBackend,
     SearchSpecificationBackend,
 )
-from watcher.core.views import RepositoryListView, SpecificationMixin
+from watcher.core.storages import get_dataset_storage
+from watcher.core.views import (
+    ExportMixin,
+    InstrumentedListMixin,
+    JsonListMixin,
+    QueryCacheMixin,
+    RepositoryListView,
+    SpecificationMixin,
+)
 
+from .models import (
+    Bill,
+    BillVoteDetail,
+    BillVoteSummary,
+    LegislatorAgreement,
+    LegislatorVoteDetail,
+    LegislatorVoteSummary,
+    Person,
+    Vote,
+    VoteResult,
+    VoteSummaryDelta,
+)
 from .schemas import (
     BillQueryParams,
     BillVoteSummaryQueryParams,
+    LegislatorAgreementQueryParams,
     LegislatorVoteSummaryQueryParams,
     PersonQueryParams,
     VoteQueryParams,
     VoteResultQueryParams,
 )
-from .services import BillVoteSummaryService, LegislatorVoteSummaryService
+from .services import (
+    BillVoteSummaryService,
+    DataQualityService,
+    LegislatorAgreementService,
+    LegislatorVoteSummaryService,
+    VoteDetailService,
+    VoteResultIngestService,
+)
 from .repositories import (
     BillCsvRepository,
     LegislatorCsvRepository,
@@ -38,6 +80,7 @@ class LegislatorListView(RepositoryListView):
     """Legislator list view."""
 
     template_name = "legislator_list.html"
+    model = Person
     form_class = SearchForm
     repository_class = LegislatorCsvRepository
     specification_backends = [
@@ -64,6 +107,7 @@ class BillListView(RepositoryListView):
     """Bill list view."""
 
     template_name = "bill_list.html"
+    model = Bill
     form_class = SearchForm
     repository_class = BillCsvRepository
     specification_backends = [
@@ -91,6 +135,7 @@ class VoteListView(RepositoryListView):
     """Vote list view."""
 
     template_name = "vote_list.html"
+    model = Vote
     form_class = SearchForm
     repository_class = VoteCsvRepository
     specification_backends = [
@@ -113,6 +158,7 @@ class VoteResultListView(RepositoryListView):
     """Vote result list view."""
 
     template_name = "vote_result_list.html"
+    model = VoteResult
     form_class = SearchForm
     repository_class = VoteResultCsvRepository
     specification_backends = [
@@ -136,10 +182,17 @@ class VoteResultListView(RepositoryListView):
         return VoteResultQueryParams(**self.request.GET).model_dump()
 
 
-class LegislatorVoteSummaryListView(SpecificationMixin, ListView):
+class LegislatorVoteSummaryListView(
+    ExportMixin,
+    InstrumentedListMixin,
+    QueryCacheMixin,
+    SpecificationMixin,
+    ListView,
+):
     """Legislator vote summary list view."""
 
     template_name = "legislator_vote_summary_list.html"
+    model = LegislatorVoteSummary
     form_class = SearchForm
     specification_backends = [
         FieldSpecificationBackend,
@@ -158,9 +211,19 @@ class LegislatorVoteSummaryListView(SpecificationMixin, ListView):
         """Get queryset."""
         service = self.get_service()
         spec = self.get_specification()
-        vote_summary = service.summarize_votes(spec)
+        key = self.get_query_cache_key(service.get_version(), spec)
+        vote_summary = self.get_cached_query(key)
+        if vote_summary is None:
+            vote_summary = service.summarize_votes(spec)
+            self.set_cached_query(key, vote_summary)
         return vote_summary
 
+    def iter_export_items(self) -> Iterator[LegislatorVoteSummary]:
+        """Generate the items to export."""
+        service = self.get_service()
+        spec = self.get_specification()
+        return service.iter_vote_summaries(spec)
+
     def get_service(self) -> LegislatorVoteSummaryService:
         """Get service."""
         vote_result_repository = VoteResultCsvRepository.using(
@@ -186,10 +249,114 @@ class LegislatorVoteSummaryListView(SpecificationMixin, ListView):
         ).model_dump()
 
 
-class BillVoteSummaryListView(SpecificationMixin, ListView):
+class LegislatorAgreementListView(
+    ExportMixin,
+    InstrumentedListMixin,
+    QueryCacheMixin,
+    SpecificationMixin,
+    ListView,
+):
+    """Legislator agreement list view.
+
+    Lists the top k most and least aligned legislators of each legislator,
+    ranked by the rate of shared votes they agreed on.
+    """
+
+    template_name = "legislator_agreement_list.html"
+    model = LegislatorAgreement
+    form_class = SearchForm
+    specification_backends = [
+        FieldSpecificationBackend,
+        SearchSpecificationBackend,
+    ]
+    search_fields = {
+        "legislator_id": int,
+        "legislator_name__contains": str,
+        "other_legislator_id": int,
+        "other_legislator_name__contains": str,
+    }
+    paginate_by = 15
+    top_k_kwarg = "k"
+    top_k = 5
+    max_top_k = 50
+    min_votes_kwarg = "min_votes"
+    min_votes = 1
+
+    def get_queryset(self):
+        """Get queryset."""
+        service = self.get_service()
+        spec = self.get_specification()
+        key = self.get_query_cache_key(service.get_version(), spec)
+        agreement_list = self.get_cached_query(key)
+        if agreement_list is None:
+            agreement_list = service.get_agreements(
+                self.get_top_k(), self.get_min_votes(), spec
+            )
+            self.set_cached_query(key, agreement_list)
+        return agreement_list
+
+    def iter_export_items(self) -> Iterator[LegislatorAgreement]:
+        """Generate the items to export."""
+        service = self.get_service()
+        spec = self.get_specification()
+        return service.iter_agreements(
+            self.get_top_k(), self.get_min_votes(), spec
+        )
+
+    def get_service(self) -> LegislatorAgreementService:
+        """Get service."""
+        vote_result_repository = VoteResultCsvRepository.using(
+            file_path=settings.MEDIA_FILES["vote_results"]
+        )
+        legislator_repository = LegislatorCsvRepository.using(
+            file_path=settings.MEDIA_FILES["legislators"]
+        )
+        service = LegislatorAgreementService(
+            vote_result_repository=vote_result_repository,
+            legislator_repository=legislator_repository,
+        )
+        return service
+
+    def get_top_k(self) -> int:
+        """Get the number of pairs ranked per legislator and alignment."""
+        top_k = self.request.GET.get(self.top_k_kwarg)
+        if top_k:
+            try:
+                return min(max(int(top_k), 1), self.max_top_k)
+            except ValueError:
+                pass
+        return self.top_k
+
+    def get_min_votes(self) -> int:
+        """Get the minimum number of shared votes of a ranked pair."""
+        min_votes = self.request.GET.get(self.min_votes_kwarg)
+        if min_votes:
+            try:
+                return max(int(min_votes), 1)
+            except ValueError:
+                pass
+        return self.min_votes
+
+    def get_query_cache_namespace(self) -> Hashable:
+        """Get the namespace of the query cache keys of the view."""
+        return (self.model, self.get_top_k(), self.get_min_votes())
+
+    def get_query_params(self) -> dict[str, Any]:
+        """Get query parameters."""
+        return LegislatorAgreementQueryParams(**self.request.GET).model_dump()
+
+
+class BillVoteSummaryListView(
+    ExportMixin,
+    InstrumentedListMixin,
+    QueryCacheMixin,
+    SpecificationMixin,
+    ListView,
+):
     """Bill vote summary list view."""
 
     template_name = "bill_vote_summary_list.html"
+    model = BillVoteSummary
     form_class = SearchForm
     specification_backends = [
         FieldSpecificationBackend,
@@ -209,9 +376,19 @@ class BillVoteSummaryListView(SpecificationMixin, ListView):
         """Get queryset."""
         service = self.get_service()
         spec = self.get_specification()
-        bill_vote_summary = service.summarize_votes(spec)
+        key = self.get_query_cache_key(service.get_version(), spec)
+        bill_vote_summary = self.get_cached_query(key)
+        if bill_vote_summary is None:
+            bill_vote_summary = service.summarize_votes(spec)
+            self.set_cached_query(key, bill_vote_summary)
         return bill_vote_summary
 
+    def iter_export_items(self) -> Iterator[BillVoteSummary]:
+        """Generate the items to export."""
+        service = self.get_service()
+        spec = self.get_specification()
+        return service.iter_vote_summaries(spec)
+
     def get_service(self) -> BillVoteSummaryService:
         """Get service."""
         vote_repository = VoteCsvRepository.using(
@@ -239,6 +416,123 @@ class BillVoteSummaryListView(SpecificationMixin, ListView):
         return BillVoteSummaryQueryParams(**self.request.GET).model_dump()
 
 
+class VoteDetailServiceMixin:
+    """Vote detail service mixin class."""
+
+    def get_service(self) -> VoteDetailService:
+        """Get service."""
+        return VoteDetailService(
+            vote_repository=VoteCsvRepository.using(
+                file_path=settings.MEDIA_FILES["votes"]
+            ),
+            vote_result_repository=VoteResultCsvRepository.using(
+                file_path=settings.MEDIA_FILES["vote_results"]
+            ),
+            bill_repository=BillCsvRepository.using(
+                file_path=settings.MEDIA_FILES["bills"]
+            ),
+            legislator_repository=LegislatorCsvRepository.using(
+                file_path=settings.MEDIA_FILES["legislators"]
+            ),
+        )
+
+
+class BillVoteDetailListView(
+    ExportMixin, InstrumentedListMixin, VoteDetailServiceMixin, ListView
+):
+    """Bill vote detail list view.
+
+    Lists the vote results cast on the votes of a bill.
+    """
+
+    template_name = "bill_vote_detail_list.html"
+    model = BillVoteDetail
+    paginate_by = 15
+
+    def get_queryset(self):
+        """Get queryset."""
+        return self.get_service().get_bill_votes(self.kwargs["bill_id"])
+
+    def iter_export_items(self) -> Iterator[BillVoteDetail]:
+        """Generate the items to export."""
+        return self.get_service().iter_bill_votes(self.kwargs["bill_id"])
+
+    def get_context_data(self, **kwargs):
+        """Get context data, including the bill, if it exists."""
+        repository = BillCsvRepository.using(
+            file_path=settings.MEDIA_FILES["bills"]
+        )
+        try:
+            kwargs["bill"] = repository.get_by_id(self.kwargs["bill_id"])
+        except ObjectDoesNotExist:
+            kwargs["bill"] = None
+        return super().get_context_data(**kwargs)
+
+
+class LegislatorVoteDetailListView(
+    ExportMixin, InstrumentedListMixin, VoteDetailServiceMixin, ListView
+):
+    """Legislator vote detail list view.
+
+    Lists the vote results cast by a legislator.
+    """
+
+    template_name = "legislator_vote_detail_list.html"
+    model = LegislatorVoteDetail
+    paginate_by = 15
+
+    def get_queryset(self):
+        """Get queryset."""
+        return self.get_service().get_legislator_votes(
+            self.kwargs["legislator_id"]
+        )
+
+    def iter_export_items(self) -> Iterator[LegislatorVoteDetail]:
+        """Generate the items to export."""
+        return self.get_service().iter_legislator_votes(
+            self.kwargs["legislator_id"]
+        )
+
+    def get_context_data(self, **kwargs):
+        """Get context data, including the legislator, if it exists."""
+        repository = LegislatorCsvRepository.using(
+            file_path=settings.MEDIA_FILES["legislators"]
+        )
+        try:
+            kwargs["legislator"] = repository.get_by_id(
+                self.kwargs["legislator_id"]
+            )
+        except ObjectDoesNotExist:
+            kwargs["legislator"] = None
+        return super().get_context_data(**kwargs)
+
+
+class DataQualityReportView(View):
+    """Data quality report view."""
+
+    def get(self, request, *args, **kwargs):
+        """Get data quality report."""
+        report = self.get_service().get_report()
+        return JsonResponse(asdict(report))
+
+    def get_service(self) -> DataQualityService:
+        """Get service."""
+        return DataQualityService(
+            vote_repository=VoteCsvRepository.using(
+                file_path=settings.MEDIA_FILES["votes"]
+            ),
+            vote_result_repository=VoteResultCsvRepository.using(
+                file_path=settings.MEDIA_FILES["vote_results"]
+            ),
+            bill_repository=BillCsvRepository.using(
+                file_path=settings.MEDIA_FILES["bills"]
+            ),
+            legislator_repository=LegislatorCsvRepository.using(
+                file_path=settings.MEDIA_FILES["legislators"]
+            ),
+        )
+
+
 class DownloadAllView(View):
     """Download all files."""
 
@@ -250,12 +544,25 @@ class DownloadAllView(View):
             settings.MEDIA_FILES["legislators"],
         ]
         zip_filename = "datasets.zip"
+        storage = get_dataset_storage()
         stream = io.BytesIO()
 
         with zipfile.ZipFile(stream, "w", zipfile.ZIP_DEFLATED, False) as zf:
-            for filename in files_to_zip:
-                with default_storage.open(filename, "r") as file:
-                    zf.writestr(os.path.basename(filename), file.read())
+            for dataset_filename in files_to_zip:
+                # Partitioned datasets keep the directory of their files.
+                base_dir = os.path.dirname(dataset_filename)
+                if is_manifest(dataset_filename):
+                    base_dir = os.path.dirname(base_dir)
+
+                for filename in get_dataset_file_paths(
+                    storage, dataset_filename
+                ):
+                    self.write_file(
+                        zf,
+                        storage,
+                        filename,
+                        os.path.relpath(filename, base_dir),
+                    )
 
         stream.seek(0)
         response = FileResponse(stream, content_type="application/zip")
@@ -263,3 +570,266 @@ class DownloadAllView(View):
             f'attachment; filename="{zip_filename}"'
         )
         return response
+
+    def write_file(
+        self,
+        zf: zipfile.ZipFile,
+        storage: Storage,
+        filename: str,
+        arcname: str,
+    ) -> None:
+        """Write a file to the zip file."""
+        # Compressed files are stored as they are, not recompressed.
+        if get_compression(filename) is not None:
+            with storage.open(filename, "rb") as file:
+                zf.writestr(
+                    arcname, file.read(), compress_type=zipfile.ZIP_STORED
+                )
+            return
+
+        with storage.open(filename, "r") as file:
+            zf.writestr(arcname, file.read())
+
+
+class VoteSummaryServiceMixin:
+    """Vote summary service mixin class."""
+
+    def get_summary_services(
+        self,
+    ) -> list[LegislatorVoteSummaryService | BillVoteSummaryService]:
+        """Get the legislator and bill vote summary services."""
+        vote_result_repository = VoteResultCsvRepository.using(
+            file_path=settings.MEDIA_FILES["vote_results"]
+        )
+        vote_repository = VoteCsvRepository.using(
+            file_path=settings.MEDIA_FILES["votes"]
+        )
+        bill_repository = BillCsvRepository.using(
+            file_path=settings.MEDIA_FILES["bills"]
+        )
+        legislator_repository = LegislatorCsvRepository.using(
+            file_path=settings.MEDIA_FILES["legislators"]
+        )
+        return [
+            LegislatorVoteSummaryService(
+                vote_repository=vote_repository,
+                vote_result_repository=vote_result_repository,
+                legislator_repository=legislator_repository,
+            ),
+            BillVoteSummaryService(
+                vote_repository=vote_repository,
+                vote_result_repository=vote_result_repository,
+                bill_repository=bill_repository,
+                legislator_repository=legislator_repository,
+            ),
+        ]
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class VoteResultIngestApiView(VoteSummaryServiceMixin, View):
+    """Vote result ingest API view.
+
+    Appends the vote results of the request body, streamed as CSV with a
+    header or as newline-delimited JSON, in batches. Requests must carry
+    the ingest token as a bearer token.
+    """
+
+    http_method_names = ["post"]
+    parsers = {
+        "text/csv": "parse_csv",
+        "application/x-ndjson": "parse_ndjson",
+    }
+
+    def post(self, request, *args, **kwargs):
+        """Ingest vote results."""
+        if not getattr(settings, "INGEST_ENABLED", False):
+            return JsonResponse({"error": "Ingest is disabled."}, status=403)
+
+        token = getattr(settings, "INGEST_TOKEN", None)
+        if not token:
+            return JsonResponse(
+                {"error": "Ingest requires a token."}, status=403
+            )
+        if not self.is_authorized(request, token):
+            response = JsonResponse({"error": "Unauthorized."}, status=401)
+            response["WWW-Authenticate"] = "Bearer"
+            return response
+
+        content_type = request.content_type
+        if content_type not in self.parsers:
+            return JsonResponse(
+                {"error": f"Unsupported content type: {content_type}"},
+                status=415,
+            )
+
+        service = self.get_service()
+        rows = getattr(self, self.parsers[content_type])(request)
+        repository = service.vote_result_repository
+        try:
+            ingested = service.ingest(
+                repository.build_item(row) for row in rows
+            )
+        except NotImplementedError as err:
+            return JsonResponse(
+                {"error": str(err), "ingested": service.ingested}, status=501
+            )
+        except (KeyError, TypeError, ValueError, csv.Error) as err:
+            return JsonResponse(
+                {
+                    "error": f"Invalid vote result: {err}",
+                    "ingested": service.ingested,
+                },
+                status=400,
+            )
+        return JsonResponse(
+            {"ingested": ingested, "version": repository.get_version()}
+        )
+
+    def is_authorized(self, request, token: str) -> bool:
+        """Check if a request carries a bearer token."""
+        scheme, _, credentials = request.headers.get(
+            "Authorization", ""
+        ).partition(" ")
+        return scheme.lower() == "bearer" and hmac.compare_digest(
+            credentials.strip().encode(), token.encode()
+        )
+
+    def parse_csv(self, request) -> Iterable[dict]:
+        """Parse rows of a CSV request body."""
+        return csv.DictReader(codecs.iterdecode(request, "utf-8"))
+
+    def parse_ndjson(self, request) -> Iterable[dict]:
+        """Parse rows of a newline-delimited JSON request body."""
+        for line in request:
+            if line.strip():
+                yield json.loads(line)
+
+    def get_service(self) -> VoteResultIngestService:
+        """Get service."""
+        summary_services = self.get_summary_services()
+        return VoteResultIngestService(
+            vote_result_repository=summary_services[0].vote_result_repository,
+            summary_services=summary_services,
+            batch_size=getattr(settings, "INGEST_BATCH_SIZE", 50_000),
+        )
+
+
+class VoteSummaryStreamView(View):
+    """Vote summary stream view.
+
+    Streams the legislator and bill vote summaries changed by ingested
+    vote results as server-sent events. Clients only hold a cursor into
+    the vote summary feed, resumed from the Last-Event-ID header or the
+    cursor query parameter, and are told to reset when it's stale.
+    Connections are served from the feed alone, without aggregating.
+
+    Streams wait for events in the event loop, so they're only served
+    under ASGI, by the single process ingesting the vote results, since
+    the feed is held in its memory. Connections are closed after
+    LIVE_TALLY_MAX_LIFETIME seconds, and clients reconnect from their
+    last event.
+    """
+
+    http_method_names = ["get"]
+    cursor_kwarg = "cursor"
+    retry = 3000
+    models = {
+        LegislatorVoteSummaryService.feed_event: LegislatorVoteSummary,
+        BillVoteSummaryService.feed_event: BillVoteSummary,
+    }
+
+    async def get(self, request, *args, **kwargs):
+        """Stream vote summary deltas."""
+        if not isinstance(request, ASGIRequest):
+            return JsonResponse(
+                {"error": "Streams are only served under ASGI."}, status=501
+            )
+
+        feed = VoteResultIngestService.feed
+        cursor = self.get_cursor(feed)
+        response = StreamingHttpResponse(
+            self.iter_events(feed, cursor), content_type="text/event-stream"
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    def get_cursor(self, feed: Feed[VoteSummaryDelta]) -> int:
+        """Get the cursor of the client, or else the end of the feed."""
+        cursor = self.request.headers.get(
+            "Last-Event-ID"
+        ) or self.request.GET.get(self.cursor_kwarg)
+        try:
+            return int(cursor)  # type: ignore
+        except (TypeError, ValueError):
+            return feed.sequence
+
+    async def iter_events(
+        self, feed: Feed[VoteSummaryDelta], cursor: int
+    ) -> AsyncGenerator[str, None]:
+        """Generate the events of the feed after a cursor, for a while."""
+        keepalive = getattr(settings, "LIVE_TALLY_KEEPALIVE", 15.0)
+        lifetime = getattr(settings, "LIVE_TALLY_MAX_LIFETIME", 300.0)
+        deadline = time.monotonic() + lifetime
+        yield f"retry: {self.retry}\n\n"
+        while (remaining := deadline - time.monotonic()) > 0:
+            deltas = await feed.aread(
+                cursor, timeout=min(keepalive, remaining)
+            )
+            if deltas is None:
+                cursor = feed.sequence
+                yield f"id: {cursor}\nevent: reset\ndata: {{}}\n\n"
+            elif not deltas:
+                yield ": keep-alive\n\n"
+            else:
+                for cursor, delta in deltas:
+                    yield self.format_event(cursor, delta)
+
+    def format_event(self, sequence: int, delta: VoteSummaryDelta) -> str:
+        """Format a vote summary delta as an event."""
+        serializer = JsonSerializer.for_dataclass(self.models[delta.event])
+        summaries = "".join(serializer.iter_chunks(delta.summaries))
+        data = f'{{"version": {json.dumps(delta.version)}, "results": {summaries}}}'
+        return f"id: {sequence}\nevent: {delta.event}\ndata: {data}\n\n"
+
+
+class LegislatorListApiView(JsonListMixin, LegislatorListView):
+    """Legislator list API view."""
+
+
+class BillListApiView(JsonListMixin, BillListView):
+    """Bill list API view."""
+
+
+class VoteListApiView(JsonListMixin, VoteListView):
+    """Vote list API view."""
+
+
+class VoteResultListApiView(JsonListMixin, VoteResultListView):
+    """Vote result list API view."""
+
+
+class LegislatorVoteSummaryListApiView(
+    JsonListMixin, LegislatorVoteSummaryListView
+):
+    """Legislator vote summary list API view."""
+
+
+class LegislatorAgreementListApiView(
+    JsonListMixin, LegislatorAgreementListView
+):
+    """Legislator agreement list API view."""
+
+
+class BillVoteSummaryListApiView(JsonListMixin, BillVoteSummaryListView):
+    """Bill vote summary list API view."""
+
+
+class BillVoteDetailListApiView(JsonListMixin, BillVoteDetailListView):
+    """Bill vote detail list API view."""
+
+
+class LegislatorVoteDetailListApiView(
+    JsonListMixin, LegislatorVoteDetailListView
+):
+    """Legislator vote detail list API view."""
@@ -0,0 +1,79 @@
+"""Warm-up."""
+
+from django.conf import settings
+from django.http import HttpRequest
+
+from watcher.core.partitions import get_dataset_file_paths
+from watcher.core.reloader import DatasetReloader
+from watcher.core.shared import SharedDatasetStore, get_shared_store
+from watcher.core.storages import CachedStorage, get_dataset_storage
+
+from .repositories import (
+    BillCsvRepository,
+    LegislatorCsvRepository,
+    VoteCsvRepository,
+    VoteResultCsvRepository,
+)
+from .views import BillVoteSummaryListView, LegislatorVoteSummaryListView
+
+REPOSITORY_CLASSES = {
+    "bills": BillCsvRepository,
+    "legislators": LegislatorCsvRepository,
+    "votes": VoteCsvRepository,
+    "vote_results": VoteResultCsvRepository,
+}
+
+
+def prefetch_datasets() -> list[str]:
+    """Copy every dataset to the local cache in parallel, if enabled.
+
+    Returns the paths of the cached copies.
+    """
+    storage = get_dataset_storage()
+    if not isinstance(storage, CachedStorage):
+        return []
+
+    file_paths = []
+    for file_path in settings.MEDIA_FILES.values():
+        file_paths.extend(get_dataset_file_paths(storage, file_path))
+    return storage.prefetch(file_paths)
+
+
+def warm_up() -> None:
+    """Load every dataset in memory and precompute the vote summaries.
+
+    The datasets are then kept up to date in the background, if enabled.
+    """
+    repositories = [
+        REPOSITORY_CLASSES[name].using(file_path=file_path)
+        for name, file_path in settings.MEDIA_FILES.items()
+    ]
+    for repository in repositories:
+        repository.load()
+
+    if getattr(settings, "DATASET_RELOAD_ENABLED", False):
+        DatasetReloader(
+            repositories,
+            interval=settings.DATASET_RELOAD_INTERVAL,
+            store=get_shared_store(),
+        ).start()
+
+    request = HttpRequest()
+    request.method = "GET"
+    for view_class in (LegislatorVoteSummaryListView, BillVoteSummaryListView):
+        view = view_class()
+        view.setup(request)
+        view.get_queryset()
+
+
+def publish_datasets(store: SharedDatasetStore) -> list[str]:
+    """Publish every dataset in a shared dataset store.
+
+    Meant to run in the parent process, before the workers are forked.
+    Returns the file paths of the datasets published.
+    """
+    return [
+        file_path
+        for name, file_path in settings.MEDIA_FILES.items()
+        if REPOSITORY_CLASSES[name].using(file_path=file_path).publish(store)
+    ]
@@ -4,6 +4,9 @@ import os
 
 from django.core.wsgi import get_wsgi_application
 
+from watcher.core.warmup import start_warm_up
+
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "watcher.settings")
 
 application = get_wsgi_application()
+start_warm_up()